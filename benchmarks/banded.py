@@ -0,0 +1,24 @@
+import numpy as np
+
+from pandasreg import banded
+from common import SIZES
+
+class Solve(object):
+    # one row per day of a long daily series
+    params = ([1, 2, 3], SIZES[:2])
+    param_names = ['order', 'size']
+
+    def setup(self, order, n):
+        self.ab = banded.difference_penalty(n, order) * 1600
+        self.ab[:, -1] += 1
+        self.b = np.random.RandomState(0).randn(n)
+        self.L = banded.cholesky(self.ab)
+
+    def time_cholesky(self, order, n):
+        banded.cholesky(self.ab)
+
+    def time_solve_cholesky(self, order, n):
+        banded.solve_cholesky(self.L, self.b)
+
+    def time_solve(self, order, n):
+        banded.solve(self.ab, self.b)
@@ -0,0 +1,44 @@
+"""
+Shared parameters and data for the benchmarks.
+
+The benchmarks follow the conventions of asv (airspeed velocity): run
+`asv run` from the repository root to benchmark a range of commits and
+`asv compare` to compare two of them. Results are stored as JSON under
+.asv/results.
+"""
+
+import re
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from pandasreg import RFrequency, RPeriodIndex
+
+SIZES = [1000, 100000, 10000000]
+
+# a frequency spec is an alias with an optional stride, as in '5Min'
+FREQS = ['D', 'B', 'W-FRI', 'TM', 'M', 'Q', 'A', 'Min', '5Min']
+
+START = datetime(1900, 1, 1)
+
+def make_freq(spec):
+    match = re.match(r'^(\d*)(.+)$', spec)
+    stride = int(match.group(1)) if match.group(1) else 1
+    return RFrequency.init(match.group(2), stride=stride)
+
+def check_size(freq, n):
+    """Skip sizes that do not fit in the range of nanosecond timestamps"""
+
+    if n > freq.periodicity * 350:
+        raise NotImplementedError("%d periods is out of range for %s" %
+            (n, freq.freqstr))
+
+def make_index(spec, n):
+    freq = make_freq(spec)
+    check_size(freq, n)
+    return RPeriodIndex(start=START, periods=n, freq=freq)
+
+def make_series(spec, n, seed=0):
+    index = make_index(spec, n)
+    values = 100 + np.random.RandomState(seed).randn(n).cumsum()
+    return pd.Series(values, index=index)
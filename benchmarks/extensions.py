@@ -0,0 +1,42 @@
+import numpy as np
+
+import pandasreg as pdr
+from common import SIZES, make_series
+
+class Resample(object):
+    params = ([('D', 'M'), ('B', 'Q'), ('M', 'A'), ('5Min', 'D'),
+               ('A', 'M'), ('Q', 'D'), ('M', 'B')], SIZES[:2],
+              ['mean', 'sum', 'last'])
+    param_names = ['freqs', 'size', 'how']
+
+    def setup(self, freqs, n, how):
+        self.series = make_series(freqs[0], n)
+
+    def time_resample(self, freqs, n, how):
+        pdr.resample(self.series, freqs[1], how=how)
+
+class Series(object):
+    params = (['D', 'M', '5Min'], SIZES)
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        s = make_series(spec, n)
+        self.series = s
+        self.padded = s.copy()
+        self.padded[:n // 10] = np.nan
+        self.padded[-n // 10:] = np.nan
+        self.gapped = s[::2]
+        self.pieces = [s[:n // 2], s[n // 3:]]
+        self.extender = s.pct_change()[n // 2:]
+
+    def time_trim(self, spec, n):
+        pdr.trim(self.padded)
+
+    def time_fill(self, spec, n):
+        pdr.fill(self.gapped)
+
+    def time_overlay(self, spec, n):
+        pdr.overlay(self.pieces)
+
+    def time_extend(self, spec, n):
+        pdr.extend(self.pieces[0], self.extender, extender_type='pc')
@@ -0,0 +1,55 @@
+import numpy as np
+from datetime import datetime
+
+from pandasreg import RFrequency
+from common import SIZES, FREQS, make_freq, check_size
+
+class Scalar(object):
+    params = FREQS
+    param_names = ['freq']
+
+    def setup(self, spec):
+        self.freq = make_freq(spec)
+        self.dt = datetime(2013, 6, 15)
+        self.ordinal = self.freq.to_ordinal(self.dt)
+        self.annual = RFrequency.init('A')
+
+    def time_to_ordinal(self, spec):
+        self.freq.to_ordinal(self.dt)
+
+    def time_to_timestamp(self, spec):
+        self.freq.to_timestamp(self.ordinal)
+
+    def time_asfreq_aggregate(self, spec):
+        self.freq.asfreq(self.ordinal, self.annual)
+
+    def time_asfreq_disaggregate(self, spec):
+        self.annual.asfreq(43, self.freq, how='S')
+
+class Vectorized(object):
+    params = (FREQS, SIZES)
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        self.freq = make_freq(spec)
+        check_size(self.freq, n)
+        start = self.freq.to_ordinal(datetime(1900, 1, 1))
+        self.ordinals = np.arange(start, start + n, dtype=np.int64)
+        self.stamps = self.freq.np_to_timestamp(self.ordinals)
+        self.lower = RFrequency.init('A')
+        self.annual = self.freq.np_asfreq(self.ordinals, self.lower)
+
+    def time_np_to_ordinal(self, spec, n):
+        self.freq.np_to_ordinal(self.stamps)
+
+    def time_np_to_timestamp(self, spec, n):
+        self.freq.np_to_timestamp(self.ordinals)
+
+    def time_np_asfreq_aggregate(self, spec, n):
+        self.freq.np_asfreq(self.ordinals, self.lower)
+
+    def time_np_asfreq_disaggregate(self, spec, n):
+        self.lower.np_asfreq(self.annual, self.freq, how='S')
+
+    def time_np_field(self, spec, n):
+        self.freq.np_field(self.ordinals, 'month')
@@ -0,0 +1,11 @@
+class Import(object):
+    # each timeraw benchmark runs in a fresh interpreter, so the package and
+    # its dependencies are imported from scratch
+    def timeraw_import(self):
+        return "import pandasreg"
+
+    def timeraw_import_resample(self):
+        return "from pandasreg import resample"
+
+    def timeraw_import_stats(self):
+        return "import pandasreg.stats"
@@ -0,0 +1,65 @@
+import numpy as np
+
+from pandasreg import RPeriodIndex, RPeriod
+from common import SIZES, FREQS, START, make_freq, make_index, check_size
+
+class Construction(object):
+    params = (FREQS, SIZES)
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        self.freq = make_freq(spec)
+        check_size(self.freq, n)
+        self.ordinals = make_index(spec, n).values.copy()
+
+    def time_start_periods(self, spec, n):
+        RPeriodIndex(start=START, periods=n, freq=self.freq)
+
+    def time_ordinals(self, spec, n):
+        RPeriodIndex(ordinal=self.ordinals, freq=self.freq)
+
+class FromDates(object):
+    # construction from a list of dates goes through a Python loop
+    params = (FREQS, SIZES[:2])
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        self.freq = make_freq(spec)
+        self.dates = list(make_index(spec, n).to_timestamp())
+
+    def time_dates(self, spec, n):
+        RPeriodIndex(self.dates, freq=self.freq)
+
+class Lookup(object):
+    params = (FREQS, SIZES)
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        self.index = make_index(spec, n)
+        self.period = self.index[n // 2]
+        self.string = str(self.period)
+        self.start = str(self.index[n // 4])
+        self.end = str(self.index[3 * n // 4])
+        self.other = self.index[n // 2:] + n // 4
+
+    def time_get_loc(self, spec, n):
+        self.index.get_loc(self.period)
+
+    def time_get_loc_string(self, spec, n):
+        self.index.get_loc(self.string)
+
+    def time_slice_locs(self, spec, n):
+        self.index.slice_locs(self.start, self.end)
+
+    def time_join(self, spec, n):
+        self.index.join(self.other, how='outer')
+
+class Format(object):
+    params = (FREQS, SIZES[:2])
+    param_names = ['freq', 'size']
+
+    def setup(self, spec, n):
+        self.index = make_index(spec, n)
+
+    def time_format(self, spec, n):
+        self.index.format()
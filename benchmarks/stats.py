@@ -0,0 +1,42 @@
+import pandasreg as pdr
+from common import SIZES, make_series
+
+class Transforms(object):
+    params = (['d', 'da', 'dy', 'dya', 'logd', 'logda', 'logdy', 'logdya',
+               'pc', 'pca', 'pcy', 'pcya'], ['M', 'D'], SIZES)
+    param_names = ['transform', 'freq', 'size']
+
+    def setup(self, transform, spec, n):
+        self.series = make_series(spec, n)
+        self.func = getattr(pdr, transform)
+
+    def time_transform(self, transform, spec, n):
+        self.func(self.series, 1)
+
+class Smoothing(object):
+    # a long daily series, so the banded solver dominates
+    params = (['hptrend', 'whittaker'], SIZES[:2])
+    param_names = ['filter', 'size']
+
+    def setup(self, name, n):
+        self.series = make_series('D', n)
+
+    def time_filter(self, name, n):
+        if name == 'hptrend':
+            pdr.hptrend(self.series)
+        else:
+            pdr.whittaker(self.series, 1e4, order=3)
+
+class Disaggregation(object):
+    params = (['denton', 'chow_lin'], SIZES[:2])
+    param_names = ['method', 'size']
+
+    def setup(self, method, n):
+        # monthly values spanning n days
+        self.series = make_series('M', n // 30)
+
+    def time_disaggregate(self, method, n):
+        if method == 'denton':
+            pdr.denton(self.series, 'D', how='sum')
+        else:
+            pdr.chow_lin(self.series, 'D', how='sum', rho=0.9)
@@ -1,4 +1,53 @@
+import sys
+import importlib
+from types import ModuleType
+
 from rperiod import *
-from rfreq import RFrequency
-from extensions import *
-from stats import *
\ No newline at end of file
+from rfreq import RFrequency, register_calendar, warm_tables
+
+# Everything else is imported on first use, so that importing the package
+# only loads what RPeriod, RPeriodIndex and RFrequency need.
+_lazy = {
+    'extensions': ['trim', 'fill', 'resample', 'overlay', 'extend'],
+    'stats': ['d', 'da', 'dy', 'dya', 'logd', 'logda', 'logdy', 'logdya', 'pc',
+              'pca', 'pcy', 'pcya', 'hpfilter', 'hptrend', 'hpcycle',
+              'whittaker', 'x12'],
+    'rolling': ['rolling_sum', 'rolling_mean', 'rolling_min', 'rolling_max',
+                'rolling_std', 'rolling_count'],
+    'collection': ['RSeriesCollection'],
+    'alignment': ['align', 'concat'],
+    'pipeline': ['lazy'],
+    'disaggregation': ['denton', 'chow_lin'],
+    'parallel': ['map_series'],
+}
+_lazy_names = dict((name, module) for module, names in _lazy.items()
+                   for name in names)
+
+__all__ = [name for name in globals().keys() if not name.startswith('_') and
+           name not in ('sys', 'importlib', 'ModuleType')] + sorted(_lazy_names)
+
+class _LazyModule(ModuleType):
+    """The package module, resolving lazily imported names on first access"""
+
+    def __init__(self, module):
+        ModuleType.__init__(self, module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Python 2 clears the globals of a module when it is deallocated, and
+        # the functions defined above still refer to them
+        self._module = module
+
+    def __getattr__(self, name):
+        if name in _lazy_names:
+            module = importlib.import_module(__name__ + '.' + _lazy_names[name])
+            value = getattr(module, name)
+        elif name in _lazy:
+            value = importlib.import_module(__name__ + '.' + name)
+        else:
+            raise AttributeError("'module' object has no attribute '%s'" % name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) | set(_lazy_names.keys()))
+
+sys.modules[__name__] = _LazyModule(sys.modules[__name__])
@@ -0,0 +1,164 @@
+"""
+Alignment of Series and DataFrames with RPeriodIndexes of different
+frequencies.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency
+from pandasreg.collection import RSeriesCollection, _gather
+
+__all__ = ['align', 'concat']
+
+def _options(kwargs):
+    freq = kwargs.pop('freq', None)
+    how = kwargs.pop('how', None)
+    join = kwargs.pop('join', 'outer')
+    if kwargs:
+        raise TypeError("Unexpected keyword arguments: %s" %
+            ", ".join(kwargs.keys()))
+    if join not in ('outer', 'inner'):
+        raise ValueError("join must be 'outer' or 'inner'")
+    return freq, how, join
+
+def _columns(obj):
+    if isinstance(obj, pd.DataFrame):
+        return [obj[column] for column in obj.columns]
+    return [obj]
+
+def _align_blocks(objs, freq, how, join):
+    """
+
+    Convert every object to a common frequency. Objects with the same
+    frequency and resampling method are converted together as one
+    RSeriesCollection, so the mapping between the two frequencies is only
+    computed once per group.
+
+    Returns the target RPeriodIndex and a 2-D array of values for each object.
+
+    """
+
+    if len(objs) == 0:
+        raise ValueError("Must supply at least one object to align")
+    for obj in objs:
+        if not isinstance(obj.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+
+    if freq is None:
+        freq = min(obj.index.freq for obj in objs)
+    elif isinstance(freq, basestring):
+        freq = RFrequency.init(freq)
+
+    if how is None or isinstance(how, basestring):
+        how = [how] * len(objs)
+    elif len(how) != len(objs):
+        raise ValueError("Must supply one resampling method per object")
+    how = [obj.index.observed if h is None else h for obj, h in zip(objs, how)]
+
+    groups = {}
+    for i, obj in enumerate(objs):
+        groups.setdefault((obj.index.freq, how[i]), []).append(i)
+
+    # (collection, first column, number of columns) for each object
+    parts = [None] * len(objs)
+    for (source, method), members in groups.items():
+        series = []
+        for i in members:
+            columns = _columns(objs[i])
+            parts[i] = (len(series), len(columns))
+            series.extend(columns)
+        collection = RSeriesCollection.from_series(series,
+            names=range(len(series))).resample(freq, method)
+        for i in members:
+            parts[i] = (collection,) + parts[i]
+
+    # range of each object is the union of the ranges of its columns
+    bounds = []
+    for collection, first, count in parts:
+        starts = collection.starts[first:first + count]
+        lengths = collection.lengths[first:first + count]
+        nonempty = lengths > 0
+        if nonempty.any():
+            bounds.append((starts[nonempty].min(),
+                (starts + lengths)[nonempty].max() - 1))
+
+    if len(bounds) == 0:
+        lo, hi = 0, -1
+    elif join == 'outer':
+        lo, hi = min(b[0] for b in bounds), max(b[1] for b in bounds)
+    else:
+        lo, hi = max(b[0] for b in bounds), min(b[1] for b in bounds)
+
+    ordinals = np.arange(lo, max(lo, hi + 1), dtype=np.int64)
+    index = RPeriodIndex(ordinal=ordinals, freq=freq)
+
+    gathered = {}
+    blocks = []
+    for collection, first, count in parts:
+        key = id(collection)
+        if key not in gathered:
+            gathered[key] = _gather(collection.values, collection.starts,
+                collection.lengths, collection.offsets, ordinals)
+        blocks.append(gathered[key][:, first:first + count])
+    return index, blocks
+
+def align(*objs, **kwargs):
+    """
+
+    Convert Series and DataFrames of different frequencies to a common
+    frequency and index.
+
+    Arguments:
+        objs: Series and DataFrames with an RPeriodIndex
+
+        freq (str, RFrequency): frequency to convert to. Defaults to the
+        lowest frequency of the inputs.
+
+        how (str, list): resampling method as for RSeriesCollection.resample(),
+        either one for all objects or one per object. Defaults to the
+        observed attribute of each object's index.
+
+        join (str): 'outer' to cover the union of the ranges of the objects
+        or 'inner' to cover their intersection
+
+    Returns:
+        A list with a Series or DataFrame for each input, all with the same
+        index
+
+    Example: m, q = align(monthly, quarterly); m + q
+
+    """
+
+    freq, how, join = _options(kwargs)
+    index, blocks = _align_blocks(objs, freq, how, join)
+
+    result = []
+    for obj, block in zip(objs, blocks):
+        if isinstance(obj, pd.DataFrame):
+            result.append(pd.DataFrame(block, index=index,
+                columns=obj.columns))
+        else:
+            result.append(pd.Series(block[:, 0], index=index, name=obj.name))
+    return result
+
+def concat(objs, **kwargs):
+    """
+
+    Combine Series and DataFrames of different frequencies side by side into
+    a single DataFrame at a common frequency. Accepts the same keyword
+    arguments as align(). Series without a name are named by their position
+    in objs.
+
+    """
+
+    freq, how, join = _options(kwargs)
+    index, blocks = _align_blocks(objs, freq, how, join)
+
+    columns = []
+    for i, obj in enumerate(objs):
+        if isinstance(obj, pd.DataFrame):
+            columns.extend(obj.columns)
+        else:
+            columns.append(i if obj.name is None else obj.name)
+    return pd.DataFrame(np.hstack(blocks), index=index, columns=columns)
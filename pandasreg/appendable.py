@@ -0,0 +1,168 @@
+"""
+A series that grows one period at a time without copying its history.
+"""
+
+import numpy as np
+import pandas as pd
+import pandas.core.common as com
+
+from pandasreg.rperiod import RPeriodIndex, RPeriod, RFrequency
+from pandasreg import setops
+
+class AppendableSeries(object):
+    """
+
+    Holds the ordinals and values of a series in buffers with spare capacity.
+    Appending a later period writes into the spare capacity, and the buffers
+    double in size when they are full, so appends take amortized constant
+    time. The index and series properties are views of the buffers and are
+    not copied.
+
+    Arguments:
+        freq (str, RFrequency): frequency of the series
+
+        dtype: dtype of the values
+
+        capacity (int): initial number of periods to reserve
+
+        name: name of the series
+
+        observed: default resampling method, as for RPeriodIndex
+
+    """
+
+    def __init__(self, freq, dtype=np.float64, capacity=16, name=None,
+                 observed=None):
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+
+        self.freq = freq
+        self.name = name
+        self.observed = "mean" if observed is None else observed
+        self.contiguous = True
+        self._ordinals = np.empty(max(capacity, 1), dtype=np.int64)
+        self._values = np.empty(max(capacity, 1), dtype=dtype)
+        self._n = 0
+
+    @classmethod
+    def from_series(cls, series, capacity=None):
+        """Create an appendable series holding a copy of a Series"""
+
+        if not isinstance(series.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        if capacity is None:
+            capacity = 2 * len(series)
+        result = cls(series.index.freq, dtype=series.dtype, capacity=capacity,
+            name=series.name, observed=series.index.observed)
+        result.extend(series)
+        return result
+
+    def __len__(self):
+        return self._n
+
+    def _reserve(self, n):
+        capacity = len(self._ordinals)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        ordinals = np.empty(capacity, dtype=np.int64)
+        ordinals[:self._n] = self._ordinals[:self._n]
+        values = np.empty(capacity, dtype=self._values.dtype)
+        values[:self._n] = self._values[:self._n]
+        self._ordinals, self._values = ordinals, values
+
+    def _to_ordinal(self, period):
+        if com.is_integer(period):
+            return period
+        if isinstance(period, RPeriod) and period.freq == self.freq:
+            return period.ordinal
+        return RPeriod(period, freq=self.freq).ordinal
+
+    def append(self, period, value):
+        """
+
+        Add a value for a period later than the last period in the series.
+
+        Arguments:
+            period (RPeriod, datetime, str, int): the period, or its ordinal
+
+            value: the value for the period
+
+        """
+
+        ordinal = self._to_ordinal(period)
+        if self._n > 0:
+            last = self._ordinals[self._n - 1]
+            if ordinal <= last:
+                raise ValueError("Can only append periods after the last period")
+            if ordinal != last + 1:
+                self.contiguous = False
+
+        self._reserve(self._n + 1)
+        self._ordinals[self._n] = ordinal
+        self._values[self._n] = value
+        self._n += 1
+
+    def extend(self, series):
+        """Append a Series with periods later than the last period"""
+
+        if not isinstance(series.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        if series.index.freq != self.freq:
+            raise ValueError("Series must have the same frequency")
+        if len(series) == 0:
+            return
+
+        ordinals = series.index.values
+        if not setops.is_sorted_unique(ordinals):
+            raise ValueError("Index must be sorted and unique")
+        if self._n > 0:
+            last = self._ordinals[self._n - 1]
+            if ordinals[0] <= last:
+                raise ValueError("Can only append periods after the last period")
+            if ordinals[0] != last + 1:
+                self.contiguous = False
+        if self.contiguous and not setops.is_contiguous(ordinals):
+            self.contiguous = False
+
+        n = self._n + len(ordinals)
+        self._reserve(n)
+        self._ordinals[self._n:n] = ordinals
+        self._values[self._n:n] = series.values
+        self._n = n
+
+    @property
+    def index(self):
+        """The current periods, as an RPeriodIndex view of the buffer"""
+
+        index = self._ordinals[:self._n].view(RPeriodIndex)
+        index.freq = self.freq
+        index.observed = self.observed
+        index.name = None
+        return index
+
+    @property
+    def series(self):
+        """The current data, as a Series view of the buffers"""
+
+        return pd.Series(self._values[:self._n], index=self.index,
+            name=self.name)
+
+    def get_loc(self, period):
+        """Position of a period in the series"""
+
+        ordinal = self._to_ordinal(period)
+        if self._n > 0:
+            if self.contiguous:
+                loc = ordinal - self._ordinals[0]
+                if 0 <= loc < self._n:
+                    return loc
+            else:
+                loc = self._ordinals[:self._n].searchsorted(ordinal)
+                if loc < self._n and self._ordinals[loc] == ordinal:
+                    return loc
+        raise KeyError(period)
+
+    def __getitem__(self, period):
+        return self._values[self.get_loc(period)]
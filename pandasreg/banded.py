@@ -0,0 +1,104 @@
+"""
+Solvers for symmetric positive definite banded linear systems.
+
+A symmetric matrix A with w nonzero subdiagonals is stored by rows in an
+array ab of shape (n, w+1), with the diagonal in the last column:
+
+    ab[i, w-k] = A[i, i-k]    for k = 0, ..., w
+
+Entries of ab that would fall before the first column of A are ignored. The
+factorization and the solves take O(n*w^2) time and O(n*w) memory, so they
+can be used on systems with one row per period of a long daily series. Both
+are typed loops in the compiled module _banded (src/_banded.pyx).
+"""
+
+import numpy as np
+
+from pandasreg._banded import cholesky, solve_cholesky
+
+def solve(ab, b):
+    """Solve A x = b for a symmetric positive definite banded matrix A"""
+
+    return solve_cholesky(cholesky(ab), b)
+
+def gram(coefs, starts, n):
+    """
+
+    Returns E'E in banded storage for an m x n matrix E whose row r has the
+    nonzero entries coefs[r, 0], ..., coefs[r, q] in columns starts[r], ...,
+    starts[r]+q. The result has q subdiagonals.
+
+    """
+
+    m, width = coefs.shape
+    q = width - 1
+    ab = np.zeros((n, width))
+    for k in range(width):
+        for j in range(width - k):
+            # row r contributes coefs[r, j+k]*coefs[r, j] to A[i, i-k] where
+            # i = starts[r] + j + k
+            i = starts + j + k
+            valid = i < n
+            ab[:, q - k] += np.bincount(i[valid],
+                weights=(coefs[:, j + k] * coefs[:, j])[valid], minlength=n)
+    return ab
+
+def difference_penalty(n, order):
+    """
+
+    Returns D'D in banded storage, where D is the (n-order) x n matrix of
+    differences of the given order, so that x'D'Dx is the sum of squared
+    differences of x.
+
+    """
+
+    # coefficients of a difference of the given order, e.g. [1, -2, 1]
+    c = np.array([1.0])
+    for _ in range(order):
+        c = np.append(c, 0) - np.append(0, c)
+    m = max(n - order, 0)
+    return gram(np.tile(c, (m, 1)), np.arange(m), n)
+
+def solve_constrained(ab, fixed, values):
+    """
+
+    Minimize x'Ax over the vectors x with x[fixed] = values, for a banded
+    positive semidefinite A that is positive definite on the remaining
+    entries. fixed must be sorted and unique. Removing the fixed rows and
+    columns keeps A banded, so this takes the same time as solve().
+
+    """
+
+    n, width = ab.shape
+    w = width - 1
+    fixed = np.asarray(fixed, dtype=np.int64)
+    x = np.zeros(n)
+    x[fixed] = values
+    free = np.ones(n, dtype=bool)
+    free[fixed] = False
+    if not free.any():
+        return x
+
+    # position of each free entry among the free entries
+    position = np.cumsum(free) - 1
+    rows = np.nonzero(free)[0]
+    reduced = np.zeros((len(rows), width))
+    reduced[:, w] = ab[rows, w]
+    rhs = np.zeros(len(rows))
+    for k in range(1, w + 1):
+        i = np.arange(k, n)
+        j = i - k
+        a = ab[k:, w - k]
+        both = free[i] & free[j]
+        reduced[position[i[both]], w - (position[i[both]] - position[j[both]])] \
+            = a[both]
+        # the gradient on the free entries is A_ff x_f + A_fF x_F
+        lower = free[i] & ~free[j]
+        rhs -= np.bincount(position[i[lower]],
+            weights=a[lower] * x[j[lower]], minlength=len(rows))
+        upper = ~free[i] & free[j]
+        rhs -= np.bincount(position[j[upper]],
+            weights=a[upper] * x[i[upper]], minlength=len(rows))
+
+    x[rows] = solve(reduced, rhs)
+    return x
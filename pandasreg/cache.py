@@ -0,0 +1,59 @@
+"""
+Byte-bounded least recently used caches for arrays.
+"""
+
+from collections import OrderedDict
+
+class LRUCache(object):
+    """
+
+    Mapping from keys to numpy arrays (or any values with an nbytes
+    attribute) that evicts the least recently used entries once the total
+    size of the values exceeds maxbytes. Values larger than maxbytes are not
+    cached.
+
+    Arguments:
+        maxbytes (int): maximum total size of the cached values
+
+    """
+
+    def __init__(self, maxbytes):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return default
+        self._data[key] = value
+        return value
+
+    def set(self, key, value):
+        if key in self._data:
+            self.nbytes -= self._data.pop(key).nbytes
+        if value.nbytes > self.maxbytes:
+            return
+        self._data[key] = value
+        self.nbytes += value.nbytes
+        self._evict()
+
+    def resize(self, maxbytes):
+        self.maxbytes = maxbytes
+        self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.maxbytes:
+            key, value = self._data.popitem(last=False)
+            self.nbytes -= value.nbytes
+
+    def clear(self):
+        self._data.clear()
+        self.nbytes = 0
@@ -0,0 +1,226 @@
+"""
+Resampling and transforms over data too large to hold in memory.
+
+The source is either an array (typically a read-only np.memmap, such as the
+values returned by pandasreg.io.read()) with one row per period starting at a
+given period, or an iterable of Series/DataFrames with consecutive
+RPeriodIndex chunks. The source is processed a chunk of rows at a time, so
+memory use is bounded by the chunk size and not by the length of the data.
+
+The functions return a generator of result chunks, or write the results into
+a preallocated array (such as a writable np.memmap) when out is given.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RPeriod, RFrequency
+from pandasreg.extensions import _reduce_runs, _resample_block
+from pandasreg import stats, setops
+
+CHUNKSIZE = 1 << 16
+
+# transforms whose lag is n years rather than n periods
+_YEARLY = (stats.dy, stats.dya, stats.logdy, stats.logdya, stats.pcy,
+           stats.pcya)
+_PERIODIC = (stats.d, stats.da, stats.logd, stats.logda, stats.pc, stats.pca)
+
+def _iter_chunks(source, freq, start, chunksize):
+    """Yields (freq, first ordinal, values, columns) for each chunk of source"""
+
+    if isinstance(source, np.ndarray):
+        if freq is None or start is None:
+            raise ValueError("Must supply freq and start for an array source")
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        if not isinstance(start, (int, long, np.integer)):
+            start = RPeriod(start, freq=freq).ordinal
+        for i in range(0, len(source), chunksize):
+            yield freq, start + i, np.asarray(source[i:i + chunksize]), None
+        return
+
+    expected = None
+    for chunk in source:
+        if not isinstance(chunk.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        if len(chunk) == 0:
+            continue
+        ordinals = chunk.index.values
+        if not setops.is_contiguous(ordinals) or \
+                (expected is not None and ordinals[0] != expected):
+            raise ValueError("Chunks must be contiguous and consecutive")
+        expected = ordinals[-1] + 1
+        columns = chunk.columns if isinstance(chunk, pd.DataFrame) else None
+        yield chunk.index.freq, ordinals[0], np.asarray(chunk.values), columns
+
+def _result(ordinals, values, freq, columns):
+    index = RPeriodIndex(ordinal=ordinals, freq=freq)
+    if values.ndim == 1:
+        return pd.Series(values, index=index)
+    return pd.DataFrame(values, index=index, columns=columns)
+
+def _concat(carry, values):
+    if carry is None or len(carry) == 0:
+        return values
+    return np.concatenate([carry, values])
+
+def _iresample(chunks, freq, how):
+    carry = None    # rows of the last target period, which may continue
+    first = None
+    for source_freq, start, values, columns in chunks:
+        if carry is None or len(carry) == 0:
+            first = start
+        values = _concat(carry, np.asarray(values, dtype=np.float64))
+
+        if freq == source_freq:
+            yield _result(np.arange(first, first + len(values),
+                dtype=np.int64), values, freq, columns)
+            carry = None
+            continue
+
+        ordinals = np.arange(first, first + len(values), dtype=np.int64)
+        if source_freq > freq:
+            bins = source_freq.np_asfreq(ordinals, freq)
+            # hold back the rows of the last target period so no period is
+            # split across chunks
+            cut = bins.searchsorted(bins[-1], side='left')
+            if cut > 0:
+                keys, agg = _reduce_runs(values[:cut], bins[:cut], how)
+                yield _result(keys, agg, freq, columns)
+            carry = values[cut:]
+            first += cut
+        else:
+            start, result = _resample_block(values, first, source_freq, freq,
+                how)
+            yield _result(np.arange(start, start + len(result),
+                dtype=np.int64), result, freq, columns)
+            carry = None
+
+    if carry is not None and len(carry) > 0:
+        start, result = _resample_block(carry, first, source_freq, freq, how)
+        yield _result(np.arange(start, start + len(result), dtype=np.int64),
+            result, freq, columns)
+
+def _itransform(chunks, func, n, lag):
+    previous = None     # last lag rows of the previous chunk
+    for freq, start, values, columns in chunks:
+        if lag is None:
+            if func in _YEARLY:
+                # periodicity is a float, but the lag is a number of rows
+                lag = int(round(n * freq.periodicity))
+            elif func in _PERIODIC:
+                lag = n
+            else:
+                raise ValueError("Must supply lag for a custom transform")
+        held = 0 if previous is None else len(previous)
+        values = _concat(previous, values)
+        first = start - held
+
+        obj = _result(np.arange(first, first + len(values), dtype=np.int64),
+            values, freq, columns)
+        result = func(obj, n)
+        yield result[held:]
+        previous = values[max(len(values) - lag, 0):]
+
+def _write(chunks, out):
+    first = None
+    last = None
+    freq = None
+    for chunk in chunks:
+        ordinals = chunk.index.values
+        if first is None:
+            first = ordinals[0]
+            freq = chunk.index.freq
+        out[ordinals[0] - first:ordinals[-1] - first + 1] = chunk.values
+        last = ordinals[-1]
+    if hasattr(out, 'flush'):
+        out.flush()
+    if first is None:
+        return None
+    return RPeriodIndex(ordinal=np.arange(first, last + 1, dtype=np.int64),
+        freq=freq)
+
+def resample(source, freq, how="mean", source_freq=None, start=None,
+             chunksize=CHUNKSIZE, out=None):
+    """
+
+    Resample a source chunk by chunk. Works like pandasreg.resample(), but how
+    must be one of 'sum', 'mean', 'first', 'last', 'min' or 'max', and NaN
+    values are ignored when aggregating. Rows belonging to the same target
+    period are always aggregated together, even when they span chunks.
+
+    Arguments:
+        source (ndarray, iterable): a 1-D or 2-D array with one row per
+        period, or an iterable of consecutive Series/DataFrames with an
+        RPeriodIndex
+
+        freq (str, RFrequency): frequency to resample to
+
+        how (str): aggregation or disaggregation method
+
+        source_freq (str, RFrequency): frequency of an array source
+
+        start (RPeriod, datetime, str, int): first period of an array source
+
+        chunksize (int): number of source rows per chunk
+
+        out (ndarray): optional array to write the results into, with one row
+        per target period starting at the first target period
+
+    Returns:
+        A generator of result Series/DataFrames, or, if out is given, the
+        RPeriodIndex of the rows written to out
+
+    """
+
+    if isinstance(freq, basestring):
+        freq = RFrequency.init(freq)
+    if how not in ("sum", "mean", "first", "last", "min", "max"):
+        raise KeyError("Invalid resampling function '%s'" % how)
+
+    chunks = _iresample(_iter_chunks(source, source_freq, start, chunksize),
+        freq, how)
+    if out is None:
+        return chunks
+    return _write(chunks, out)
+
+def transform(func, source, n=1, lag=None, freq=None, start=None,
+              chunksize=CHUNKSIZE, out=None):
+    """
+
+    Apply a transform such as pandasreg.pcy() chunk by chunk. The last rows
+    of each chunk are carried into the next one so that lagged values are
+    available at chunk boundaries and the result is the same as applying the
+    transform to the whole source.
+
+    Arguments:
+        func: a transform from pandasreg.stats, or any function taking a
+        Series/DataFrame and n
+
+        source (ndarray, iterable): as for resample()
+
+        n (int): argument passed to func
+
+        lag (int): number of earlier periods func looks back. Only needed for
+        functions that are not in pandasreg.stats.
+
+        freq (str, RFrequency): frequency of an array source
+
+        start (RPeriod, datetime, str, int): first period of an array source
+
+        chunksize (int): number of source rows per chunk
+
+        out (ndarray): optional array to write the results into, with one row
+        per source row
+
+    Returns:
+        A generator of result Series/DataFrames, or, if out is given, the
+        RPeriodIndex of the rows written to out
+
+    """
+
+    chunks = _itransform(_iter_chunks(source, freq, start, chunksize), func,
+        n, lag)
+    if out is None:
+        return chunks
+    return _write(chunks, out)
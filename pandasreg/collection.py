@@ -0,0 +1,370 @@
+"""
+A container for many series of the same frequency with different start and
+end dates.
+
+The values of all series are stored back to back in a single float64 buffer,
+together with the start ordinal and length of each series, so there is no NaN
+padding to a common index. Transforms work on the whole buffer at once.
+"""
+
+import operator
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency, _period_bounds
+from pandasreg.extensions import fill, _reduce_runs, _disaggregate_runs
+from pandasreg import setops
+
+def _offsets(lengths):
+    offsets = np.zeros(len(lengths), dtype=np.int64)
+    offsets[1:] = np.cumsum(lengths)[:-1]
+    return offsets
+
+def _ranges(starts, lengths):
+    """Concatenation of np.arange(start, start+length) for each start, length"""
+
+    return np.repeat(starts - _offsets(lengths), lengths) + \
+        np.arange(lengths.sum(), dtype=np.int64)
+
+def _regular_values(series):
+    """Values of a series over every period from its first to last period"""
+
+    ordinals = series.index.values
+    values = np.asarray(series.values, dtype=np.float64)
+    if setops.is_contiguous(ordinals):
+        return values
+    if not setops.is_sorted_unique(ordinals):
+        raise ValueError("Index must be sorted and unique")
+
+    result = np.empty(ordinals[-1] - ordinals[0] + 1, dtype=np.float64)
+    result.fill(np.nan)
+    result[ordinals - ordinals[0]] = values
+    return result
+
+def _gather(values, starts, lengths, offsets, ordinals):
+    """
+    Align ragged series on the given ordinals. Returns a 2-D array with one
+    column per series and NaN outside each series' range.
+    """
+
+    position = ordinals[:, np.newaxis] - starts
+    valid = (position >= 0) & (position < lengths)
+
+    result = np.empty(position.shape, dtype=np.float64)
+    result.fill(np.nan)
+    if valid.any():
+        result[valid] = values[(position + offsets)[valid]]
+    return result
+
+class RSeriesCollection(object):
+    """
+    N series of one frequency stored as a single value buffer.
+
+    Arguments:
+        values (ndarray): values of all series, back to back
+
+        starts (ndarray): ordinal of the first period of each series
+
+        lengths (ndarray): number of periods in each series
+
+        freq (str, RFrequency): frequency of the series
+
+        names (list): a name for each series. Defaults to 0..N-1.
+
+        observed: default resampling method, as for RPeriodIndex
+    """
+
+    __array_priority__ = 10
+
+    def __init__(self, values, starts, lengths, freq, names=None, observed=None):
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+
+        self.values = np.asarray(values, dtype=np.float64)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        if len(self.starts) != len(self.lengths):
+            raise ValueError("starts and lengths must have the same length")
+        if self.lengths.sum() != len(self.values):
+            raise ValueError("lengths must add up to the number of values")
+        self.offsets = _offsets(self.lengths)
+
+        if names is None:
+            names = range(len(self.starts))
+        self.names = list(names)
+        if len(self.names) != len(self.starts):
+            raise ValueError("Must supply one name per series")
+        self._positions = dict(zip(self.names, range(len(self.names))))
+
+        self.freq = freq
+        self.observed = "mean" if observed is None else observed
+
+    @classmethod
+    def from_series(cls, series, names=None):
+        """Create a collection from a list or dict of Series with an RPeriodIndex"""
+
+        if isinstance(series, dict):
+            names = list(series.keys()) if names is None else names
+            series = [series[name] for name in names]
+        elif names is None:
+            names = [s.name if s.name is not None else i
+                     for i, s in enumerate(series)]
+        if len(series) == 0:
+            raise ValueError("Must supply at least one series")
+
+        freq = series[0].index.freq
+        for s in series:
+            if not isinstance(s.index, RPeriodIndex):
+                raise ValueError("Index must be of type RPeriodIndex")
+            if s.index.freq != freq:
+                raise ValueError("Can only collect series with the same frequency")
+
+        values = [_regular_values(s) for s in series]
+        starts = [s.index.values[0] if len(s) > 0 else 0 for s in series]
+        lengths = [len(v) for v in values]
+        return cls(np.concatenate(values), starts, lengths, freq, names,
+            series[0].index.observed)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Create a collection from the columns of a DataFrame with an
+        RPeriodIndex, dropping leading and trailing NaN values of each column
+        """
+
+        if not isinstance(frame.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        frame = fill(frame)
+
+        values = np.asarray(frame.values, dtype=np.float64)
+        nrows, ncols = values.shape
+        finite = np.isfinite(values)
+        first = finite.argmax(axis=0)
+        last = nrows - 1 - finite[::-1].argmax(axis=0)
+        lengths = np.where(finite.any(axis=0), last - first + 1, 0)
+
+        # values in column-major order so each column is contiguous
+        columns = values.T.ravel()
+        data = columns[_ranges(np.arange(ncols) * nrows + first, lengths)]
+        starts = frame.index.values[0] + first
+        return cls(data, starts, lengths, frame.index.freq, frame.columns,
+            frame.index.observed)
+
+    def _with_values(self, values):
+        return type(self)(values, self.starts, self.lengths, self.freq,
+            self.names, self.observed)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, name):
+        i = self._positions[name]
+        start, length, offset = self.starts[i], self.lengths[i], self.offsets[i]
+        index = RPeriodIndex(ordinal=np.arange(start, start + length,
+            dtype=np.int64), freq=self.freq, observed=self.observed)
+        return pd.Series(self.values[offset:offset + length], index=index,
+            name=name)
+
+    def items(self):
+        for name in self.names:
+            yield name, self[name]
+
+    def to_frame(self, start=None, end=None):
+        """
+        Align the series into a DataFrame.
+
+        Arguments:
+            start, end (RPeriod, datetime, str): range of periods. Defaults to
+            the union of the ranges of the series.
+        """
+
+        nonempty = self.lengths > 0
+        if start is None:
+            start = self.starts[nonempty].min() if nonempty.any() else 0
+        else:
+            start = _period_bounds(start, self.freq)[0]
+        if end is None:
+            end = (self.starts + self.lengths)[nonempty].max() - 1 \
+                if nonempty.any() else -1
+        else:
+            end = _period_bounds(end, self.freq)[1]
+
+        ordinals = np.arange(start, max(start, end + 1), dtype=np.int64)
+        result = _gather(self.values, self.starts, self.lengths, self.offsets,
+            ordinals)
+        return pd.DataFrame(result, index=RPeriodIndex(ordinal=ordinals,
+            freq=self.freq, observed=self.observed), columns=self.names)
+
+    def trim(self):
+        """Trim leading and trailing NaN values of every series"""
+
+        values = self.values
+        finite = np.isfinite(values)
+        position = np.arange(len(values), dtype=np.int64)
+
+        first = self.offsets.copy()
+        last = self.offsets - 1
+        nonempty = self.lengths > 0
+        if nonempty.any():
+            offsets = self.offsets[nonempty]
+            first[nonempty] = np.minimum.reduceat(
+                np.where(finite, position, len(values)), offsets)
+            last[nonempty] = np.maximum.reduceat(
+                np.where(finite, position, -1), offsets)
+
+        lengths = np.maximum(last - first + 1, 0)
+        starts = np.where(lengths > 0, self.starts + first - self.offsets,
+            self.starts)
+        return type(self)(values[_ranges(first, lengths)], starts, lengths,
+            self.freq, self.names, self.observed)
+
+    def fill(self):
+        """
+        Series in a collection always cover every period from their start to
+        their end, so this returns the collection itself. It exists so code
+        written for fill() on a Series also works on a collection.
+        """
+
+        return self
+
+    def shift(self, n):
+        """Shift the values of every series n periods forward"""
+
+        n = int(n)
+        total = len(self.values)
+        position = np.arange(total, dtype=np.int64)
+        source = position - np.repeat(self.offsets, self.lengths) - n
+        valid = (source >= 0) & (source < np.repeat(self.lengths, self.lengths))
+
+        result = np.empty(total, dtype=np.float64)
+        result.fill(np.nan)
+        result[valid] = self.values[position[valid] - n]
+        return self._with_values(result)
+
+    def _binary(self, other, op):
+        if isinstance(other, RSeriesCollection):
+            if other.freq != self.freq or \
+                    not np.array_equal(other.starts, self.starts) or \
+                    not np.array_equal(other.lengths, self.lengths):
+                raise ValueError("Collections must have the same layout")
+            other = other.values
+        return self._with_values(op(self.values, other))
+
+    def __add__(self, other):
+        return self._binary(other, operator.add)
+
+    def __radd__(self, other):
+        return self._binary(other, lambda x, y: y + x)
+
+    def __sub__(self, other):
+        return self._binary(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._binary(other, lambda x, y: y - x)
+
+    def __mul__(self, other):
+        return self._binary(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._binary(other, lambda x, y: y * x)
+
+    def __div__(self, other):
+        return self._binary(other, operator.truediv)
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, other):
+        return self._binary(other, lambda x, y: y / x)
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, other):
+        return self._binary(other, operator.pow)
+
+    def __rpow__(self, other):
+        return self._binary(other, lambda x, y: y ** x)
+
+    def __neg__(self):
+        return self._with_values(-self.values)
+
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.values
+        return self.values.astype(dtype)
+
+    def __array_wrap__(self, result, context=None):
+        return self._with_values(result)
+
+    def resample(self, freq, how=None):
+        """
+        Resample every series to another frequency in one pass over the
+        buffer. Works like pandasreg.resample(), but how must be one of 'sum',
+        'mean', 'first', 'last', 'min' or 'max'. NaN values are ignored when
+        aggregating.
+        """
+
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        if how is None:
+            how = self.observed
+        if how not in ("sum", "mean", "first", "last", "min", "max"):
+            raise KeyError("Invalid resampling function '%s'" % how)
+
+        nonempty = self.lengths > 0
+        if freq == self.freq or not nonempty.any():
+            return self
+
+        lo = self.starts[nonempty].min()
+        hi = (self.starts + self.lengths)[nonempty].max() - 1
+
+        if self.freq < freq:
+            return self._disaggregate(freq, how, lo, hi)
+        return self._aggregate(freq, how, lo, hi)
+
+    def _aggregate(self, freq, how, lo, hi):
+        nonempty = self.lengths > 0
+        values = self.values
+        total = len(values)
+
+        # target period of every value, computed once over the union range
+        bins = self.freq.np_asfreq(np.arange(lo, hi + 1, dtype=np.int64), freq)
+        bins = bins[_ranges(self.starts, self.lengths) - lo]
+
+        first = np.minimum(self.offsets, total - 1)
+        last = np.maximum(self.offsets + self.lengths - 1, 0)
+        starts = np.where(nonempty, bins[first], 0)
+        lengths = np.where(nonempty, bins[last] - starts + 1, 0)
+
+        segment = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        dest = _offsets(lengths)[segment] + bins - starts[segment]
+        dest, agg = _reduce_runs(values, dest, how)
+
+        result = np.empty(lengths.sum(), dtype=np.float64)
+        result.fill(np.nan)
+        result[dest] = agg
+        return type(self)(result, starts, lengths, freq, self.names,
+            self.observed)
+
+    def _disaggregate(self, freq, how, lo, hi):
+        nonempty = self.lengths > 0
+
+        # source period of every target period, computed once over the union
+        tlo = self.freq.asfreq(lo, freq, how='S')
+        thi = self.freq.asfreq(hi, freq, how='E')
+        source = freq.np_asfreq(np.arange(tlo, thi + 1, dtype=np.int64),
+            self.freq)
+
+        starts = tlo + source.searchsorted(self.starts, side='left')
+        ends = tlo + source.searchsorted(self.starts + self.lengths - 1,
+            side='right') - 1
+        starts = np.where(nonempty, starts, 0)
+        lengths = np.where(nonempty, ends - starts + 1, 0)
+
+        position = _ranges(starts, lengths) - tlo
+        segment = np.repeat(np.arange(len(self.lengths)), lengths)
+        result = self.values[self.offsets[segment] + source[position] -
+            self.starts[segment]]
+        result = _disaggregate_runs(result, position, source, how)
+
+        return type(self)(result, starts, lengths, freq, self.names,
+            self.observed)
@@ -0,0 +1,308 @@
+"""
+Temporal disaggregation: distributing the values of a lower-frequency series
+over the periods of a higher frequency, such that the result aggregates back
+to the original values (a sum, mean, first or last value per period).
+
+Each lower-frequency period constrains the higher-frequency periods that
+RFrequency.np_asfreq() maps into it. The smoothness criteria of the Denton
+method and the AR(1) covariance of the Chow-Lin method both have banded
+(inverse) matrices, so the work at the higher frequency is linear in the
+number of periods.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency
+from pandasreg import banded, setops
+
+__all__ = ['denton', 'chow_lin']
+
+_HOWS = ("sum", "mean", "first", "last")
+
+def _setup(series, freq, how):
+    """
+
+    Returns the target frequency, the target ordinals, the position of each
+    target period's lower-frequency period, the position of the first target
+    period of each lower-frequency period, the number of target periods in
+    each, and the lower-frequency values as a 2-D array.
+
+    """
+
+    if not isinstance(series.index, RPeriodIndex):
+        raise ValueError("Index must be of type RPeriodIndex")
+    if how not in _HOWS:
+        raise KeyError("Invalid aggregation function '%s'" % how)
+    if isinstance(freq, basestring):
+        freq = RFrequency.init(freq)
+    source = series.index.freq
+    if not freq > source:
+        raise ValueError("Can only disaggregate to a higher frequency")
+
+    values = np.asarray(series.values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    rows = np.nonzero(np.isfinite(values).any(axis=1))[0]
+    if len(rows) == 0:
+        raise ValueError("Series has no values")
+    ordinals = series.index.values[rows[0]:rows[-1] + 1]
+    values = values[rows[0]:rows[-1] + 1]
+    if not setops.is_contiguous(ordinals) or not np.isfinite(values).all():
+        raise ValueError("Values may only be missing at the start and end")
+
+    start = source.asfreq(ordinals[0], freq, how='S')
+    end = source.asfreq(ordinals[-1], freq, how='E')
+    target = np.arange(start, end + 1, dtype=np.int64)
+    block = freq.np_asfreq(target, source) - ordinals[0]
+    # the last target period may overlap into the next lower-frequency period
+    # (e.g. a month ending on a weekend to B), which is not being distributed
+    keep = block.searchsorted(len(ordinals) - 1, side='right')
+    target, block = target[:keep], block[:keep]
+    starts = block.searchsorted(np.arange(len(ordinals)))
+    lengths = np.diff(np.append(starts, len(target)))
+    return freq, target, block, starts, lengths, values
+
+def _indicator(indicator, freq, target):
+    """Values of an indicator Series/DataFrame over the target periods, 2-D"""
+
+    if not isinstance(indicator.index, RPeriodIndex) or \
+            indicator.index.freq != freq:
+        raise ValueError("Indicator must have an RPeriodIndex at frequency %s"
+            % freq.freqstr)
+    ordinals = indicator.index.values
+    position = ordinals.searchsorted(target)
+    if position[-1] >= len(ordinals) or \
+            not (ordinals[position] == target).all():
+        raise ValueError("Indicator must cover all target periods")
+    values = np.asarray(indicator.values, dtype=np.float64)[position]
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if not np.isfinite(values).all():
+        raise ValueError("Indicator must not have missing values")
+    return values
+
+def _wrap(series, result, target, freq):
+    index = RPeriodIndex(ordinal=target, freq=freq,
+        observed=series.index.observed)
+    if isinstance(series, pd.DataFrame):
+        return pd.DataFrame(result, index=index, columns=series.columns)
+    return pd.Series(result[:, 0], index=index, name=series.name)
+
+def _difference(order):
+    c = np.array([1.0])
+    for _ in range(order):
+        c = np.append(c, 0) - np.append(0, c)
+    return c
+
+def denton(series, freq, how="sum", indicator=None, proportional=False,
+           order=1):
+    """Denton disaggregation of a Series or DataFrame to a higher frequency
+
+    Finds the series x at the higher frequency closest to the indicator p, in
+    the sense of minimizing the sum of squared differences of x-p (additive)
+    or x/p (proportional), while aggregating exactly to the original values.
+    Without an indicator, this gives the smoothest series that aggregates to
+    the original. This is the modified Denton method, which does not anchor
+    the first period to the indicator.
+
+    Sum and mean constraints are solved in terms of the cumulative sum of the
+    result, which turns them into fixed values at the end of each
+    lower-frequency period, so the system stays banded.
+
+    Arguments:
+
+        series (pd.Series, pd.DataFrame): lower-frequency values. Values may
+        be missing only at the start and end.
+
+        freq (str, RFrequency): higher frequency to disaggregate to
+
+        how (str): how the result aggregates to series: 'sum', 'mean',
+        'first' or 'last'
+
+        indicator (pd.Series): optional series at freq covering the result
+        periods, which the result follows
+
+        proportional (bool): preserve the proportional rather than the
+        additive movements of the indicator
+
+        order (int): order of the differences that are minimized
+
+    """
+
+    freq, target, block, starts, lengths, values = _setup(series, freq, how)
+    n = len(target)
+    if indicator is None:
+        p = np.ones(n)
+    else:
+        p = _indicator(indicator, freq, target)[:, 0]
+    if proportional:
+        if (p <= 0).any():
+            raise ValueError("Indicator must be positive for proportional "
+                "Denton")
+        weight, base = p, np.zeros(n)
+    else:
+        weight = np.ones(n)
+        base = p if indicator is not None else np.zeros(n)
+
+    # differences of v = (x-base)/weight are minimized
+    c = _difference(order)
+    inverse = 1.0 / weight
+    m = max(n - order, 0)
+    result = np.empty((n, values.shape[1]))
+
+    if how in ("sum", "mean"):
+        # in terms of S, the cumulative sum of x-base with S[0] = 0,
+        # v[t] = (S[t+1]-S[t])/weight[t]
+        coefs = np.zeros((m, order + 2))
+        for q in range(order + 2):
+            if q >= 1:
+                coefs[:, q] += c[q - 1] * inverse[q - 1:m + q - 1]
+            if q <= order:
+                coefs[:, q] -= c[q] * inverse[q:m + q]
+        ab = banded.gram(coefs, np.arange(m), n + 1)
+        fixed = np.append(0, starts + lengths)
+        totals = values * lengths[:, np.newaxis] if how == "mean" else values
+        totals = totals - np.bincount(block, weights=base,
+            minlength=len(starts))[:, np.newaxis]
+        for j in range(values.shape[1]):
+            S = banded.solve_constrained(ab, fixed,
+                np.append(0, np.cumsum(totals[:, j])))
+            result[:, j] = base + np.diff(S)
+    else:
+        coefs = np.zeros((m, order + 1))
+        for q in range(order + 1):
+            coefs[:, q] = c[q] * inverse[q:m + q]
+        ab = banded.gram(coefs, np.arange(m), n)
+        fixed = starts if how == "first" else starts + lengths - 1
+        for j in range(values.shape[1]):
+            result[:, j] = base + banded.solve_constrained(ab, fixed,
+                values[:, j] - base[fixed])
+
+    return _wrap(series, result, target, freq)
+
+def _aggregated_cov(rho, starts, lengths, how):
+    """
+
+    Covariance of the aggregated values of a stationary AR(1) process with
+    coefficient rho and unit innovation variance, with one row per
+    lower-frequency period. Computed from closed forms per period, without
+    forming the covariance at the higher frequency.
+
+    """
+
+    ends = starts + lengths - 1
+    geometric = {}
+    pairs = {}
+    for k in np.unique(lengths):
+        powers = rho ** np.arange(k)
+        geometric[k] = powers.sum()
+        # sum of rho**|a-b| over all pairs a, b of k periods
+        pairs[k] = k + 2 * ((k - np.arange(1, k)) * powers[1:]).sum()
+    geometric = np.array([geometric[k] for k in lengths])
+    pairs = np.array([pairs[k] for k in lengths])
+
+    if how == "sum":
+        tail, head, diagonal = geometric, geometric, pairs
+    elif how == "mean":
+        tail = head = geometric / lengths
+        diagonal = pairs / lengths ** 2
+    elif how == "first":
+        tail, head, diagonal = rho ** (lengths - 1.0), np.ones(len(starts)), 1
+    else:
+        tail, head, diagonal = np.ones(len(starts)), rho ** (lengths - 1.0), 1
+
+    # for an earlier period i and a later period j, the covariance is the
+    # correlation of the end of i with the start of j times the aggregated
+    # weights on either side
+    distance = starts[np.newaxis, :] - ends[:, np.newaxis]
+    W = np.triu(np.outer(tail, head) * rho ** np.maximum(distance, 0), 1)
+    W = W + W.T
+    W[np.diag_indices_from(W)] = diagonal
+    return W / (1 - rho ** 2)
+
+def _gls(W, X, y):
+    """
+
+    GLS regression of y on X with covariance W. Returns the coefficients,
+    W^-1 times the residuals and the concentrated log-likelihood.
+
+    """
+
+    L = np.linalg.cholesky(W)
+    Xs = np.linalg.solve(L, X)
+    ys = np.linalg.solve(L, y)
+    beta = np.linalg.lstsq(Xs, ys)[0]
+    e = ys - np.dot(Xs, beta)
+    m = len(y)
+    loglik = -0.5 * m * np.log(np.dot(e, e) / m) - np.log(np.diag(L)).sum()
+    return beta, np.linalg.solve(L.T, e), loglik
+
+def chow_lin(series, freq, indicators=None, how="sum", rho=None):
+    """Chow-Lin disaggregation of a Series or DataFrame to a higher frequency
+
+    Regresses the lower-frequency values on the aggregated indicators (and a
+    constant) by GLS, assuming AR(1) residuals at the higher frequency, and
+    distributes the aggregated residuals over the higher-frequency periods
+    with the same AR(1) covariance. The result aggregates exactly to the
+    original values.
+
+    The inverse of the AR(1) covariance is tridiagonal, so distributing the
+    residuals is a banded solve at the higher frequency. The GLS regression
+    works at the lower frequency, with a covariance built in closed form.
+
+    Arguments:
+
+        series (pd.Series, pd.DataFrame): lower-frequency values. Values may
+        be missing only at the start and end.
+
+        freq (str, RFrequency): higher frequency to disaggregate to
+
+        indicators (pd.Series, pd.DataFrame): optional regressors at freq
+        covering the result periods
+
+        how (str): how the result aggregates to series: 'sum', 'mean',
+        'first' or 'last'
+
+        rho (float): AR(1) coefficient. By default it is estimated for each
+        column by maximum likelihood over a grid from 0 to 0.99.
+
+    """
+
+    freq, target, block, starts, lengths, values = _setup(series, freq, how)
+    n = len(target)
+    X = np.ones((n, 1))
+    if indicators is not None:
+        X = np.hstack([X, _indicator(indicators, freq, target)])
+
+    # weight of each target period in the aggregate of its period
+    if how == "sum":
+        c = np.ones(n)
+    elif how == "mean":
+        c = 1.0 / lengths[block]
+    else:
+        c = np.zeros(n)
+        c[starts if how == "first" else starts + lengths - 1] = 1
+    aggregated = np.column_stack([np.bincount(block, weights=c * X[:, k],
+        minlength=len(starts)) for k in range(X.shape[1])])
+
+    result = np.empty((n, values.shape[1]))
+    for j in range(values.shape[1]):
+        y = values[:, j]
+        if rho is None:
+            fits = [(_gls(_aggregated_cov(r, starts, lengths, how),
+                aggregated, y), r) for r in np.linspace(0, 0.99, 100)]
+            (beta, z, loglik), r = max(fits, key=lambda fit: fit[0][2])
+        else:
+            r = rho
+            beta, z, loglik = _gls(_aggregated_cov(r, starts, lengths, how),
+                aggregated, y)
+
+        # inverse AR(1) covariance
+        ab = np.zeros((n, 2))
+        ab[:, 1] = 1 + r ** 2
+        ab[0, 1] = ab[-1, 1] = 1
+        ab[1:, 0] = -r
+        result[:, j] = np.dot(X, beta) + banded.solve(ab, c * z[block])
+
+    return _wrap(series, result, target, freq)
@@ -1,20 +1,10 @@
 import numpy as np
 import pandas as pd
-from dateutil.relativedelta import relativedelta
-from pandas.tseries import frequencies
-from pandas.tseries.offsets import DateOffset, CacheableOffset
-from pandas.tseries.frequencies import to_offset
-from pandas.tseries import offsets
-from datetime import datetime, timedelta
-from collections import defaultdict
-import os
-import glob
-import subprocess
-import uuid
-import pandas.lib as lib
 
 from pandasreg.rperiod import RPeriodIndex, RFrequency, RPeriod
+from pandasreg import profiling
 
+@profiling.timed('trim', size=0)
 def trim(series):
     """Trim trailing and leading NaN values"""
 
@@ -23,6 +13,7 @@ def trim(series):
         return series[0:0]
     return series[ix[0]:(ix[-1]+1)]
 
+@profiling.timed('fill', size=0)
 def fill(series):
     """Makes a series regularly spaced if it is not so already"""
 
@@ -44,6 +35,115 @@ def _agg_last(x):
         return np.nan
     return x[ix[-1]]
 
+def _reduce_runs(values, keys, how):
+    """
+    Aggregate the values in each run of equal consecutive keys, ignoring NaN
+    values. values can be 1-D, or 2-D with one row per key. Returns a tuple of
+    the key of each run and the aggregated values.
+    """
+
+    n = len(keys)
+    change = np.ones(n, dtype=bool)
+    change[1:] = keys[1:] != keys[:-1]
+    groups = np.nonzero(change)[0]
+
+    finite = np.isfinite(values)
+    count = np.add.reduceat(finite.astype(np.int64), groups, axis=0)
+    if how in ("sum", "mean"):
+        agg = np.add.reduceat(np.where(finite, values, 0), groups, axis=0)
+        if how == "mean":
+            agg = agg / np.maximum(count, 1)
+    elif how == "min":
+        agg = np.minimum.reduceat(np.where(finite, values, np.inf), groups, axis=0)
+    elif how == "max":
+        agg = np.maximum.reduceat(np.where(finite, values, -np.inf), groups, axis=0)
+    elif how in ("first", "last"):
+        position = np.arange(n).reshape((n,) + (1,) * (values.ndim - 1))
+        if how == "first":
+            position = np.minimum.reduceat(np.where(finite, position, n - 1),
+                groups, axis=0)
+        else:
+            position = np.maximum.reduceat(np.where(finite, position, 0),
+                groups, axis=0)
+        if values.ndim == 1:
+            agg = values[position]
+        else:
+            agg = values[position, np.arange(values.shape[1])]
+    else:
+        raise KeyError("Invalid aggregation function '%s'" % how)
+
+    agg = np.asarray(agg, dtype=np.float64)
+    agg[count == 0] = np.nan
+    return keys[groups], agg
+
+def _disaggregate_runs(values, position, source, how):
+    """
+    Spread values from lower-frequency periods over higher-frequency periods.
+
+    Arguments:
+        values (ndarray): the value of the containing lower-frequency period
+        for each higher-frequency period, 1-D or 2-D with one row per period
+
+        position (ndarray): position of each higher-frequency period in source
+
+        source (ndarray): sorted lower-frequency ordinal of every
+        higher-frequency period in the range being converted
+
+        how (str): 'sum' divides by the number of periods in the group,
+        'first' and 'last' keep only the first or last period of the group,
+        and 'mean', 'min' and 'max' repeat the value
+    """
+
+    src = source[position]
+    if how == "sum":
+        count = source.searchsorted(src, side='right') - \
+            source.searchsorted(src, side='left')
+        return values / count.reshape((-1,) + (1,) * (values.ndim - 1))
+    elif how == "first":
+        values = np.array(values, dtype=np.float64)
+        values[position != source.searchsorted(src, side='left')] = np.nan
+    elif how == "last":
+        values = np.array(values, dtype=np.float64)
+        values[position != source.searchsorted(src, side='right') - 1] = np.nan
+    elif how not in ("mean", "min", "max"):
+        raise KeyError("Invalid disaggregation function '%s'" % how)
+    return values
+
+def _resample_block(values, first, source_freq, freq, how):
+    """
+
+    Resample a block of values with one row per period, starting at ordinal
+    first, using the vectorized kernels. how must be one of 'sum', 'mean',
+    'first', 'last', 'min' or 'max'. Returns a tuple of the first target
+    ordinal and the resampled values, with one row per target period.
+
+    """
+
+    if source_freq == freq or len(values) == 0:
+        return first, values
+
+    ordinals = np.arange(first, first + len(values), dtype=np.int64)
+    if source_freq > freq:
+        bins = source_freq.np_asfreq(ordinals, freq)
+        keys, agg = _reduce_runs(values, bins, how)
+        result = np.empty((keys[-1] - keys[0] + 1,) + values.shape[1:])
+        result.fill(np.nan)
+        result[keys - keys[0]] = agg
+        return keys[0], result
+
+    start = source_freq.asfreq(ordinals[0], freq, how='S')
+    end = source_freq.asfreq(ordinals[-1], freq, how='E')
+    target = np.arange(start, end + 1, dtype=np.int64)
+    source = freq.np_asfreq(target, source_freq)
+    # the last target period may overlap into the next source period (e.g. a
+    # month ending on a weekend to B), which is not in the block
+    keep = source.searchsorted(ordinals[-1], side='right')
+    target, source = target[:keep], source[:keep]
+    result = _disaggregate_runs(values[source - first],
+        np.arange(len(target)), source, how)
+    return start, result
+
+@profiling.timed('resample', size=0)
 def resample(input, freq, how=None):
     """Resample (convert) a time series to another frequency.
 
@@ -148,6 +248,7 @@ def resample(input, freq, how=None):
 
     return input
 
+@profiling.timed('overlay')
 def overlay(series, replace=True):
     """
     Overlay a list of series on top of each other
@@ -183,6 +284,7 @@ def overlay(series, replace=True):
 
     return new_series
 
+@profiling.timed('extend', size=0)
 def extend(input, extender, direction="forward", extender_type="index"):
     """
     Extend a series forward or backward using another series or an array.
@@ -0,0 +1,157 @@
+"""
+Compact binary storage for Series and DataFrames with an RPeriodIndex.
+
+A file consists of a fixed prefix (magic, version, header length), a JSON
+header describing the frequency and the index, the int64 ordinals if the index
+has gaps, and finally the raw little-endian values in row-major order. A
+contiguous index is stored as just its first ordinal and length. Values are
+memory mapped when read, so opening a large file is instant and reading a
+range of periods only touches the bytes for those periods.
+"""
+
+import json
+import struct
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, _period_bounds
+from pandasreg.rfreq import RFrequency, aliases
+from pandasreg import setops
+
+_MAGIC = b'PDRG'
+_VERSION = 1
+_PREFIX = '<4sII'
+_ALIGN = 64
+
+def _data_offset(header_length):
+    offset = struct.calcsize(_PREFIX) + header_length
+    return offset + (-offset % _ALIGN)
+
+def _freq_to_header(freq):
+    return {
+        'freq': freq.freqstr,
+        'stride': int(freq.stride // aliases[freq.freqstr][1]),
+        'anchor': int(freq.anchor),
+        'periodicity': freq.periodicity
+    }
+
+def _freq_from_header(header):
+    return RFrequency.init(header['freq'], stride=header['stride'],
+        anchor=header['anchor'], periodicity=header['periodicity'])
+
+def write(obj, path):
+    """
+    Write a Series or DataFrame with an RPeriodIndex to a file.
+
+    Arguments:
+        obj (Series, DataFrame): numeric data to write
+
+        path (str): file to write to
+    """
+
+    if not isinstance(obj.index, RPeriodIndex):
+        raise ValueError("Index must be of type RPeriodIndex")
+
+    values = np.asarray(obj.values)
+    if values.dtype.kind not in 'biufc':
+        raise ValueError("Only numeric data can be written")
+    values = np.ascontiguousarray(values,
+        dtype=values.dtype.newbyteorder('<'))
+
+    ordinals = obj.index.values
+    gapped = not setops.is_contiguous(ordinals)
+
+    header = _freq_to_header(obj.index.freq)
+    header.update({
+        'start': int(ordinals[0]) if len(ordinals) > 0 else 0,
+        'length': len(ordinals),
+        'gapped': gapped,
+        'dtype': values.dtype.str,
+        'observed': obj.index.observed,
+        'index_name': obj.index.name
+    })
+    if isinstance(obj, pd.DataFrame):
+        header['columns'] = obj.columns.tolist()
+    else:
+        header['name'] = obj.name
+    header = json.dumps(header).encode('utf-8')
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack(_PREFIX, _MAGIC, _VERSION, len(header)))
+        f.write(header)
+        f.write(b'\0' * (_data_offset(len(header)) - f.tell()))
+        if gapped:
+            np.asarray(ordinals, dtype='<i8').tofile(f)
+        values.tofile(f)
+
+def read_header(path):
+    """Returns the header of a file written by write() as a dict"""
+
+    with open(path, 'rb') as f:
+        prefix = f.read(struct.calcsize(_PREFIX))
+        magic, version, header_length = struct.unpack(_PREFIX, prefix)
+        if magic != _MAGIC:
+            raise ValueError("'%s' is not a pandasreg file" % path)
+        if version != _VERSION:
+            raise ValueError("Unsupported file version %d" % version)
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    header['offset'] = _data_offset(header_length)
+    return header
+
+def _map(path, dtype, offset, shape):
+    if shape[0] == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+def read(path, start=None, end=None):
+    """
+    Read a Series or DataFrame written by write(). The values are a read-only
+    memory map of the file.
+
+    Arguments:
+        path (str): file to read
+
+        start, end (RPeriod, datetime, str): optional range of periods to
+        read. Lower-frequency bounds such as "2007Q1" cover their whole span.
+    """
+
+    header = read_header(path)
+    freq = _freq_from_header(header)
+    first = header['start']
+    n = header['length']
+    offset = header['offset']
+
+    ordinals = None
+    if header['gapped']:
+        ordinals = _map(path, '<i8', offset, (n,))
+        offset += n * 8
+
+    columns = header.get('columns')
+    shape = (n,) if columns is None else (n, len(columns))
+    values = _map(path, header['dtype'], offset, shape)
+
+    lo, hi = 0, n
+    if start is not None:
+        bound = _period_bounds(start, freq)[0]
+        if ordinals is None:
+            lo = min(max(bound - first, 0), n)
+        else:
+            lo = ordinals.searchsorted(bound, side='left')
+    if end is not None:
+        bound = _period_bounds(end, freq)[1]
+        if ordinals is None:
+            hi = min(max(bound - first + 1, 0), n)
+        else:
+            hi = ordinals.searchsorted(bound, side='right')
+    hi = max(lo, hi)
+
+    if ordinals is None:
+        ordinals = np.arange(first + lo, first + hi, dtype=np.int64)
+    else:
+        ordinals = np.array(ordinals[lo:hi], dtype=np.int64)
+    index = RPeriodIndex(ordinal=ordinals, freq=freq,
+        name=header['index_name'], observed=header['observed'])
+
+    if columns is None:
+        return pd.Series(values[lo:hi], index=index, name=header['name'])
+    return pd.DataFrame(values[lo:hi], index=index, columns=columns)
@@ -0,0 +1,167 @@
+"""
+Running a function on many series at once in a pool of worker processes.
+
+The values of all series are placed back to back in a block of anonymous
+shared memory, as in an RSeriesCollection, and so is the output. The worker
+processes are forked after the memory and the function are in place, so each
+task sent to a worker is only a few integers: the position of the series, its
+first ordinal, its length and its offset into the buffers. The worker builds
+a Series around its slice of the shared values without copying them, calls
+the function, and writes the result into the shared output, so neither the
+values nor the results are pickled.
+
+This relies on fork(), so on platforms without it (Windows) the series are
+processed in the calling process.
+"""
+
+import os
+import mmap
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency
+from pandasreg.collection import RSeriesCollection, _offsets
+
+__all__ = ['map_series']
+
+# (func, input values, freq, output values, output freq, observed), set in the
+# parent before the pool is forked and inherited by the workers
+_state = None
+
+def _shared_array(length):
+    """A float64 array of the given length in anonymous shared memory"""
+
+    buf = mmap.mmap(-1, max(length, 1) * 8)
+    return np.frombuffer(buf, dtype=np.float64, count=length)
+
+def _run(task):
+    func, values, freq, out, out_freq, observed = _state
+    i, start, length, offset, out_start, out_length, out_offset = task
+
+    series_values = values[offset:offset + length]
+    index = RPeriodIndex(ordinal=np.arange(start, start + length,
+        dtype=np.int64), freq=freq, observed=observed)
+    result = func(pd.Series(series_values, index=index))
+
+    if not isinstance(result, pd.Series) or \
+            not isinstance(result.index, RPeriodIndex):
+        raise ValueError("Function must return a Series with an RPeriodIndex")
+    if result.index.freq != out_freq:
+        raise ValueError("Function returned frequency %s, expected %s" %
+            (result.index.freq.freqstr, out_freq.freqstr))
+
+    # keep the part of the result that falls in the output range
+    position = result.index.values - out_start
+    valid = (position >= 0) & (position < out_length)
+    out[out_offset + position[valid]] = \
+        np.asarray(result.values, dtype=np.float64)[valid]
+    return i
+
+def map_series(func, data, workers=None, freq=None, chunksize=None):
+    """
+
+    Apply a function to every series of a DataFrame or RSeriesCollection in
+    parallel. Useful for functions that run Python code per series, such as
+    extend(), x12() or resample() with a custom how.
+
+    Arguments:
+        func: function taking a Series with an RPeriodIndex and returning a
+        Series with an RPeriodIndex. It runs in the worker processes, so it
+        can be any callable, including a lambda. Its argument shares memory
+        with the other series and must not be modified.
+
+        data (DataFrame, RSeriesCollection): the series. The leading and
+        trailing NaN values of DataFrame columns are dropped.
+
+        workers (int): number of worker processes. Defaults to the number of
+        CPUs. With 1, the series are processed in the calling process.
+
+        freq (str, RFrequency): frequency of the results, if different from
+        that of data
+
+        chunksize (int): number of series sent to a worker at a time
+
+    Returns:
+        An RSeriesCollection or a DataFrame, like data. The result for each
+        series covers the periods of that series, converted to freq if given;
+        values the function returns outside that range are dropped, and
+        periods it does not return are NaN.
+
+    """
+
+    global _state
+
+    frame = data if isinstance(data, pd.DataFrame) else None
+    if frame is not None:
+        data = RSeriesCollection.from_frame(frame)
+    elif not isinstance(data, RSeriesCollection):
+        raise ValueError("data must be a DataFrame or RSeriesCollection")
+
+    out_freq = data.freq
+    if freq is not None:
+        out_freq = RFrequency.init(freq) if isinstance(freq, basestring) \
+            else freq
+
+    # range of each result
+    if out_freq == data.freq:
+        out_starts, out_lengths = data.starts, data.lengths
+    else:
+        out_starts = np.empty(len(data), dtype=np.int64)
+        out_lengths = np.zeros(len(data), dtype=np.int64)
+        for i in range(len(data)):
+            if data.lengths[i] == 0:
+                out_starts[i] = 0
+                continue
+            out_starts[i] = data.freq.asfreq(data.starts[i], out_freq, how='S')
+            end = data.freq.asfreq(data.starts[i] + data.lengths[i] - 1,
+                out_freq, how='E')
+            out_lengths[i] = end - out_starts[i] + 1
+    out_offsets = _offsets(out_lengths)
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    serial = workers <= 1 or not hasattr(os, 'fork')
+
+    if serial:
+        values = data.values.view()
+        out = np.empty(out_lengths.sum(), dtype=np.float64)
+    else:
+        values = _shared_array(len(data.values))
+        values[:] = data.values
+        out = _shared_array(out_lengths.sum())
+    values.flags.writeable = False
+    out.fill(np.nan)
+
+    tasks = [(i, data.starts[i], data.lengths[i], data.offsets[i],
+              out_starts[i], out_lengths[i], out_offsets[i])
+             for i in range(len(data))]
+
+    _state = (func, values, data.freq, out, out_freq, data.observed)
+    try:
+        if serial:
+            for task in tasks:
+                _run(task)
+        else:
+            if chunksize is None:
+                chunksize = max(1, len(tasks) // (workers * 4))
+            pool = multiprocessing.Pool(workers)
+            try:
+                for _ in pool.imap_unordered(_run, tasks, chunksize):
+                    pass
+                pool.close()
+            except:
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+    finally:
+        _state = None
+
+    result = RSeriesCollection(out, out_starts, out_lengths, out_freq,
+        data.names, data.observed)
+    if frame is None:
+        return result
+    if out_freq == frame.index.freq:
+        return result.to_frame(frame.index[0], frame.index[-1])
+    return result.to_frame()
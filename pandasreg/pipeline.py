@@ -0,0 +1,298 @@
+"""
+Deferred evaluation of chains of resampling, transforms and trimming.
+
+lazy(obj) records operations instead of running them, and compute() runs the
+whole chain on a plain 2-D array of values, creating a pandas object and an
+RPeriodIndex only for the final result. Before running, the range of periods
+needed by the final result is pushed back through the chain, so input periods
+that cannot affect the result are never read or converted. Elementwise
+operations work in place on a single buffer.
+
+Example: lazy(df).resample("Q", "mean").pcy().trim().compute()
+"""
+
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency, _period_bounds
+from pandasreg.extensions import _resample_block
+from pandasreg import setops
+
+__all__ = ['lazy', 'LazyFrame']
+
+_TRANSFORMS = ('d', 'da', 'dy', 'dya', 'logd', 'logda', 'logdy', 'logdya',
+               'pc', 'pca', 'pcy', 'pcya')
+
+def _split_transform(name):
+    for kind in ('logd', 'pc', 'd'):
+        if name.startswith(kind):
+            return kind, name[len(kind):]
+
+def _lag(name, n, periodicity):
+    kind, suffix = _split_transform(name)
+    if 'y' in suffix:
+        # periodicity is a float, but the lag is used as an index
+        return int(round(n * periodicity))
+    return n
+
+def _transform(values, name, n, periodicity):
+    """The stats transform of the given name, computed into one new buffer"""
+
+    kind, suffix = _split_transform(name)
+    lag = _lag(name, n, periodicity)
+    result = np.empty_like(values)
+    result[:lag] = np.nan
+    if lag >= len(values):
+        return result
+
+    current, previous = values[lag:], values[:len(values) - lag]
+    out = result[lag:]
+    if kind == 'd':
+        np.subtract(current, previous, out)
+    else:
+        np.divide(current, previous, out)
+        if kind == 'logd':
+            np.log(out, out)
+
+    if kind == 'pc':
+        if suffix == 'a':
+            np.power(out, 1.0 * periodicity / n, out)
+        elif suffix == 'ya':
+            np.power(out, 1.0 / n, out)
+        out -= 1
+        out *= 100
+    else:
+        if kind == 'logd':
+            out *= 100
+        if suffix == 'a':
+            out *= periodicity
+        elif suffix == 'ya':
+            out /= n
+    return result
+
+class LazyFrame(object):
+    """
+
+    A deferred chain of operations on a Series or DataFrame with an
+    RPeriodIndex. Every method returns a new LazyFrame; nothing is computed
+    until compute() is called.
+
+    Supported operations are resample(), the transforms of pandasreg.stats
+    (d, da, dy, ..., pcya), log(), exp(), arithmetic with scalars, trim(),
+    fill() and slice().
+
+    """
+
+    def __init__(self, obj, ops=()):
+        if not isinstance(obj.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        self._obj = obj
+        self._ops = tuple(ops)
+
+    def _then(self, *op):
+        return type(self)(self._obj, self._ops + (op,))
+
+    def resample(self, freq, how=None):
+        """
+        Resample as pandasreg.resample(). how must be one of 'sum', 'mean',
+        'first', 'last', 'min' or 'max', and NaN values are ignored.
+        """
+
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        if how is None:
+            how = self._obj.index.observed
+        if how not in ("sum", "mean", "first", "last", "min", "max"):
+            raise KeyError("Invalid resampling function '%s'" % how)
+        return self._then('resample', freq, how)
+
+    def trim(self):
+        """Drop leading and trailing periods without any finite value"""
+
+        return self._then('trim')
+
+    def fill(self):
+        """Values are always regularly spaced in a pipeline, so this does nothing"""
+
+        return self
+
+    def slice(self, start=None, end=None):
+        """Keep only the periods from start to end (RPeriod, datetime, str)"""
+
+        return self._then('slice', start, end)
+
+    def log(self):
+        return self._then('ufunc', np.log)
+
+    def exp(self):
+        return self._then('ufunc', np.exp)
+
+    def _binary(self, ufunc, other, reflected=False):
+        if not np.isscalar(other):
+            raise ValueError("Can only combine a LazyFrame with a scalar")
+        return self._then('binary', ufunc, other, reflected)
+
+    def __add__(self, other):
+        return self._binary(np.add, other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._binary(np.subtract, other)
+
+    def __rsub__(self, other):
+        return self._binary(np.subtract, other, True)
+
+    def __mul__(self, other):
+        return self._binary(np.multiply, other)
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        return self._binary(np.true_divide, other)
+
+    __truediv__ = __div__
+
+    def __rdiv__(self, other):
+        return self._binary(np.true_divide, other, True)
+
+    __rtruediv__ = __rdiv__
+
+    def __pow__(self, other):
+        return self._binary(np.power, other)
+
+    def __neg__(self):
+        return self._then('ufunc', np.negative)
+
+    def _plan(self):
+        """
+
+        Returns the range of input ordinals needed for the result, as a tuple
+        (lo, hi) with None for an open end, by walking the operations
+        backwards from the result.
+
+        """
+
+        freqs = [self._obj.index.freq]
+        for op in self._ops:
+            freqs.append(op[1] if op[0] == 'resample' else freqs[-1])
+
+        lo, hi = None, None
+        for op, freq, source in reversed(zip(self._ops, freqs[1:], freqs[:-1])):
+            if op[0] == 'slice':
+                if op[1] is not None:
+                    bound = _period_bounds(op[1], freq)[0]
+                    lo = bound if lo is None else max(lo, bound)
+                if op[2] is not None:
+                    bound = _period_bounds(op[2], freq)[1]
+                    hi = bound if hi is None else min(hi, bound)
+            elif op[0] == 'transform':
+                if lo is not None:
+                    lo -= _lag(op[1], op[2], freq.periodicity)
+            elif op[0] == 'trim':
+                # which periods are trimmed depends on all the values
+                lo, hi = None, None
+            elif op[0] == 'resample':
+                if source > freq:
+                    if lo is not None:
+                        lo = freq.asfreq(lo, source, how='S')
+                    if hi is not None:
+                        hi = freq.asfreq(hi, source, how='E')
+                else:
+                    if lo is not None:
+                        lo = freq.asfreq(lo, source)
+                    if hi is not None:
+                        hi = freq.asfreq(hi, source)
+        return lo, hi
+
+    def _input(self, lo, hi):
+        """Values of the input over [lo, hi] as (first ordinal, 2-D array, owned)"""
+
+        obj = self._obj
+        ordinals = obj.index.values
+        values = np.asarray(obj.values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+
+        if not setops.is_sorted_unique(ordinals):
+            raise ValueError("Index must be sorted and unique")
+        left = 0 if lo is None else ordinals.searchsorted(lo, side='left')
+        right = len(ordinals) if hi is None else \
+            ordinals.searchsorted(hi, side='right')
+        ordinals, values = ordinals[left:right], values[left:right]
+        if len(ordinals) == 0:
+            return 0, values, False
+        if setops.is_contiguous(ordinals):
+            return ordinals[0], values, False
+
+        result = np.empty((ordinals[-1] - ordinals[0] + 1, values.shape[1]))
+        result.fill(np.nan)
+        result[ordinals - ordinals[0]] = values
+        return ordinals[0], result, True
+
+    def compute(self):
+        """Run the operations and return a Series or DataFrame"""
+
+        lo, hi = self._plan()
+        first, values, owned = self._input(lo, hi)
+        freq = self._obj.index.freq
+
+        for op in self._ops:
+            if op[0] == 'resample':
+                first, resampled = _resample_block(values, first, freq,
+                    op[1], op[2])
+                # the block is returned as is when there is nothing to resample
+                owned = owned or resampled is not values
+                freq, values = op[1], resampled
+            elif op[0] == 'transform':
+                values = _transform(values, op[1], op[2], freq.periodicity)
+                owned = True
+            elif op[0] in ('ufunc', 'binary'):
+                out = values if owned else None
+                if op[0] == 'ufunc':
+                    values = op[1](values, out)
+                elif op[3]:
+                    values = op[1](op[2], values, out)
+                else:
+                    values = op[1](values, op[2], out)
+                owned = True
+            elif op[0] == 'slice':
+                start = 0 if op[1] is None else \
+                    _period_bounds(op[1], freq)[0] - first
+                end = len(values) if op[2] is None else \
+                    _period_bounds(op[2], freq)[1] - first + 1
+                start = min(max(start, 0), len(values))
+                end = min(max(end, start), len(values))
+                first += start
+                values = values[start:end]
+            elif op[0] == 'trim':
+                rows = np.nonzero(np.isfinite(values).any(axis=1))[0]
+                if len(rows) == 0:
+                    values = values[:0]
+                else:
+                    first += rows[0]
+                    values = values[rows[0]:rows[-1] + 1]
+
+        if not owned:
+            values = values.copy()
+        index = RPeriodIndex(ordinal=np.arange(first, first + len(values),
+            dtype=np.int64), freq=freq, observed=self._obj.index.observed)
+        if isinstance(self._obj, pd.DataFrame):
+            return pd.DataFrame(values, index=index,
+                columns=self._obj.columns)
+        return pd.Series(values[:, 0], index=index, name=self._obj.name)
+
+def _transform_method(name):
+    def method(self, n=1):
+        return self._then('transform', name, n)
+    method.__name__ = name
+    method.__doc__ = "Deferred version of pandasreg.%s()" % name
+    return method
+
+for _name in _TRANSFORMS:
+    setattr(LazyFrame, _name, _transform_method(_name))
+
+def lazy(obj):
+    """Start a deferred chain of operations on a Series or DataFrame"""
+
+    return LazyFrame(obj)
@@ -0,0 +1,136 @@
+"""
+Opt-in instrumentation of pandasreg's hot paths.
+
+When enabled, instrumented functions record their number of calls, the number
+of elements they processed and their cumulative time, and slow paths taken
+instead of a vectorized one (such as parsing a string key or building an
+index from a list of dates) record a fallback count. When disabled, the cost
+is a single flag check per call, so the instrumentation is always compiled in.
+
+Example:
+
+    with pandasreg.profiling.profile() as p:
+        pdr.resample(s, "A")
+    print p.to_frame()
+"""
+
+from functools import wraps
+from timeit import default_timer
+
+_enabled = False
+_stats = {}
+
+def enable():
+    """Start recording"""
+
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop recording. Recorded statistics are kept until reset()."""
+
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Discard all recorded statistics"""
+
+    _stats.clear()
+
+def _entry(name):
+    try:
+        return _stats[name]
+    except KeyError:
+        entry = _stats[name] = {'calls': 0, 'elements': 0, 'time': 0.0,
+            'fallbacks': 0}
+        return entry
+
+def _size(args, size):
+    if size is None:
+        return 1
+    try:
+        return len(args[size])
+    except (TypeError, IndexError):
+        return 1
+
+def timed(name, size=None):
+    """
+
+    Decorator that records calls, elements and time for a function.
+
+    Arguments:
+        name (str): name to record the statistics under
+
+        size (int): position of the argument whose length is the number of
+        elements processed. Each call counts as one element if not given.
+
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry = _entry(name)
+                entry['calls'] += 1
+                entry['elements'] += _size(args, size)
+                entry['time'] += default_timer() - start
+        return wrapper
+    return decorator
+
+def fallback(name, elements=1):
+    """Record that a function took its slow path"""
+
+    if _enabled:
+        _entry(name)['fallbacks'] += elements
+
+def stats():
+    """Returns a copy of the recorded statistics as a dict of dicts"""
+
+    return dict((name, dict(entry)) for name, entry in _stats.items())
+
+def to_frame(statistics=None):
+    """Returns the recorded statistics as a DataFrame with one row per name"""
+
+    import pandas as pd
+
+    if statistics is None:
+        statistics = stats()
+    names = sorted(statistics.keys())
+    return pd.DataFrame([statistics[name] for name in names], index=names,
+        columns=['calls', 'elements', 'time', 'fallbacks'])
+
+class profile(object):
+    """
+
+    Context manager that records statistics for the code in its block. The
+    statistics are reset on entry and available from stats() and to_frame()
+    after exit.
+
+    """
+
+    def __enter__(self):
+        self._was_enabled = _enabled
+        self._stats = None
+        reset()
+        enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stats = stats()
+        if not self._was_enabled:
+            disable()
+        return False
+
+    def stats(self):
+        return stats() if self._stats is None else self._stats
+
+    def to_frame(self):
+        return to_frame(self.stats())
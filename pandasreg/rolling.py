@@ -0,0 +1,203 @@
+"""
+Rolling window statistics for Series and DataFrames with an RPeriodIndex.
+
+Windows are defined on the period ordinals rather than on a count of rows, so
+missing periods in a gapped index are handled correctly, and a window can be a
+calendar span such as one year regardless of how many periods of the series'
+frequency it holds (52 or 53 weeks, 365 or 366 days).
+"""
+
+import re
+import numpy as np
+import pandas as pd
+import pandas.core.common as com
+
+from pandasreg.rperiod import RPeriodIndex
+from pandasreg.rfreq import RFrequencyM, RFrequencyNS, aliases, \
+    _civil_from_days, _days_from_civil, _days_in_month
+from pandasreg import setops
+
+__all__ = ['rolling_sum', 'rolling_mean', 'rolling_min', 'rolling_max',
+           'rolling_std', 'rolling_count']
+
+_DAYNANO = 1000000000 * 3600 * 24
+
+def _parse_window(window):
+    """Returns ('months' or 'nanos', length) for a span such as '12M' or '15Min'"""
+
+    match = re.match(r'^(\d*)(.+)$', window)
+    if match is None or match.group(2) not in aliases:
+        raise ValueError("Invalid window '%s'" % window)
+    count = int(match.group(1)) if match.group(1) else 1
+    _class, stride = aliases[match.group(2)][:2]
+    if _class is RFrequencyM:
+        return 'months', count * stride
+    if _class is RFrequencyNS:
+        return 'nanos', count * stride
+    raise ValueError("Window must be in months or a fixed-length unit such as "
+        "days or minutes")
+
+def _shift_back(stamps, unit, length):
+    """Subtract a span from nanosecond timestamps"""
+
+    if unit == 'nanos':
+        return stamps - length
+
+    # month arithmetic on civil dates, keeping month ends at month ends
+    days = stamps // _DAYNANO
+    time = stamps - days * _DAYNANO
+    year, month, day = _civil_from_days(days)
+    months = year * 12 + month - 1 - length
+    new_year, new_month = months // 12, months % 12 + 1
+    last = _days_in_month(new_year, new_month)
+    day = np.where(day == _days_in_month(year, month), last,
+        np.minimum(day, last))
+    return _days_from_civil(new_year, new_month, day) * _DAYNANO + time
+
+def _count_below(ordinals, bounds):
+    """Number of ordinals less than each bound"""
+
+    n = len(ordinals)
+    span = ordinals[-1] - ordinals[0] + 1 if n > 0 else 0
+    if span > 4 * n:
+        return ordinals.searchsorted(bounds, side='left')
+
+    # linear time when the index is not too sparse: count over the range
+    below = np.zeros(span + 1, dtype=np.int64)
+    below[ordinals - ordinals[0] + 1] = 1
+    below = np.cumsum(below)
+    return below[np.clip(bounds - ordinals[0], 0, span)]
+
+def _window_starts(index, window):
+    """Position of the first row in the window ending at each row"""
+
+    ordinals = index.values
+    if not setops.is_sorted_unique(ordinals):
+        raise ValueError("Index must be sorted and unique")
+
+    if com.is_integer(window):
+        if window < 1:
+            raise ValueError("Window must be at least one period")
+        bounds = ordinals - (window - 1)
+    else:
+        freq = index.freq
+        unit, length = _parse_window(window)
+        stamps = _shift_back(freq.np_to_timestamp(ordinals), unit, length)
+        bounds = freq.np_to_ordinal(stamps)
+        bounds += freq.np_to_timestamp(bounds) <= stamps
+    return _count_below(ordinals, bounds)
+
+def _window_sums(values, starts):
+    shape = (len(values) + 1,) + values.shape[1:]
+    prefix = np.zeros(shape, dtype=values.dtype)
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix[1:] - prefix[starts]
+
+def _window_reduce(values, starts, ufunc):
+    """
+
+    Reduce every window [starts[i], i] with a ufunc such as np.minimum. Level k
+    of the table holds the reduction over 2**k consecutive rows, and each
+    window is covered by two overlapping blocks of the largest level that
+    fits, so the cost is O(n log w) for windows of up to w rows.
+
+    """
+
+    n = len(values)
+    length = np.arange(n) - starts + 1
+    result = np.empty_like(values)
+    table = values
+    width = 1
+    while True:
+        rows = np.nonzero((length >= width) & (length < 2 * width))[0]
+        if len(rows) > 0:
+            result[rows] = ufunc(table[starts[rows]], table[rows - width + 1])
+        if 2 * width > length.max():
+            break
+        table = ufunc(table[:-width], table[width:])
+        width *= 2
+    return result
+
+def _rolling(input, window, how, min_periods=1):
+    if not isinstance(input.index, RPeriodIndex):
+        raise ValueError("Index must be of type RPeriodIndex")
+
+    values = np.asarray(input.values, dtype=np.float64)
+    if len(values) == 0:
+        return input.copy()
+    starts = _window_starts(input.index, window)
+    finite = np.isfinite(values)
+    count = _window_sums(finite.astype(np.int64), starts)
+
+    if how == 'count':
+        result = count.astype(np.float64)
+    elif how in ('sum', 'mean'):
+        result = _window_sums(np.where(finite, values, 0), starts)
+        if how == 'mean':
+            result = result / np.maximum(count, 1)
+    elif how == 'std':
+        # center the values first to limit cancellation in the sums
+        center = np.where(finite, values, 0).sum(axis=0) / \
+            np.maximum(finite.sum(axis=0), 1)
+        centered = np.where(finite, values - center, 0)
+        s1 = _window_sums(centered, starts)
+        s2 = _window_sums(centered ** 2, starts)
+        var = (s2 - s1 ** 2 / np.maximum(count, 1)) / np.maximum(count - 1, 1)
+        result = np.sqrt(np.maximum(var, 0))
+        result[count < 2] = np.nan
+    elif how == 'min':
+        result = _window_reduce(np.where(finite, values, np.inf), starts,
+            np.minimum)
+    elif how == 'max':
+        result = _window_reduce(np.where(finite, values, -np.inf), starts,
+            np.maximum)
+
+    if how != 'count':
+        result[count < max(min_periods, 1)] = np.nan
+
+    if isinstance(input, pd.DataFrame):
+        return pd.DataFrame(result, index=input.index, columns=input.columns)
+    return pd.Series(result, index=input.index, name=input.name)
+
+def rolling_sum(input, window, min_periods=1):
+    """
+
+    Rolling sum of a Series or DataFrame with an RPeriodIndex. NaN values
+    are ignored.
+
+    Arguments:
+        window (int, str): number of periods, or a calendar span such as 'A',
+        '6M', '4W', '30D' or '15Min'. A window ending at a period holds all
+        periods less than one span before it.
+
+        min_periods (int): minimum number of non-NaN values in a window for
+        the result to not be NaN
+
+    """
+
+    return _rolling(input, window, 'sum', min_periods)
+
+def rolling_mean(input, window, min_periods=1):
+    """Rolling mean. See rolling_sum() for arguments."""
+
+    return _rolling(input, window, 'mean', min_periods)
+
+def rolling_min(input, window, min_periods=1):
+    """Rolling minimum. See rolling_sum() for arguments."""
+
+    return _rolling(input, window, 'min', min_periods)
+
+def rolling_max(input, window, min_periods=1):
+    """Rolling maximum. See rolling_sum() for arguments."""
+
+    return _rolling(input, window, 'max', min_periods)
+
+def rolling_std(input, window, min_periods=2):
+    """Rolling sample standard deviation. See rolling_sum() for arguments."""
+
+    return _rolling(input, window, 'std', min_periods)
+
+def rolling_count(input, window):
+    """Number of non-NaN values in each window. See rolling_sum() for arguments."""
+
+    return _rolling(input, window, 'count')
@@ -7,6 +7,9 @@ import pandas.core.common as com
 import pandas._algos as _algos
 from pandas.tseries.tools import parse_time_string
 from rfreq import RFrequency
+import setops
+import profiling
+from cache import LRUCache
 
 class RPeriod(object):
     """
@@ -162,11 +165,25 @@ class RPeriodIndex(Int64Index):
         resampled if the user does not provide an explicit method. Options can
         be any of those that are provided to the pandas resample function.
 
+        compact (bool): store the ordinals as int32 if they all fit, which
+        halves the size of the index. Defaults to compact_default, or True if
+        ordinal is an int32 array. A compact index stays compact through
+        slicing, take() and set operations with other compact indexes, and
+        its values attribute (used by pandas) is widened to int64.
+
+    Conversions with asfreq(), timestamps and calendar fields are cached on
+    the index, up to cache_bytes bytes per index with the least recently used
+    results evicted first. Indexes are immutable, so the cache never needs to
+    be invalidated.
+
     """
 
+    cache_bytes = 1 << 25
+    compact_default = False
+
     def __new__(cls, data=None, ordinal=None,
                 freq=None, start=None, end=None, periods=None,
-                name=None, observed=None):
+                name=None, observed=None, compact=None):
 
         if freq is None:
             if start is not None and isinstance(start, RPeriod):
@@ -179,14 +196,21 @@ class RPeriodIndex(Int64Index):
         if isinstance(freq, basestring):
             freq = RFrequency.init(freq)
 
+        if compact is None:
+            source = data if data is not None else ordinal
+            compact = getattr(source, 'dtype', None) == np.int32 or \
+                cls.compact_default
+
         if data is None:
             if ordinal is not None:
-                data = np.asarray(ordinal, dtype=np.int64)
+                data = _as_ordinals(ordinal, compact)
             else:
                 data = cls._get_ordinal_range(start, end, periods, freq)
         else:
             ordinal = cls._from_arraylike(data, freq)
-            data = np.array(ordinal, dtype=np.int64, copy=False)
+            data = _as_ordinals(ordinal, compact)
+        if compact:
+            data = _compact(data)
 
         if observed is None:
             observed = "mean"
@@ -226,11 +250,12 @@ class RPeriodIndex(Int64Index):
     @classmethod
     def _from_arraylike(cls, data, freq):
         if not isinstance(data, np.ndarray):
+            profiling.fallback('RPeriodIndex.__new__', len(data))
             data = [freq.to_ordinal(datetime(x.year, x.month, x.day)) for x in data]
         else:
             if isinstance(data, RPeriodIndex):
                 if freq == data.freq:
-                    data = data.values
+                    data = data.ordinals
                 else:
                     pass
             else:
@@ -238,6 +263,176 @@ class RPeriodIndex(Int64Index):
 
         return data
 
+    @classmethod
+    def from_pandas(cls, index, freq=None, name=None, observed=None):
+        """
+        Create an RPeriodIndex from a pandas PeriodIndex or DatetimeIndex.
+
+        A PeriodIndex whose frequency encodes ordinals the same way as
+        pandasreg ('A', 'Q', 'M', 'B' and 'D') shares its data with the new
+        index. Otherwise the int64 values are converted in one vectorized pass.
+
+        Arguments:
+            index (PeriodIndex, DatetimeIndex): the index to convert
+
+            freq (str, RFrequency): frequency of the new index. Defaults to the
+            frequency of the pandas index.
+        """
+
+        if freq is None:
+            if index.freqstr is None:
+                raise ValueError("Must supply frequency")
+            freq = _from_pandas_aliases.get(index.freqstr, index.freqstr)
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        if name is None:
+            name = index.name
+
+        if isinstance(index, pd.PeriodIndex):
+            pandas_freq = _pandas_to_rfreq(index.freqstr)
+            if pandas_freq is not None and pandas_freq == freq and \
+                    _shares_pandas_ordinals(freq):
+                return cls(ordinal=index.asi8, freq=freq, name=name,
+                    observed=observed)
+            index = index.to_timestamp(how='S')
+
+        if not isinstance(index, pd.DatetimeIndex):
+            raise ValueError("Index must be a PeriodIndex or DatetimeIndex")
+
+        return cls(ordinal=freq.np_to_ordinal(index.asi8), freq=freq, name=name,
+            observed=observed)
+
+    def to_period(self):
+        """
+        Convert to a pandas PeriodIndex. The data is shared with the new index
+        for frequencies that encode ordinals the same way as pandas.
+        """
+
+        if self.freq != RFrequency.init(self.freqstr):
+            raise ValueError("Only frequencies with the default stride and "
+                "anchor can be converted to a PeriodIndex")
+
+        freqstr = _to_pandas_aliases.get(self.freqstr, self.freqstr)
+        if _shares_pandas_ordinals(self.freq):
+            return pd.PeriodIndex(ordinal=self.values, freq=freqstr,
+                name=self.name)
+        return self.to_timestamp().to_period(freqstr)
+
+    @property
+    def values(self):
+        """
+
+        The ordinals as int64, widened if the index is compact. This is what
+        pandas and the rfreq conversions see; lookups within the index use
+        ordinals instead so they do not copy a compact index. Scalar lookups
+        on a compact index bypass the pandas engine, which would read the
+        index through values; bulk operations such as reindexing and
+        alignment still go through pandas and widen it.
+
+        """
+
+        values = self.view(np.ndarray)
+        if values.dtype != np.int64:
+            return values.astype(np.int64)
+        return values
+
+    @property
+    def ordinals(self):
+        """The ordinals as stored, int32 for a compact index"""
+
+        return self.view(np.ndarray)
+
+    @property
+    def is_compact(self):
+        return self.dtype == np.int32
+
+    @property
+    def is_monotonic(self):
+        if not self.is_compact:
+            return super(RPeriodIndex, self).is_monotonic
+        monotonic = getattr(self, '_monotonic', None)
+        if monotonic is None:
+            ordinals = self.ordinals
+            monotonic = self._monotonic = \
+                bool((ordinals[1:] >= ordinals[:-1]).all())
+        return monotonic
+
+    def _loc(self, ordinal):
+        """
+
+        Position of an ordinal in the index, as returned by get_loc(). A
+        compact index is searched on its int32 ordinals rather than through
+        the pandas engine, which would widen them.
+
+        """
+
+        if not self.is_compact:
+            return self._engine.get_loc(ordinal)
+        if not com.is_integer(ordinal) or \
+                not -2**31 <= ordinal < 2**31:
+            raise KeyError(ordinal)
+
+        ordinals = self.ordinals
+        if self.is_monotonic:
+            left = ordinals.searchsorted(ordinal, side='left')
+            right = ordinals.searchsorted(ordinal, side='right')
+            if right - left == 1:
+                return left
+            elif right > left:
+                return slice(left, right)
+            raise KeyError(ordinal)
+
+        mask = ordinals == ordinal
+        count = mask.sum()
+        if count == 1:
+            return mask.argmax()
+        elif count > 1:
+            return mask
+        raise KeyError(ordinal)
+
+    def _get_value(self, series, ordinal):
+        if not self.is_compact:
+            return self._engine.get_value(series, ordinal)
+        return series.values[self._loc(ordinal)]
+
+    def compact(self):
+        """Returns the index with int32 ordinals if they all fit"""
+
+        if self.is_compact:
+            return self
+        return type(self)(ordinal=self.values, freq=self.freq, name=self.name,
+            observed=self.observed, compact=True)
+
+    def _cached(self, key, compute):
+        """
+
+        Returns the cached array for key, calling compute() on a miss. Cached
+        arrays are read-only, since they are shared by every caller.
+
+        """
+
+        cache = getattr(self, '_conversions', None)
+        if cache is None:
+            cache = self._conversions = LRUCache(self.cache_bytes)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            value.flags.writeable = False
+            cache.set(key, value)
+        return value
+
+    def _field(self, field):
+        return self._cached(('field', field),
+            lambda: self.freq.np_field(self.values, field))
+
+    def to_timestamp(self):
+        """Convert to a pandas DatetimeIndex"""
+
+        values = self._cached('timestamp',
+            lambda: self.freq.np_to_timestamp(self.values))
+        return pd.DatetimeIndex(values.view('M8[ns]'), name=self.name)
+
+    @profiling.timed('RPeriodIndex.asfreq', size=0)
     def asfreq(self, freq, how='E', overlap=True):
         """Convert the periods in the index to another frequency.
 
@@ -249,8 +444,18 @@ class RPeriodIndex(Int64Index):
         if freq.freqstr == self.freq.freqstr:
             return self
 
-        return type(self)(ordinal=self.freq.np_asfreq(self.values, freq, how, 
-            overlap), freq=freq)
+        def compute():
+            ordinals = self.freq.np_asfreq(self.values, freq, how, overlap)
+            return _compact(ordinals) if self.is_compact else ordinals
+
+        # the frequency object is part of the key so its id stays unique.
+        # Only the ordinals are cached; each call gets its own index, so
+        # setting its name does not change later results.
+        how = _validate_end_alias(how)
+        ordinals = self._cached(('asfreq', id(freq), freq, how, overlap),
+            compute)
+        return type(self)(ordinal=ordinals, freq=freq,
+            compact=self.is_compact)
 
     @property
     def freqstr(self):
@@ -258,6 +463,30 @@ class RPeriodIndex(Int64Index):
 
         return self.freq.freqstr
 
+    @property
+    def year(self):
+        return self._field('year')
+
+    @property
+    def month(self):
+        return self._field('month')
+
+    @property
+    def quarter(self):
+        return self._field('quarter')
+
+    @property
+    def day(self):
+        return self._field('day')
+
+    @property
+    def weekday(self):
+        return self._field('weekday')
+
+    @property
+    def dayofyear(self):
+        return self._field('dayofyear')
+
     def __contains__(self, key):
         if not isinstance(key, RPeriod) or key.freq != self.freq:
             if isinstance(key, basestring):
@@ -267,7 +496,13 @@ class RPeriodIndex(Int64Index):
                 except Exception:
                     return False
             return False
-        return key.ordinal in self._engine
+        if not self.is_compact:
+            return key.ordinal in self._engine
+        try:
+            self._loc(key.ordinal)
+            return True
+        except KeyError:
+            return False
 
     @property
     def is_full(self):
@@ -278,9 +513,17 @@ class RPeriodIndex(Int64Index):
             return True
         if not self.is_monotonic:
             raise ValueError('Index is not monotonic')
-        values = self.values
+        values = self.ordinals
         return ((values[1:] - values[:-1]) < 2).all()
 
+    def __reduce__(self):
+        values = self.ordinals
+        if len(values) > 0 and setops.is_contiguous(values):
+            return (_unpickle_index, (self.freq, None, values[0], len(values),
+                self.name, self.observed, self.is_compact))
+        return (_unpickle_index, (self.freq, values, None, None, self.name,
+            self.observed, self.is_compact))
+
     def __array_finalize__(self, obj):
         if self.ndim == 0:  # pragma: no cover
             return self.item()
@@ -300,21 +543,80 @@ class RPeriodIndex(Int64Index):
             return self
 
         return RPeriodIndex(data=self.values + n, freq=self.freq, 
-            observed=self.observed)
+            observed=self.observed, compact=self.is_compact)
+
+    def _compare(self, other, op):
+        if isinstance(other, RPeriodIndex):
+            if other.freq != self.freq:
+                raise ValueError("Can only compare indexes with the same frequency")
+            return getattr(self.ordinals, op)(other.ordinals)
+
+        bounds = _period_bounds(other, self.freq)
+        if bounds is None:
+            return getattr(self.view(np.ndarray), op)(other)
+
+        lo, hi = bounds
+        values = self.ordinals
+        if op == '__lt__':
+            return values < lo
+        elif op == '__le__':
+            return values <= hi
+        elif op == '__gt__':
+            return values > hi
+        elif op == '__ge__':
+            return values >= lo
+        elif lo == hi:
+            return getattr(values, op)(lo)
+        elif op == '__eq__':
+            return (values >= lo) & (values <= hi)
+        return (values < lo) | (values > hi)
+
+    def __lt__(self, other):
+        return self._compare(other, '__lt__')
+
+    def __le__(self, other):
+        return self._compare(other, '__le__')
+
+    def __eq__(self, other):
+        return self._compare(other, '__eq__')
+
+    def __ne__(self, other):
+        return self._compare(other, '__ne__')
+
+    def __gt__(self, other):
+        return self._compare(other, '__gt__')
+
+    def __ge__(self, other):
+        return self._compare(other, '__ge__')
+
+    def between(self, start, end):
+        """
+        Returns a boolean array that is True for periods from start to end,
+        inclusive. Lower-frequency bounds such as "2007Q1" cover their whole
+        span.
+        """
+
+        start = _period_bounds(start, self.freq)
+        end = _period_bounds(end, self.freq)
+        if start is None or end is None:
+            raise ValueError("start and end must be RPeriod, datetime, or string")
+
+        values = self.ordinals
+        return (values >= start[0]) & (values <= end[1])
 
     def __add__(self, other):
         return RPeriodIndex(ordinal=self.values + other, freq=self.freq, 
-            observed=self.observed)
+            observed=self.observed, compact=self.is_compact)
 
     def __sub__(self, other):
         return RPeriodIndex(ordinal=self.values - other, freq=self.freq, 
-            observed=self.observed)
+            observed=self.observed, compact=self.is_compact)
 
     def __getitem__(self, key):
         arr_idx = self.view(np.ndarray)
         if np.isscalar(key):
             val = arr_idx[key]
-            return RPeriod(ordinal=val, freq=self.freq)
+            return RPeriod(ordinal=long(val), freq=self.freq)
         else:
             if com._is_bool_indexer(key):
                 key = np.asarray(key)
@@ -330,9 +632,18 @@ class RPeriodIndex(Int64Index):
             return RPeriodIndex(result, name=self.name, freq=self.freq, 
                 observed=self.observed)
 
+    @profiling.timed('RPeriodIndex.join', size=0)
     def join(self, other, how='left', level=None, return_indexers=False):
         self._assert_can_do_setop(other)
 
+        if level is None:
+            joined = setops.join(self.ordinals, other.ordinals, how=how)
+            if joined is not None:
+                result, lidx, ridx = joined
+                if return_indexers:
+                    return self._apply_meta(result), lidx, ridx
+                return self._apply_meta(result)
+
         result = Int64Index.join(self, other, how=how, level=level,
                                 return_indexers=return_indexers)
 
@@ -342,6 +653,40 @@ class RPeriodIndex(Int64Index):
         else:
             return self._apply_meta(result)
 
+    def union(self, other):
+        if isinstance(other, RPeriodIndex) and self.freq == other.freq:
+            result = setops.union(self.ordinals, other.ordinals)
+            if result is not None:
+                return self._wrap_union_result(other, result)
+        return Int64Index.union(self, other)
+
+    def union_many(self, others):
+        """
+        Union with a list of other indexes at once. Used by pandas when
+        building a DataFrame from many series.
+        """
+
+        others = list(others)
+        if not all(isinstance(other, RPeriodIndex) and self.freq == other.freq
+                   for other in others):
+            result = self
+            for other in others:
+                result = result.union(other)
+            return result
+
+        result = self._apply_meta(setops.union_many(
+            [self.ordinals] + [other.ordinals for other in others]))
+        if all(other.name == self.name for other in others):
+            result.name = self.name
+        return result
+
+    def intersection(self, other):
+        if isinstance(other, RPeriodIndex) and self.freq == other.freq:
+            result = setops.intersection(self.ordinals, other.ordinals)
+            if result is not None:
+                return self._wrap_union_result(other, result)
+        return Int64Index.intersection(self, other)
+
     def _assert_can_do_setop(self, other):
         if not isinstance(other, RPeriodIndex):
             raise ValueError('can only call with other RPeriodIndex-ed objects')
@@ -372,14 +717,24 @@ class RPeriodIndex(Int64Index):
         # indexing
         return 'period'
 
+    @profiling.timed('RPeriodIndex.get_value')
     def get_value(self, series, key):
         try:
-            return super(RPeriodIndex, self).get_value(series, key)
+            if not self.is_compact:
+                return super(RPeriodIndex, self).get_value(series, key)
+            try:
+                return self._get_value(series, key)
+            except KeyError:
+                # like pandas, an integer that is not an ordinal is a position
+                if not com.is_integer(key):
+                    raise
+                return series.values[key]
         except (KeyError, IndexError):
+            profiling.fallback('RPeriodIndex.get_value')
             try:
                 period = _string_to_period(key)
 
-                vals = self.values
+                vals = self.ordinals
 
                 # if our data is higher resolution than requested key, slice
                 if period.freq < self.freq:
@@ -389,34 +744,37 @@ class RPeriodIndex(Int64Index):
                     if ord2 < vals[0] or ord1 > vals[-1]:
                         raise KeyError(key)
 
-                    pos = np.searchsorted(self.values, [ord1, ord2])
+                    pos = np.searchsorted(self.ordinals, [ord1, ord2])
                     key = slice(pos[0], pos[1] + 1)
                     return series[key]
                 else:
                     key = period.asfreq(self.freq)
-                    return self._engine.get_value(series, key.ordinal)
+                    return self._get_value(series, key.ordinal)
             except TypeError:
                 pass
             except KeyError:
                 pass
 
             key = RPeriod(key, self.freq)
-            return self._engine.get_value(series, key.ordinal)
+            return self._get_value(series, key.ordinal)
 
+    @profiling.timed('RPeriodIndex.get_loc')
     def get_loc(self, key):
         try:
-            return self._engine.get_loc(key)
+            return self._loc(key)
         except KeyError:
             if com.is_integer(key):
                 return key
+            profiling.fallback('RPeriodIndex.get_loc')
             try:
                 key = _string_to_period(key)
             except TypeError:
                 pass
 
             key = RPeriod(key, self.freq).ordinal
-            return self._engine.get_loc(key)
+            return self._loc(key)
 
+    @profiling.timed('RPeriodIndex.slice_locs')
     def slice_locs(self, start=None, end=None):
         """
         Index.slice_locs, customized to handle partial ISO-8601 string slicing
@@ -438,7 +796,7 @@ class RPeriodIndex(Int64Index):
                 pass
 
         if isinstance(start, datetime) and isinstance(end, datetime):
-            ordinals = self.values
+            ordinals = self.ordinals
             t1 = RPeriod(start, freq=self.freq)
             t2 = RPeriod(end, freq=self.freq)
 
@@ -455,7 +813,7 @@ class RPeriodIndex(Int64Index):
 
         t1 = _string_to_period(key)
 
-        ordinals = self.values
+        ordinals = self.ordinals
 
         t2 = t1.asfreq(self.freq, how='end')
         t1 = t1.asfreq(self.freq, how='start')
@@ -468,12 +826,13 @@ class RPeriodIndex(Int64Index):
         """
         Analogous to ndarray.take
         """
-        taken = self.values.take(indices.astype('int32'), axis=axis)
+        taken = self.ordinals.take(indices.astype('int32'), axis=axis)
         taken = taken.view(RPeriodIndex)
         taken.freq = self.freq
         taken.name = self.name
         return taken
 
+    @profiling.timed('RPeriodIndex.format', size=0)
     def format(self, name=False, formatter=None):
         """
         Render a string representation of the Index
@@ -485,6 +844,72 @@ class RPeriodIndex(Int64Index):
 
         return header + ['%s' % RPeriod(ordinal=x, freq=self.freq) for x in self]
 
+# Frequencies whose ordinals use the same encoding as pandas Period ordinals
+_pandas_ordinal_aliases = set(['A', 'A-DEC', 'A-NOV', 'A-OCT', 'A-SEP', 'A-AUG',
+    'A-JUL', 'A-JUN', 'A-MAY', 'A-APR', 'A-MAR', 'A-FEB', 'A-JAN', 'Q', 'Q-DEC',
+    'Q-NOV', 'Q-OCT', 'M', 'B', 'D'])
+
+_from_pandas_aliases = {'H': 'Hour', 'T': 'Min', 'S': 'Sec', 'W': 'W-SUN'}
+_to_pandas_aliases = {'Hour': 'H', 'Min': 'T', 'Sec': 'S', 'W': 'W-SUN'}
+
+def _pandas_to_rfreq(freqstr):
+    try:
+        return RFrequency.init(_from_pandas_aliases.get(freqstr, freqstr))
+    except ValueError:
+        return None
+
+def _shares_pandas_ordinals(freq):
+    return freq.freqstr in _pandas_ordinal_aliases and \
+        freq == RFrequency.init(freq.freqstr)
+
+def _as_ordinals(values, compact):
+    """values as an int64 array, or as is if compact and already int32"""
+
+    if compact and getattr(values, 'dtype', None) == np.int32:
+        return np.asarray(values)
+    return np.array(values, dtype=np.int64, copy=False)
+
+_INT32_MIN = np.iinfo(np.int32).min
+_INT32_MAX = np.iinfo(np.int32).max
+
+def _compact(values):
+    """values as int32 if all of them fit, otherwise unchanged"""
+
+    if values.dtype == np.int32:
+        return values
+    if len(values) > 0 and (values.min() < _INT32_MIN or
+            values.max() > _INT32_MAX):
+        return values
+    return values.astype(np.int32)
+
+def _unpickle_index(freq, ordinal, start, periods, name, observed,
+                    compact=False):
+    if ordinal is None:
+        ordinal = np.arange(start, start + periods, dtype=np.int64)
+    return RPeriodIndex(ordinal=ordinal, freq=freq, name=name, observed=observed,
+        compact=compact)
+
+def _period_bounds(key, freq):
+    """
+    Returns the first and last ordinal at the given frequency covered by a
+    period-like scalar, or None if the key is not period-like
+    """
+
+    if isinstance(key, basestring):
+        key = _string_to_period(key)
+    elif isinstance(key, (datetime, date)):
+        key = RPeriod(key, freq=freq)
+    elif not isinstance(key, RPeriod):
+        return None
+
+    if key.freq == freq:
+        return key.ordinal, key.ordinal
+    if key.freq < freq:
+        return (key.asfreq(freq, how='S').ordinal,
+                key.asfreq(freq, how='E').ordinal)
+    ordinal = key.asfreq(freq).ordinal
+    return ordinal, ordinal
+
 def _validate_end_alias(how):
     how_dict = {'S': 'S', 'E': 'E',
                 'START': 'S', 'FINISH': 'E',
@@ -0,0 +1,175 @@
+"""
+Set operations (union, intersection, join) on arrays of ordinals.
+
+The ordinals behind an RPeriodIndex are almost always sorted and very often
+contiguous. For contiguous inputs the result and the indexers follow from the
+first ordinal and the length alone; for sorted inputs with gaps a linear merge
+is used. Anything else returns None so the caller can fall back to the
+generic pandas implementation.
+
+Ordinals may be int64 or, for a compact RPeriodIndex, int32. Unions and
+intersections keep int32 when both inputs are int32 and are int64 otherwise;
+indexers are always int64.
+"""
+
+import numpy as np
+import pandas._algos as _algos
+
+def is_sorted_unique(values):
+    """Returns True if the ordinals are strictly increasing"""
+
+    if len(values) < 2:
+        return True
+    return bool((values[1:] > values[:-1]).all())
+
+def is_contiguous(values):
+    """Returns True if the ordinals are strictly increasing with no gaps"""
+
+    n = len(values)
+    if n == 0:
+        return True
+    if values[-1] - values[0] != n - 1:
+        return False
+    return is_sorted_unique(values)
+
+def _result_dtype(left, right):
+    if left.dtype == np.int32 and right.dtype == np.int32:
+        return np.int32
+    return np.int64
+
+def _range_indexer(ordinals, start, length):
+    """Position of each ordinal within the range [start, start+length), or -1"""
+
+    indexer = np.asarray(ordinals, dtype=np.int64) - start
+    if len(ordinals) > 0 and (ordinals[0] < start or
+            ordinals[-1] >= start + length):
+        indexer[(indexer < 0) | (indexer >= length)] = -1
+    return indexer
+
+def _range_join(left, right, how):
+    a0, a1 = left[0], left[-1]
+    b0, b1 = right[0], right[-1]
+
+    if how == 'left':
+        return left, None, _range_indexer(left, b0, len(right))
+    elif how == 'right':
+        return right, _range_indexer(right, a0, len(left)), None
+    elif how == 'inner':
+        result = np.arange(max(a0, b0), min(a1, b1) + 1,
+            dtype=_result_dtype(left, right))
+    elif how == 'outer':
+        if b0 > a1 + 1 or a0 > b1 + 1:
+            return None # gap between the ranges, use a merge instead
+        result = np.arange(min(a0, b0), max(a1, b1) + 1,
+            dtype=_result_dtype(left, right))
+    else:
+        raise ValueError("Invalid join type '%s'" % how)
+
+    lidx = None
+    if len(result) != len(left) or (len(result) > 0 and result[0] != a0):
+        lidx = _range_indexer(result, a0, len(left))
+    ridx = None
+    if len(result) != len(right) or (len(result) > 0 and result[0] != b0):
+        ridx = _range_indexer(result, b0, len(right))
+    return result, lidx, ridx
+
+def _join_function(name, left, right):
+    """
+    The pandas join routine for the dtype of the inputs, and the inputs,
+    widened to int64 unless both are int32 and pandas has an int32 routine
+    """
+
+    if _result_dtype(left, right) == np.int32 and \
+            hasattr(_algos, name + '_int32'):
+        return getattr(_algos, name + '_int32'), left, right
+    return (getattr(_algos, name + '_int64'),
+            np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64))
+
+def _indexer(indexer):
+    return np.asarray(indexer, dtype=np.int64)
+
+def _merge_join(left, right, how):
+    if how in ('left', 'right'):
+        func, left, right = _join_function('left_join_indexer_unique', left,
+            right)
+        if how == 'left':
+            return left, None, _indexer(func(left, right))
+        return right, _indexer(func(right, left)), None
+    elif how in ('inner', 'outer'):
+        func, left, right = _join_function(how + '_join_indexer', left, right)
+        result, lidx, ridx = func(left, right)
+        return result, _indexer(lidx), _indexer(ridx)
+    raise ValueError("Invalid join type '%s'" % how)
+
+def join(left, right, how='left'):
+    """
+    Join two arrays of ordinals at the same frequency.
+
+    Arguments:
+        left, right (ndarray): int64 or int32 ordinals
+
+        how (str): 'left', 'right', 'inner' or 'outer'
+
+    Returns:
+        A tuple (ordinals, left indexer, right indexer), where an indexer is
+        None if it would be the identity and contains -1 for missing
+        positions. Returns None if the inputs are not both sorted and unique.
+    """
+
+    if len(left) > 0 and len(right) > 0 and is_contiguous(left) and \
+            is_contiguous(right):
+        result = _range_join(left, right, how)
+        if result is not None:
+            return result
+        return _merge_join(left, right, how)
+
+    if is_sorted_unique(left) and is_sorted_unique(right):
+        return _merge_join(left, right, how)
+
+    return None
+
+def union(left, right):
+    """Union of two arrays of ordinals, or None if either is unsorted"""
+
+    result = join(left, right, how='outer')
+    if result is None:
+        return None
+    return result[0]
+
+def intersection(left, right):
+    """Intersection of two arrays of ordinals, or None if either is unsorted"""
+
+    result = join(left, right, how='inner')
+    if result is None:
+        return None
+    return result[0]
+
+def union_many(arrays):
+    """
+    Union of any number of arrays of ordinals at the same frequency.
+
+    Contiguous inputs are combined as ranges, so the cost is proportional to
+    the size of the result rather than the size of the inputs. Otherwise all
+    inputs are concatenated and sorted once instead of being merged pairwise.
+    """
+
+    dtype = np.int32 if all(arr.dtype == np.int32 for arr in arrays) \
+        else np.int64
+    arrays = [arr for arr in arrays if len(arr) > 0]
+    if len(arrays) == 0:
+        return np.empty(0, dtype=dtype)
+
+    if all(is_contiguous(arr) for arr in arrays):
+        ranges = sorted((arr[0], arr[-1]) for arr in arrays)
+        merged = [list(ranges[0])]
+        for start, end in ranges[1:]:
+            if start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        if len(merged) == 1:
+            return np.arange(merged[0][0], merged[0][1] + 1, dtype=dtype)
+        return np.concatenate([np.arange(start, end + 1, dtype=dtype)
+            for start, end in merged])
+
+    return np.unique(np.concatenate(arrays)).astype(dtype)
@@ -0,0 +1,81 @@
+"""
+Typed loops for the banded Cholesky factorization and solves used by
+pandasreg.banded, which describes the storage of the matrices.
+"""
+
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport sqrt
+
+ctypedef np.float64_t float64_t
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def cholesky(ab):
+    """
+
+    Cholesky factorization A = L L' of a banded matrix stored as described in
+    pandasreg.banded. Returns L in the same storage.
+
+    """
+
+    cdef np.ndarray[float64_t, ndim=2] a = np.asarray(ab, dtype=np.float64)
+    cdef Py_ssize_t n = a.shape[0], w = a.shape[1] - 1
+    cdef np.ndarray[float64_t, ndim=2] L = np.zeros((n, w + 1))
+    cdef Py_ssize_t i, k, m, first
+    cdef double s
+
+    for i in range(n):
+        first = i - w if i > w else 0
+        for k in range(first, i + 1):
+            s = a[i, w - (i - k)]
+            for m in range(first, k):
+                s -= L[i, w - (i - m)] * L[k, w - (k - m)]
+            if k == i:
+                if s <= 0:
+                    raise np.linalg.LinAlgError("Matrix is not positive definite")
+                L[i, w] = sqrt(s)
+            else:
+                L[i, w - (i - k)] = s / L[k, w]
+    return L
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def solve_cholesky(L, b):
+    """
+
+    Solve A x = b given the Cholesky factor L of A returned by cholesky(). b
+    can be 1-D, or 2-D with one right-hand side per column.
+
+    """
+
+    cdef np.ndarray[float64_t, ndim=2] l = np.asarray(L, dtype=np.float64)
+    cdef Py_ssize_t n = l.shape[0], w = l.shape[1] - 1
+    b = np.asarray(b, dtype=np.float64)
+    cdef np.ndarray[float64_t, ndim=2] y = np.array(b.reshape(n, -1))
+    cdef Py_ssize_t r = y.shape[1]
+    cdef Py_ssize_t i, j, k, first, last
+    cdef double s, d
+
+    # forward substitution, L y = b
+    for i in range(n):
+        first = i - w if i > w else 0
+        d = l[i, w]
+        for j in range(r):
+            s = y[i, j]
+            for k in range(first, i):
+                s -= l[i, w - (i - k)] * y[k, j]
+            y[i, j] = s / d
+
+    # back substitution, L' x = y, where column i of L below the diagonal is
+    # L[i+1, w-1], L[i+2, w-2], ...
+    for i in range(n - 1, -1, -1):
+        last = i + w + 1 if i + w + 1 < n else n
+        d = l[i, w]
+        for j in range(r):
+            s = y[i, j]
+            for k in range(i + 1, last):
+                s -= l[k, w - (k - i)] * y[k, j]
+            y[i, j] = s / d
+    return y.reshape(b.shape)
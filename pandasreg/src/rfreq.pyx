@@ -4,7 +4,10 @@ from datetime import datetime
 import pandas.core.common as com
 import numpy as np
 cimport numpy as np
+cimport cython
 from numpy cimport int64_t
+from pandasreg import profiling
+from pandasreg.cache import LRUCache
 
 cdef int EPOCH = 1970
 cdef int64_t DAYNANO = 1000000000*3600*24
@@ -61,8 +64,8 @@ cdef class RFrequency(object):
 
     """
 
-    cdef int64_t stride
-    cdef int64_t anchor
+    cdef readonly int64_t stride
+    cdef readonly int64_t anchor
     cdef double _periodicity
     cdef _freqstr
 
@@ -121,7 +124,7 @@ cdef class RFrequency(object):
                 _periodicity /= stride
             elif periodicity != -1:
                 _periodicity = periodicity
-            return _class(_stride, _anchor, _periodicity, alias)
+            return _intern(_class, _stride, _anchor, _periodicity, alias)
         except KeyError:
             raise ValueError("Frequency alias '%s' is not valid" % alias)
 
@@ -135,6 +138,78 @@ cdef class RFrequency(object):
     def to_timestamp(self, int64_t ordinal):
         return self._to_timestamp(self.anchor+self.stride*ordinal)
 
+    def np_to_ordinal(self, values):
+        """
+
+        Same as to_ordinal(), but accepts a numpy array of nanosecond
+        timestamps (such as the i8 view of a DatetimeIndex) or of datetime64
+        values and returns a numpy array of ordinals.
+
+        """
+
+        values = np.asarray(values)
+        if values.dtype.kind == 'M':
+            values = values.astype('M8[ns]').view(np.int64)
+        cdef np.ndarray[int64_t, ndim=1] ordinal = self._np_to_ordinal(values)
+        return -((self.anchor-ordinal) // self.stride)
+
+    def np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        """
+
+        Same as to_timestamp(), but accepts a numpy array of ordinals and
+        returns a numpy array of nanosecond timestamps.
+
+        """
+
+        return self._np_to_timestamp(self.anchor+self.stride*ordinal)
+
+    def np_to_datetime64(self, np.ndarray[int64_t, ndim=1] ordinal):
+        """Same as np_to_timestamp(), but returns datetime64[ns] values"""
+
+        return self.np_to_timestamp(ordinal).view('M8[ns]')
+
+    def np_field(self, np.ndarray[int64_t, ndim=1] ordinal, field):
+        """
+
+        Compute a calendar field of the timestamp of each period in a numpy
+        array of ordinals, using integer arithmetic only.
+
+        Arguments:
+            ordinal (ndarray): ordinals at this frequency
+
+            field (str): 'year', 'month', 'quarter', 'day', 'weekday' (Monday
+            is 0) or 'dayofyear'
+
+        Returns:
+            A numpy array of integers
+
+        """
+
+        base = self.anchor+self.stride*ordinal
+        if field in ('weekday', 'dayofyear'):
+            days = self._np_days(base)
+            if field == 'weekday':
+                return (days+3) % 7 # 1970-01-01 was a Thursday
+            year, month, day = _civil_from_days(days)
+            return days-_days_from_civil(year, 1, 1)+1
+
+        year, month, day = self._np_ymd(base)
+        if field == 'year':
+            return year
+        elif field == 'month':
+            return month
+        elif field == 'quarter':
+            return (month-1)//3+1
+        elif field == 'day':
+            return day
+        raise ValueError("Invalid field '%s'" % field)
+
+    def _np_days(self, base):
+        return self._np_to_timestamp(base) // DAYNANO
+
+    def _np_ymd(self, base):
+        return _civil_from_days(self._np_days(base))
+
     def asfreq(self, int64_t ordinal, freq, how='E', overlap=True):
         """
         Convert a period at one frequency to a period of another frequency
@@ -160,7 +235,8 @@ cdef class RFrequency(object):
         """
 
         # TODO: there should be a way to convert between frequencies of the same
-        # group without having to convert to a datetime in the process.
+        # group without having to convert to a datetime in the process. This
+        # is only done for the nanosecond group so far.
 
         if isinstance(freq, basestring):
             freq = RFrequency.init(freq)
@@ -169,6 +245,19 @@ cdef class RFrequency(object):
 
         how = _validate_end_alias(how)
 
+        cdef int64_t base
+        if self.group == freq.group == RFrequencyNS.group and \
+                (how == 'E' or not self < freq):
+            base = self.anchor+self.stride*ordinal-freq.anchor
+            if self < freq and not overlap:
+                return -(-base // freq.stride)-1
+            return -(-base // freq.stride)
+
+        table = _tables.get((id(self), self, id(freq), freq, how, overlap))
+        if table is not None and 0 <= ordinal-table.start < len(table.values):
+            return int(table.values[ordinal-table.start])
+
+        profiling.fallback('RFrequency.asfreq')
         dt = self.to_timestamp(ordinal)
         cdef int64_t new_ordinal = freq.to_ordinal(dt)
 
@@ -196,14 +285,67 @@ cdef class RFrequency(object):
         return new_ordinal
 
     def np_asfreq(self, np.ndarray[int64_t, ndim=1] ordinal, freq, how='E', overlap=True):
-        """Same as asfreq(), but accepts and returns a numpy array of ordinals"""
+        """
+
+        Same as asfreq(), but accepts and returns a numpy array of ordinals.
+        The conversion is done on whole arrays of nanosecond timestamps, and
+        between frequencies of the nanosecond group (including strided ones
+        such as 5-minute) in a single pass without temporaries. Other pairs of
+        frequencies are looked up in a conversion table, which covers the
+        ordinals converted so far and grows as needed within a fixed date
+        range (see set_table_range()).
 
-        cdef int i
-        cdef np.ndarray[int64_t, ndim=1] result = np.empty((len(ordinal),), dtype=np.int64)
+        """
 
-        for i in range(len(ordinal)):
-            result[i] = self.asfreq(ordinal[i], freq, how, overlap)
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        elif not isinstance(freq, RFrequency):
+            raise ValueError("Frequency must be a string or RFrequency class")
 
+        how = _validate_end_alias(how)
+        if self.group == freq.group == RFrequencyNS.group and \
+                (how == 'E' or not self < freq):
+            return self._np_asfreq(ordinal, freq, how, overlap)
+
+        if len(ordinal) == 0:
+            return self._np_asfreq(ordinal, freq, how, overlap)
+        table = _conversion_table(self, freq, how, overlap, ordinal.min(),
+            ordinal.max())
+        if table is None:
+            return self._np_asfreq(ordinal, freq, how, overlap)
+
+        position = ordinal-table.start
+        inside = (position >= 0) & (position < len(table.values))
+        if inside.all():
+            return table.values.take(position)
+        result = np.empty((len(ordinal),), dtype=np.int64)
+        result[inside] = table.values.take(position[inside])
+        outside = ~inside
+        result[outside] = self._np_asfreq(ordinal[outside], freq, how, overlap)
+        return result
+
+    def _np_asfreq(self, np.ndarray[int64_t, ndim=1] ordinal, RFrequency freq,
+                   how, overlap):
+        disaggregate = self < freq
+
+        if self.group == freq.group == RFrequencyNS.group and \
+                (how == 'E' or not disaggregate):
+            result = _ns_asfreq(ordinal, self.stride, self.anchor-freq.anchor,
+                freq.stride)
+        elif disaggregate and how == 'S':
+            # first higher-frequency period after the end of the previous
+            # lower-frequency period, as in asfreq()
+            previous = self.np_to_timestamp(ordinal-1)
+            result = freq.np_to_ordinal(previous)
+            result += freq.np_to_timestamp(result) <= previous
+            if not overlap:
+                result += freq.np_to_timestamp(result-1) < previous
+            return result
+        else:
+            result = freq.np_to_ordinal(self.np_to_timestamp(ordinal))
+
+        if disaggregate and not overlap:
+            result -= 1
         return result
 
     def __richcmp__(RFrequency self, RFrequency other, int op):
@@ -248,6 +390,10 @@ cdef class RFrequency(object):
     def __hash__(self):
         return hash((self.group, self.stride, self.anchor, self.periodicity))
 
+    def __reduce__(self):
+        return (_intern, (type(self), self.stride, self.anchor,
+            self._periodicity, self._freqstr))
+
 cdef class RFrequencyM(RFrequency):
     """Monthly base frequency"""
 
@@ -262,6 +408,22 @@ cdef class RFrequencyM(RFrequency):
         cdef int day = tslib.monthrange(year, month)[1]
         return pd.Timestamp(datetime(year, month, day))
 
+    def _np_to_ordinal(self, np.ndarray[int64_t, ndim=1] values):
+        year, month, day = _civil_from_days(values // DAYNANO)
+        return (year-EPOCH)*12+month-1
+
+    def _np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        month = ordinal % 12
+        year = (ordinal-month)//12+EPOCH
+        # last day of the month is the day before the first of the next month
+        days = _days_from_civil(year+(month+1)//12, (month+1)%12+1, 1)-1
+        return days*DAYNANO
+
+    def _np_ymd(self, base):
+        month = base % 12
+        year = (base-month)//12+EPOCH
+        return year, month+1, _days_in_month(year, month+1)
+
     def format(self, val):
         if not isinstance(val, datetime):
             val = self.to_timestamp(val)
@@ -291,10 +453,73 @@ cdef class RFrequencyTM(RFrequency):
             day = tslib.monthrange(year, month)[1]
         return pd.Timestamp(datetime(year, month, day))
 
+    def _np_to_ordinal(self, np.ndarray[int64_t, ndim=1] values):
+        year, month, day = _civil_from_days(values // DAYNANO)
+        return (year-EPOCH)*24+(month-1)*2+(day > 15)
+
+    def _np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        half = ordinal % 2
+        month = (ordinal // 2) % 12
+        year = (ordinal // 2 - month)//12+EPOCH
+        mid = _days_from_civil(year, month+1, 15)
+        last = _days_from_civil(year+(month+1)//12, (month+1)%12+1, 1)-1
+        return np.where(half == 0, mid, last)*DAYNANO
+
+    def _np_ymd(self, base):
+        month = (base // 2) % 12
+        year = (base // 2-month)//12+EPOCH
+        return year, month+1, np.where(base % 2 == 0, 15,
+            _days_in_month(year, month+1))
+
+cdef class RFrequencyC(RFrequency):
+    """
+
+    Business daily base frequency for a holiday calendar added with
+    register_calendar(). Ordinals and days are mapped through precomputed
+    offset arrays, so conversions are a single array lookup.
+
+    """
+
+    group = 2
+
+    cdef object calendar
+
+    def __init__(self, int64_t stride, int64_t anchor, double periodicity, object freqstr):
+        RFrequency.__init__(self, stride, anchor, periodicity, freqstr)
+        self.calendar = calendars[freqstr]
+
+    def _to_ordinal(self, dt):
+        return self._np_to_ordinal(np.array([dt.value], dtype=np.int64))[0]
+
+    def _to_timestamp(self, int64_t ordinal):
+        return pd.Timestamp(self._np_to_timestamp(
+            np.array([ordinal], dtype=np.int64))[0])
+
+    def _np_to_ordinal(self, np.ndarray[int64_t, ndim=1] values):
+        cal = self.calendar
+        days = values // DAYNANO - cal.first
+        if len(days) > 0 and (days.min() < 0 or days.max() >= len(cal.lookup)):
+            raise ValueError("Date is outside the range of calendar '%s'" %
+                self.freqstr)
+        position = cal.lookup.take(days)
+        if len(position) > 0 and position.max() >= len(cal.days):
+            raise ValueError("Date is outside the range of calendar '%s'" %
+                self.freqstr)
+        return position-cal.origin
+
+    def _np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        cal = self.calendar
+        position = ordinal+cal.origin
+        if len(position) > 0 and (position.min() < 0 or
+                position.max() >= len(cal.days)):
+            raise ValueError("Ordinal is outside the range of calendar '%s'" %
+                self.freqstr)
+        return cal.days.take(position)*DAYNANO
+
 cdef class RFrequencyB(RFrequency):
     """Business daily (Mon-Fri) base frequency"""
 
-    group = 2
+    group = 3
 
     def _to_ordinal(self, dt):
         cdef int64_t days = dt.value/DAYNANO
@@ -307,6 +532,16 @@ cdef class RFrequencyB(RFrequency):
         cdef int wday = (ordinal+3) % 5
         return pd.Timestamp(((ordinal-wday+3)/5*7+wday-3)*DAYNANO)
 
+    def _np_to_ordinal(self, np.ndarray[int64_t, ndim=1] values):
+        days = values // DAYNANO
+        wday = (days+3) % 7 # 1970-01-01 was a Thursday
+        return np.where(wday < 5, (days-wday+3)//7*5+wday-3,
+            (days-wday+3)//7*5+2)
+
+    def _np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        wday = (ordinal+3) % 5
+        return ((ordinal-wday+3)//5*7+wday-3)*DAYNANO
+
 cdef class RFrequencyNS(RFrequency):
     """Nanosecond base frequency"""
 
@@ -318,6 +553,202 @@ cdef class RFrequencyNS(RFrequency):
     def _to_timestamp(self, int64_t ordinal):
         return pd.Timestamp(ordinal)
 
+    def _np_to_ordinal(self, np.ndarray[int64_t, ndim=1] values):
+        return values
+
+    def _np_to_timestamp(self, np.ndarray[int64_t, ndim=1] ordinal):
+        return ordinal
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef np.ndarray _ns_asfreq(np.ndarray[int64_t, ndim=1] ordinal,
+        int64_t stride, int64_t offset, int64_t new_stride):
+    """Computes ceil((offset+stride*ordinal)/new_stride) for each ordinal"""
+
+    cdef Py_ssize_t i, n = len(ordinal)
+    cdef np.ndarray[int64_t, ndim=1] result = np.empty((n,), dtype=np.int64)
+    for i in range(n):
+        result[i] = -(-(offset+stride*ordinal[i]) // new_stride)
+    return result
+
+class _ConversionTable(object):
+    """Target ordinal of every source ordinal from start onward"""
+
+    def __init__(self, start, values):
+        self.start = start
+        self.values = values
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+# conversion tables shared by the whole process, keyed by the frequency
+# objects (and their ids, which stay unique while the key holds the objects)
+_tables = LRUCache(1 << 27)
+_table_range = (datetime(1900,1,1), datetime(2100,12,31))
+_TABLE_MAX_LENGTH = 1 << 22
+
+def _conversion_table(RFrequency source, RFrequency freq, how, overlap,
+                      lo=None, hi=None):
+    """
+
+    Returns the conversion table for the pair of frequencies, extended to
+    cover the ordinals from lo to hi where they fall in the table range, or
+    the whole table range if lo and hi are not given. A table is first built
+    over the ordinals requested and, on a miss, at least doubled in length,
+    so converting a few ordinals never builds a table over the whole range.
+    Returns None if no table can be built.
+
+    """
+
+    key = (id(source), source, id(freq), freq, how, overlap)
+    table = _tables.get(key)
+    try:
+        start = source.to_ordinal(_table_range[0])
+        end = source.to_ordinal(_table_range[1])
+    except Exception: # e.g. a business calendar not covering the range
+        return table
+    if lo is None:
+        lo, hi = start, end
+    lo, hi = max(lo, start), min(hi, end)
+    if lo > hi:
+        return table
+
+    if table is not None:
+        length = len(table.values)
+        if table.start <= lo and hi < table.start+length:
+            return table
+        lo = min(lo, table.start)
+        hi = max(hi, table.start+length-1)
+        if hi-lo+1 < 2*length:
+            # grow towards the side that missed
+            grow = min(2*length, _TABLE_MAX_LENGTH)-(hi-lo+1)
+            if lo < table.start:
+                lo = max(start, lo-grow)
+            else:
+                hi = min(end, hi+grow)
+    if hi-lo+1 > _TABLE_MAX_LENGTH:
+        return table
+
+    values = np.empty((hi-lo+1,), dtype=np.int64)
+    if table is None:
+        values[:] = source._np_asfreq(np.arange(lo, hi+1, dtype=np.int64),
+            freq, how, overlap)
+    else:
+        # only the new ordinals are converted
+        offset = table.start-lo
+        values[offset:offset+length] = table.values
+        if offset > 0:
+            values[:offset] = source._np_asfreq(np.arange(lo, table.start,
+                dtype=np.int64), freq, how, overlap)
+        if offset+length < len(values):
+            values[offset+length:] = source._np_asfreq(np.arange(
+                table.start+length, hi+1, dtype=np.int64), freq, how, overlap)
+    table = _ConversionTable(lo, values)
+    _tables.set(key, table)
+    return table
+
+def warm_tables(pairs):
+    """
+
+    Build the conversion tables for the given frequency pairs ahead of time,
+    e.g. at startup.
+
+    Arguments:
+        pairs: list of tuples (source, target) or (source, target, how,
+        overlap) of frequency strings or RFrequency objects
+
+    """
+
+    for pair in pairs:
+        source, freq = pair[:2]
+        how = pair[2] if len(pair) > 2 else 'E'
+        overlap = pair[3] if len(pair) > 3 else True
+        if isinstance(source, basestring):
+            source = RFrequency.init(source)
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        _conversion_table(source, freq, _validate_end_alias(how), overlap)
+
+def set_table_range(start, end):
+    """Set the range of dates covered by conversion tables and clear them"""
+
+    global _table_range
+    _table_range = (start, end)
+    _tables.clear()
+
+def set_table_memory(maxbytes):
+    """Set the memory limit for all conversion tables, evicting as needed"""
+
+    _tables.resize(maxbytes)
+
+def clear_tables():
+    _tables.clear()
+
+_interned = {}
+
+def _intern(cls, stride, anchor, periodicity, freqstr):
+    """
+
+    Returns the frequency object for the given parameters, creating it only
+    the first time. Frequency objects are immutable, so init() and unpickling
+    can share a single instance.
+
+    """
+
+    key = (cls, stride, anchor, periodicity, freqstr)
+    try:
+        return _interned[key]
+    except KeyError:
+        freq = _interned[key] = cls(stride, anchor, periodicity, freqstr)
+        return freq
+
+calendars = {}
+
+class _BusinessCalendar(object):
+    """Lookup tables between business days and calendar days"""
+
+    def __init__(self, holidays, start, end):
+        self.first = pd.Timestamp(start).value // DAYNANO
+        alldays = np.arange(self.first, pd.Timestamp(end).value // DAYNANO + 1,
+            dtype=np.int64)
+        holidays = np.array([pd.Timestamp(x).value // DAYNANO for x in holidays],
+            dtype=np.int64)
+
+        # business days, in order; position in this array is the ordinal
+        self.days = alldays[((alldays+3) % 7 < 5) & ~np.in1d(alldays, holidays)]
+        # position of the first business day on or after each calendar day
+        self.lookup = np.searchsorted(self.days, alldays).astype(np.int64)
+        # ordinal 0 is the first business day on or after 1970-01-01
+        self.origin = np.searchsorted(self.days, 0)
+
+def register_calendar(name, holidays, start=datetime(1900,1,1),
+                      end=datetime(2100,12,31), periodicity=252):
+    """
+
+    Add a business daily frequency that skips weekends and the given holidays.
+    The frequency is available as 'C-<name>', e.g. register_calendar('NYSE',
+    holidays) creates 'C-NYSE'.
+
+    Arguments:
+        name (str): name of the calendar
+
+        holidays: a list of dates, datetimes, Timestamps, or date strings
+
+        start, end (datetime): range of dates covered by the calendar. Dates
+        outside the range cannot be converted.
+
+        periodicity (double): number of business days per year
+
+    """
+
+    alias = 'C-%s' % name
+    calendars[alias] = _BusinessCalendar(holidays, start, end)
+    for key in [key for key in _interned if key[4] == alias]:
+        del _interned[key]
+    aliases[alias] = (RFrequencyC, 1, 0, periodicity)
+    return alias
+
 def _validate_end_alias(how):
     how_dict = {'S': 'S', 'E': 'E',
                 'START': 'S', 'FINISH': 'E',
@@ -325,4 +756,35 @@ def _validate_end_alias(how):
     how = how_dict.get(str(how).upper())
     if how not in set(['S', 'E']):
         raise ValueError('How must be one of S or E')
-    return how
\ No newline at end of file
+    return how
+
+def _days_from_civil(year, month, day):
+    """Vectorized conversion of a proleptic Gregorian date to days since 1970"""
+
+    year = year-(month <= 2)
+    era = year // 400
+    yoe = year-era*400
+    doy = (153*(month+np.where(month > 2, -3, 9))+2)//5+day-1
+    doe = yoe*365+yoe//4-yoe//100+doy
+    return era*146097+doe-719468
+
+def _civil_from_days(days):
+    """Vectorized conversion of days since 1970 to (year, month, day) arrays"""
+
+    days = days+719468
+    era = days // 146097
+    doe = days-era*146097
+    yoe = (doe-doe//1460+doe//36524-doe//146096)//365
+    doy = doe-(365*yoe+yoe//4-yoe//100)
+    mp = (5*doy+2)//153
+    day = doy-(153*mp+2)//5+1
+    month = mp+np.where(mp < 10, 3, -9)
+    year = yoe+era*400+(month <= 2)
+    return year, month, day
+
+def _days_in_month(year, month):
+    """Vectorized number of days in the given months"""
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[month-1]
+    return days+(leap & (month == 2))
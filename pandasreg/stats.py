@@ -1,10 +1,13 @@
-import os
-import subprocess
-import uuid
-import glob
 import numpy as np
 import pandas as pd
 from pandasreg.rperiod import RPeriodIndex, RFrequency, RPeriod
+from pandasreg.collection import RSeriesCollection
+from pandasreg import banded
+
+def _periodicity(series):
+    if isinstance(series, RSeriesCollection):
+        return series.freq.periodicity
+    return series.index.freq.periodicity
 
 def d(series, n=1):
     """Difference over n periods"""
@@ -12,15 +15,15 @@ def d(series, n=1):
 
 def da(series, n=1):
     """Difference over n periods, annualized"""
-    return (series-series.shift(n))*series.index.freq.periodicity
+    return (series-series.shift(n))*_periodicity(series)
 
 def dy(series, n=1):
     """Difference over n years"""
-    return (series-series.shift(n*series.index.freq.periodicity))
+    return (series-series.shift(n*_periodicity(series)))
 
 def dya(series, n=1):
     """Difference over n years, annualized"""
-    return (series-series.shift(n*series.index.freq.periodicity)) / n
+    return (series-series.shift(n*_periodicity(series))) / n
 
 def logd(series, n=1):
     """Log difference over n periods"""
@@ -28,15 +31,15 @@ def logd(series, n=1):
 
 def logda(series, n=1):
     """Log difference over n periods, annualized"""
-    return (np.log(series)-np.log(series.shift(n)))*series.index.freq.periodicity*100
+    return (np.log(series)-np.log(series.shift(n)))*_periodicity(series)*100
 
 def logdy(series, n=1):
     """Log difference over n years"""
-    return (np.log(series)-np.log(series.shift(n*series.index.freq.periodicity)))*100
+    return (np.log(series)-np.log(series.shift(n*_periodicity(series))))*100
 
 def logdya(series, n=1):
     """Log difference over n years, annualized"""
-    return (np.log(series)-np.log(series.shift(n*series.index.freq.periodicity)))*100.0/n
+    return (np.log(series)-np.log(series.shift(n*_periodicity(series))))*100.0/n
 
 def pc(series, n=1):
     """Percent change over n periods"""
@@ -44,15 +47,116 @@ def pc(series, n=1):
 
 def pca(series, n=1):
     """Percent change over n periods, annualized"""
-    return ((series/series.shift(n))**(1.0*series.index.freq.periodicity/n)-1)*100
+    return ((series/series.shift(n))**(1.0*_periodicity(series)/n)-1)*100
 
 def pcy(series, n=1):
     """Percent change over n years"""
-    return (series/series.shift(n*series.index.freq.periodicity)-1)*100
+    return (series/series.shift(n*_periodicity(series))-1)*100
 
 def pcya(series, n=1):
     """Percent change over n years, annualized"""
-    return ((series/series.shift(n*series.index.freq.periodicity))**(1.0/n)-1)*100
+    return ((series/series.shift(n*_periodicity(series)))**(1.0/n)-1)*100
+
+def _smooth(series, lamb, order):
+    """
+
+    Whittaker smoother: the trend x minimizing sum(w*(y-x)**2) +
+    lamb*sum(diff(x, order)**2), where w is 0 for missing values and 1
+    otherwise. Leading and trailing missing values are dropped as by trim()
+    and are NaN in the result. DataFrames are smoothed column by column, with
+    columns that are missing in the same periods solved together.
+
+    """
+
+    values = np.asarray(series.values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    result = np.empty_like(values)
+    result.fill(np.nan)
+
+    finite = np.isfinite(values)
+    groups = {}
+    for j in range(values.shape[1]):
+        groups.setdefault(finite[:, j].tostring(), []).append(j)
+
+    for columns in groups.values():
+        mask = finite[:, columns[0]]
+        ix = np.where(mask)[0]
+        if len(ix) == 0:
+            continue
+        start, end = ix[0], ix[-1] + 1
+        if len(ix) <= order:
+            # too few values to penalize, the values are their own trend
+            result[start:end, columns] = values[start:end, columns]
+            continue
+        y = values[start:end, columns]
+        y[~mask[start:end]] = 0
+        ab = banded.difference_penalty(end - start, order) * lamb
+        ab[:, -1] += mask[start:end]
+        result[start:end, columns] = banded.solve(ab, y)
+
+    if isinstance(series, pd.DataFrame):
+        return pd.DataFrame(result, index=series.index, columns=series.columns)
+    return pd.Series(result[:, 0], index=series.index, name=series.name)
+
+def _hp_lambda(series, lamb):
+    if lamb is None:
+        # Ravn and Uhlig (2002): 1600 for quarterly data, scaled by the fourth
+        # power of the number of periods per year
+        lamb = 1600 * (_periodicity(series) / 4.0) ** 4
+    return lamb
+
+def hpfilter(series, lamb=None):
+    """Hodrick-Prescott filter
+
+    The trend is found by solving a pentadiagonal system with a banded
+    solver, so time and memory are linear in the length of the series.
+    Missing values inside the series are interpolated by the trend.
+
+    Arguments:
+
+        series (pd.Series, pd.DataFrame): series to filter
+
+        lamb (float): smoothing parameter. Defaults to 1600 for quarterly data
+        and 1600*(periodicity/4)**4 for other frequencies, which gives 6.25
+        for annual and 129600 for monthly data.
+
+    Returns:
+        A tuple (cycle, trend)
+
+    """
+
+    trend = _smooth(series, _hp_lambda(series, lamb), 2)
+    return series - trend, trend
+
+def hptrend(series, lamb=None):
+    """Trend component of the Hodrick-Prescott filter"""
+    return _smooth(series, _hp_lambda(series, lamb), 2)
+
+def hpcycle(series, lamb=None):
+    """Cycle component of the Hodrick-Prescott filter"""
+    return series - hptrend(series, lamb)
+
+def whittaker(series, lamb, order=2):
+    """Whittaker-Henderson trend filter
+
+    Generalizes the Hodrick-Prescott filter (order=2) to penalize differences
+    of any order: order=1 penalizes changes in level and gives a smoothed step
+    function, order=3 penalizes changes in curvature.
+
+    Arguments:
+
+        series (pd.Series, pd.DataFrame): series to filter
+
+        lamb (float): smoothing parameter
+
+        order (int): order of the differences that are penalized
+
+    """
+
+    if order < 1:
+        raise ValueError("order must be at least 1")
+    return _smooth(series, lamb, order)
 
 def x12(series, executable, tmpdir):
     """Run US Census Bureau's X-12 ARIMA on a function
@@ -69,6 +173,12 @@ def x12(series, executable, tmpdir):
 
     """
 
+    # only needed here, so they are not imported with the package
+    import os
+    import subprocess
+    import uuid
+    import glob
+
     if series.index.freq.freqstr == "M":
         if len(series.values) < 36:
             raise ValueError("Must have at least three years of data")
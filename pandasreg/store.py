@@ -0,0 +1,286 @@
+"""
+A directory store for many named series at mixed frequencies.
+
+Each frequency has one value buffer file holding the float64 values of all
+series at that frequency back to back. A JSON catalog maps each series name
+to its buffer, start ordinal, offset in the buffer, length and reserved
+capacity. Reading any number of series over a window of periods is a single
+vectorized gather from the memory-mapped buffer.
+
+Changes are appended to a journal of catalog entries, which is replayed when
+the store is opened, so a change writes only the entries it touched. The
+catalog is rewritten, and the journal cleared, once the journal has about as
+many entries as the catalog.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, _period_bounds
+from pandasreg.io import _freq_to_header, _freq_from_header
+from pandasreg.collection import _regular_values, _gather
+
+_CATALOG = 'catalog.json'
+_JOURNAL = 'journal.json'
+_VERSION = 1
+_JOURNAL_MIN = 64
+
+def _buffer_key(freq):
+    return '%s_%d_%d' % (freq.freqstr, freq.stride, freq.anchor)
+
+class RStore(object):
+    """
+    Store for named series with an RPeriodIndex.
+
+    Arguments:
+        path (str): directory of the store. Created if it does not exist.
+
+        autoflush (bool): write every change to disk, by appending the
+        changed catalog entries to the journal. When adding many series at
+        once, set this to False and call flush() at the end.
+    """
+
+    def __init__(self, path, autoflush=True):
+        self.path = path
+        self.autoflush = autoflush
+        self._maps = {}
+        self._journaled = 0
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        catalog = os.path.join(path, _CATALOG)
+        if os.path.exists(catalog):
+            with open(catalog) as f:
+                catalog = json.load(f)
+            if catalog['version'] != _VERSION:
+                raise ValueError("Unsupported store version %d" %
+                    catalog['version'])
+            self._buffers = catalog['buffers']
+            self._series = catalog['series']
+            self._generation = catalog.get('generation', 0)
+        else:
+            self._buffers = {}
+            self._series = {}
+            self._generation = 0
+        self._replay()
+
+    def _replay(self):
+        """Apply the changes in the journal made since the catalog was written"""
+
+        journal = os.path.join(self.path, _JOURNAL)
+        if not os.path.exists(journal):
+            return
+        torn = False
+        with open(journal) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError: # a change interrupted while being written
+                    torn = True
+                    break
+                # entries from before the catalog was last written
+                if record['generation'] != self._generation:
+                    continue
+                self._buffers.update(record['buffers'])
+                if record['entry'] is None:
+                    self._series.pop(record['name'], None)
+                else:
+                    self._series[record['name']] = record['entry']
+                self._journaled += 1
+        if torn:
+            # later changes must not be appended after the partial line
+            self.flush()
+
+    def flush(self):
+        """Write the catalog to disk and clear the journal"""
+
+        # the journal is ignored once the catalog has a new generation, so
+        # the store stays consistent if the journal cannot be removed
+        self._generation += 1
+        catalog = os.path.join(self.path, _CATALOG)
+        with open(catalog + '.tmp', 'w') as f:
+            json.dump({'version': _VERSION, 'generation': self._generation,
+                'buffers': self._buffers, 'series': self._series}, f)
+        if os.path.exists(catalog):
+            os.remove(catalog)
+        os.rename(catalog + '.tmp', catalog)
+
+        journal = os.path.join(self.path, _JOURNAL)
+        if os.path.exists(journal):
+            os.remove(journal)
+        self._journaled = 0
+
+    def _changed(self, name):
+        if not self.autoflush:
+            return
+        # rewriting the catalog once per that many changes keeps the cost of
+        # a change constant on average
+        if self._journaled >= max(len(self._series), _JOURNAL_MIN):
+            self.flush()
+            return
+
+        entry = self._series.get(name)
+        buffers = {}
+        if entry is not None:
+            buffers[entry['buffer']] = self._buffers[entry['buffer']]
+        with open(os.path.join(self.path, _JOURNAL), 'a') as f:
+            f.write(json.dumps({'generation': self._generation, 'name': name,
+                'entry': entry, 'buffers': buffers}) + '\n')
+        self._journaled += 1
+
+    def __contains__(self, name):
+        return name in self._series
+
+    def __len__(self):
+        return len(self._series)
+
+    def names(self):
+        """Names of all series in the store"""
+
+        return sorted(self._series.keys())
+
+    def freq(self, name):
+        """Frequency of a series in the store"""
+
+        return _freq_from_header(self._buffers[self._series[name]['buffer']]['freq'])
+
+    def _buffer_path(self, key):
+        return os.path.join(self.path, self._buffers[key]['file'])
+
+    def _map(self, key):
+        if key not in self._maps:
+            self._maps[key] = np.memmap(self._buffer_path(key), dtype='<f8',
+                mode='r')
+        return self._maps[key]
+
+    def _get_buffer(self, freq):
+        key = _buffer_key(freq)
+        if key not in self._buffers:
+            self._buffers[key] = {'freq': _freq_to_header(freq),
+                'file': 'values_%d.bin' % len(self._buffers), 'size': 0}
+            open(self._buffer_path(key), 'wb').close()
+        return key
+
+    def _allocate(self, key, capacity):
+        offset = self._buffers[key]['size']
+        self._buffers[key]['size'] = offset + capacity
+        return offset
+
+    def _write_values(self, key, offset, values):
+        self._maps.pop(key, None)
+        with open(self._buffer_path(key), 'r+b') as f:
+            f.seek(offset * 8)
+            np.asarray(values, dtype='<f8').tofile(f)
+
+    def write(self, name, series):
+        """Add a series to the store, replacing any series with the same name"""
+
+        if not isinstance(series.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        if len(series) == 0:
+            raise ValueError("Cannot store an empty series")
+
+        values = _regular_values(series)
+        key = self._get_buffer(series.index.freq)
+        offset = self._allocate(key, len(values))
+        self._write_values(key, offset, values)
+        self._series[name] = {'buffer': key, 'start': int(series.index.values[0]),
+            'offset': offset, 'length': len(values), 'capacity': len(values)}
+        self._changed(name)
+
+    def append(self, name, series):
+        """
+        Extend a series in the store with new observations. Periods that are
+        already stored are overwritten. The series is written in place while
+        it fits in its reserved capacity; otherwise it is moved to the end of
+        the buffer with its capacity doubled, so repeated appends take
+        amortized constant time.
+        """
+
+        if name not in self._series:
+            return self.write(name, series)
+        if not isinstance(series.index, RPeriodIndex):
+            raise ValueError("Index must be of type RPeriodIndex")
+        if len(series) == 0:
+            return
+
+        entry = self._series[name]
+        key = entry['buffer']
+        if _buffer_key(series.index.freq) != key:
+            raise ValueError("Series and stored series must have same frequency")
+
+        values = _regular_values(series)
+        first = int(series.index.values[0]) - entry['start']
+        if first < 0:
+            raise ValueError("Can only append periods after the start of the "
+                "stored series")
+
+        length = max(entry['length'], first + len(values))
+        if length > entry['capacity']:
+            old = np.array(self._map(key)[entry['offset']:entry['offset'] +
+                entry['length']])
+            entry['capacity'] = 2 * length
+            entry['offset'] = self._allocate(key, entry['capacity'])
+            self._write_values(key, entry['offset'], old)
+
+        if first > entry['length']:
+            gap = np.empty(first - entry['length'], dtype=np.float64)
+            gap.fill(np.nan)
+            values = np.concatenate([gap, values])
+            first = entry['length']
+
+        self._write_values(key, entry['offset'] + first, values)
+        entry['length'] = length
+        self._changed(name)
+
+    def delete(self, name):
+        """Remove a series from the store. Its space in the buffer is not reused."""
+
+        del self._series[name]
+        self._changed(name)
+
+    def read(self, names, start=None, end=None):
+        """
+        Read series from the store into a DataFrame.
+
+        Arguments:
+            names (str, list): name or list of names of series with the same
+            frequency
+
+            start, end (RPeriod, datetime, str): range of periods to read.
+            Defaults to the union of the ranges of the series.
+
+        Returns:
+            A DataFrame with one column per series, with NaN for periods
+            outside a series' range
+        """
+
+        if isinstance(names, basestring):
+            names = [names]
+        entries = [self._series[name] for name in names]
+        keys = set(entry['buffer'] for entry in entries)
+        if len(keys) > 1:
+            raise ValueError("Can only read series with the same frequency")
+        key = keys.pop()
+        freq = _freq_from_header(self._buffers[key]['freq'])
+
+        starts = np.array([entry['start'] for entry in entries], dtype=np.int64)
+        lengths = np.array([entry['length'] for entry in entries], dtype=np.int64)
+        offsets = np.array([entry['offset'] for entry in entries], dtype=np.int64)
+
+        if start is None:
+            start = starts.min()
+        else:
+            start = _period_bounds(start, freq)[0]
+        if end is None:
+            end = (starts + lengths).max() - 1
+        else:
+            end = _period_bounds(end, freq)[1]
+
+        ordinals = np.arange(start, max(start, end + 1), dtype=np.int64)
+        result = _gather(self._map(key), starts, lengths, offsets, ordinals)
+        return pd.DataFrame(result, index=RPeriodIndex(ordinal=ordinals,
+            freq=freq), columns=names)
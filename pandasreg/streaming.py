@@ -0,0 +1,218 @@
+"""
+Incremental resampling of a live feed of observations.
+"""
+
+import numpy as np
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex, RFrequency
+
+_STATISTICS = ("sum", "mean", "min", "max", "first", "last", "count")
+
+# running state kept for every open period: (dtype, value before any data)
+_INITIAL = {
+    'sum': (np.float64, 0), 'count': (np.int64, 0),
+    'min': (np.float64, np.inf), 'max': (np.float64, -np.inf),
+    'first': (np.float64, np.nan), 'first_key': (np.int64, np.iinfo(np.int64).max),
+    'last': (np.float64, np.nan), 'last_key': (np.int64, np.iinfo(np.int64).min)
+}
+
+class StreamingResampler(object):
+    """
+
+    Aggregates a feed of observations into periods of a lower frequency.
+    Observations are pushed in batches and only the periods touched by a batch
+    are updated, so the cost of a push depends on the size of the batch and
+    not on the length of the history.
+
+    A period is final once an observation for a later period has been pushed.
+    The latest period is provisional and can still change. Observations for
+    periods that were already emitted as final raise a ValueError.
+
+    Arguments:
+        freq (str, RFrequency): frequency to aggregate to
+
+        how (str, list): one or more of 'sum', 'mean', 'min', 'max', 'first',
+        'last' and 'count'
+
+        source_freq (str, RFrequency): frequency of the ordinals passed to
+        push(). Not needed when pushing timestamps or series with an
+        RPeriodIndex.
+
+    """
+
+    def __init__(self, freq, how="mean", source_freq=None):
+        if isinstance(freq, basestring):
+            freq = RFrequency.init(freq)
+        if isinstance(source_freq, basestring):
+            source_freq = RFrequency.init(source_freq)
+
+        self.freq = freq
+        self.source_freq = source_freq
+        self.how = how
+        for stat in [how] if isinstance(how, basestring) else how:
+            if stat not in _STATISTICS:
+                raise KeyError("Invalid aggregation function '%s'" % stat)
+
+        self._base = None   # ordinal of the first period in the state arrays
+        self._size = 0      # number of periods held in the state arrays
+        self._finalized_end = None  # ordinal after the last finalized period
+        self._allocate(16)
+
+    def _allocate(self, capacity, shift=0):
+        """Resize the state arrays, moving the open periods up by shift"""
+
+        state = {}
+        for name, (dtype, value) in _INITIAL.items():
+            state[name] = np.empty(capacity, dtype=dtype)
+            state[name].fill(value)
+            if self._size > 0:
+                state[name][shift:shift + self._size] = \
+                    self._state[name][:self._size]
+        self._state = state
+
+    def _to_ordinals(self, keys):
+        """Returns (target ordinals, sort keys) for a batch of keys"""
+
+        if isinstance(keys, RPeriodIndex):
+            ordinals = keys.values
+            return keys.freq.np_asfreq(ordinals, self.freq), ordinals
+
+        keys = np.asarray(keys)
+        if keys.dtype.kind in 'iu':
+            if self.source_freq is None:
+                raise ValueError("Must supply source_freq to push ordinals")
+            ordinals = keys.astype(np.int64)
+            return self.source_freq.np_asfreq(ordinals, self.freq), ordinals
+
+        values = pd.DatetimeIndex(keys).asi8
+        return self.freq.np_to_ordinal(values), values
+
+    def push(self, keys, values=None):
+        """
+
+        Add a batch of observations.
+
+        Arguments:
+            keys: a Series indexed by RPeriodIndex or DatetimeIndex (in which
+            case values is not given), an RPeriodIndex, an array of ordinals
+            at source_freq, or an array of timestamps
+
+            values (array): the observed values
+
+        """
+
+        if isinstance(keys, pd.Series):
+            keys, values = keys.index, keys.values
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+
+        bins, keys = self._to_ordinals(keys)
+        finite = np.isfinite(values)
+        bins, keys, values = bins[finite], keys[finite], values[finite]
+        if len(values) == 0:
+            return
+
+        lo, hi = bins.min(), bins.max()
+        if self._base is None or (self._size == 0 and lo >= self._base):
+            self._base = lo
+        if lo < self._base:
+            if self._finalized_end is not None and lo < self._finalized_end:
+                raise ValueError("Observation for a period that was already "
+                    "emitted")
+            shift = self._base - lo
+            self._allocate(2 * (self._size + shift), shift)
+            self._base = lo
+            self._size += shift
+
+        size = max(self._size, hi - self._base + 1)
+        if size > len(self._state['sum']):
+            self._allocate(2 * size)
+        self._size = size
+
+        # group the batch by period, ordered by key within each period
+        order = np.lexsort((keys, bins))
+        bins, keys, values = bins[order], keys[order], values[order]
+        change = np.ones(len(bins), dtype=bool)
+        change[1:] = bins[1:] != bins[:-1]
+        groups = np.nonzero(change)[0]
+        ends = np.append(groups[1:], len(bins)) - 1
+        pos = bins[groups] - self._base
+
+        state = self._state
+        state['sum'][pos] += np.add.reduceat(values, groups)
+        state['count'][pos] += np.diff(np.append(groups, len(bins)))
+        state['min'][pos] = np.minimum(state['min'][pos],
+            np.minimum.reduceat(values, groups))
+        state['max'][pos] = np.maximum(state['max'][pos],
+            np.maximum.reduceat(values, groups))
+
+        earlier = keys[groups] < state['first_key'][pos]
+        state['first'][pos[earlier]] = values[groups][earlier]
+        state['first_key'][pos[earlier]] = keys[groups][earlier]
+        later = keys[ends] >= state['last_key'][pos]
+        state['last'][pos[later]] = values[ends][later]
+        state['last_key'][pos[later]] = keys[ends][later]
+
+    def _statistic(self, stat, start, stop):
+        state = self._state
+        count = state['count'][start:stop]
+        if stat == 'count':
+            return count.astype(np.float64)
+        if stat == 'mean':
+            result = state['sum'][start:stop] / np.maximum(count, 1)
+        else:
+            result = state[stat][start:stop].copy()
+        result[count == 0] = np.nan
+        return result
+
+    def _result(self, start, stop):
+        index = RPeriodIndex(ordinal=np.arange(self._base + start,
+            self._base + stop, dtype=np.int64), freq=self.freq)
+        if isinstance(self.how, basestring):
+            return pd.Series(self._statistic(self.how, start, stop), index=index)
+        return pd.DataFrame(dict((stat, self._statistic(stat, start, stop))
+            for stat in self.how), index=index, columns=list(self.how))
+
+    def provisional(self):
+        """Returns the periods that can still change"""
+
+        if self._base is None:
+            return None
+        return self._result(self._final_count(), self._size)
+
+    def _final_count(self):
+        # every period before the latest one that has data is final
+        if self._size == 0:
+            return 0
+        return self._size - 1
+
+    def emit(self, final=False):
+        """
+
+        Returns a tuple (finalized, provisional) of Series (or DataFrames if how
+        is a list). Finalized periods are returned only once and then dropped
+        from the state. If final is True, the feed is over and every period is
+        finalized.
+
+        """
+
+        if self._base is None:
+            return None, None
+
+        count = self._size if final else self._final_count()
+        finalized = self._result(0, count)
+        provisional = self._result(count, self._size)
+
+        # drop the finalized periods, keeping the state for the open ones
+        remaining = self._size - count
+        for name, arr in self._state.items():
+            arr[:remaining] = arr[count:self._size].copy()
+            arr[remaining:self._size] = _INITIAL[name][1]
+
+        self._base += count
+        self._size -= count
+        if count > 0:
+            self._finalized_end = self._base
+        return finalized, provisional
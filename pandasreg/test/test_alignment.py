@@ -0,0 +1,52 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ixm = RPeriodIndex(start=datetime(2000,1,1), periods=24, freq="M")
+		ixq = RPeriodIndex(start=datetime(2000,7,1), periods=8, freq="Q")
+		ixd = RPeriodIndex(start=datetime(2000,1,1), periods=366, freq="D")
+		self.m = pd.Series(np.arange(1, 25, dtype=np.float64), ixm, name="m")
+		self.q = pd.Series(np.arange(1, 9, dtype=np.float64), ixq, name="q")
+		self.d = pd.DataFrame({"a": np.ones(366), "b": np.zeros(366)}, index=ixd)
+
+	def tearDown(self):
+		pass
+
+	def test_align(self):
+		m, q = pdr.align(self.m, self.q)
+		assert m.index.freq == RFrequency.init("Q")
+		assert len(m) == 10
+		assert m.index[0] == RPeriod("2000Q1", freq="Q")
+		assert m[0] == 2
+		assert np.isnan(q[0])
+		assert (m + q)[2] == 8 + 1
+
+		m, q = pdr.align(self.m, self.q, join="inner")
+		assert len(m) == 6
+		assert q[0] == 1
+
+		m, q = pdr.align(self.m, self.q, freq="M", how="sum")
+		assert len(m) == 30
+		assert q[RPeriod("2000-07", freq="M")] == 1.0 / 3
+
+	def test_concat(self):
+		df = pdr.concat([self.m, self.q, self.d], how=["mean", "mean", "sum"])
+		assert list(df.columns) == ["m", "q", "a", "b"]
+		assert df["a"][RPeriod("2000Q1", freq="Q")] == 91
+		assert df["b"][0] == 0
+
+		df = pdr.concat([self.m, pd.Series(self.m.values, self.m.index)], freq="M")
+		assert list(df.columns) == ["m", 1]
+
+		assert_raises(TypeError, pdr.concat, [self.m], fre="M")
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
@@ -0,0 +1,46 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.appendable import AppendableSeries
+
+class TestClass:
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_append(self):
+		s = AppendableSeries("D", capacity=2)
+		start = RPeriod(datetime(2013,1,1), freq="D")
+		for i in range(100):
+			s.append(start + i, float(i))
+
+		assert len(s) == 100
+		assert s.contiguous
+		assert s[datetime(2013,1,11)] == 10
+		assert s.index[0] == start
+		npt.assert_array_equal(s.series.values, np.arange(100))
+
+		s.append(start + 200, 200.0)
+		assert not s.contiguous
+		assert s[start + 200] == 200
+		assert_raises(KeyError, s.get_loc, start + 150)
+		assert_raises(ValueError, s.append, start + 5, 0.0)
+
+	def test_extend(self):
+		index = RPeriodIndex(start=datetime(2000,1,1), periods=12, freq="M")
+		series = pd.Series(np.arange(12, dtype=np.float64), index)
+		s = AppendableSeries.from_series(series[:6])
+		s.extend(series[6:])
+		assert s.contiguous
+		npt.assert_array_equal(s.series.values, series.values)
+		npt.assert_array_equal(s.index.values, index.values)
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
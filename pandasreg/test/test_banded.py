@@ -0,0 +1,42 @@
+import numpy as np
+from nose.tools import *
+
+from pandasreg import banded
+
+def _dense(ab):
+	n, w = ab.shape[0], ab.shape[1]-1
+	A = np.zeros((n, n))
+	for i in range(n):
+		for k in range(min(i, w)+1):
+			A[i,i-k] = A[i-k,i] = ab[i,w-k]
+	return A
+
+class TestClass:
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_difference_penalty(self):
+		for order in (1, 2, 3):
+			D = np.diff(np.eye(20), order, axis=0)
+			ab = banded.difference_penalty(20, order)
+			assert np.allclose(_dense(ab), np.dot(D.T, D))
+
+	def test_solve(self):
+		ab = banded.difference_penalty(50, 2)*100
+		ab[:,-1] += 1
+		b = np.random.rand(50, 3)
+		x = banded.solve(ab, b)
+		assert x.shape == b.shape
+		assert np.allclose(np.dot(_dense(ab), x), b)
+		assert np.allclose(banded.solve(ab, b[:,1]), x[:,1])
+
+	@raises(np.linalg.LinAlgError)
+	def test_not_positive_definite(self):
+		banded.cholesky(banded.difference_penalty(10, 2))
+
+if __name__ == '__main__':
+	import nose
+	nose.run(argv=["-w", __file__])
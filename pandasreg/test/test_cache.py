@@ -0,0 +1,34 @@
+import numpy as np
+from nose.tools import *
+
+from pandasreg.cache import LRUCache
+
+class TestClass:
+	def setUp(self):
+		self.cache = LRUCache(3 * 80)
+
+	def tearDown(self):
+		pass
+
+	def test_eviction(self):
+		cache = self.cache
+		for i in range(3):
+			cache.set(i, np.zeros(10))
+		assert cache.nbytes == 240
+		cache.get(0)
+		cache.set(3, np.zeros(10))
+		assert 0 in cache
+		assert 1 not in cache
+		assert len(cache) == 3
+
+		cache.set(4, np.zeros(100))
+		assert 4 not in cache
+		assert cache.get(4) is None
+
+		cache.resize(80)
+		assert len(cache) == 1
+		assert 3 in cache
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
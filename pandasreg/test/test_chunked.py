@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg import chunked
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		self.dir = tempfile.mkdtemp()
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=100, freq="M")
+		self.s = pd.Series(np.arange(1, 101, dtype=np.float64), ix)
+		self.s[10] = np.nan
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def test_resample(self):
+		expected = pdr.resample(self.s, "Q", how="sum")
+		chunks = list(chunked.resample(self.s.values, "Q", how="sum",
+			source_freq="M", start=datetime(2000,1,1), chunksize=7))
+		assert len(chunks) > 1
+		result = pd.concat(chunks)
+		npt.assert_array_equal(result.index.values, expected.index.values)
+		npt.assert_array_almost_equal(result.values[:3], expected.values[:3])
+		assert result[3] == 10 + 12
+
+	def test_resample_memmap(self):
+		path = os.path.join(self.dir, "values.bin")
+		self.s.values.tofile(path)
+		source = np.memmap(path, dtype=np.float64, mode="r")
+		out = np.memmap(os.path.join(self.dir, "out.bin"), dtype=np.float64,
+			mode="w+", shape=(34,))
+		index = chunked.resample(source, "Q", how="mean", source_freq="M",
+			start=RPeriod("2000-01", freq="M"), chunksize=10, out=out)
+		assert len(index) == 34
+		assert index[0] == RPeriod("2000Q1", freq="Q")
+		assert out[0] == 2
+		assert out[-1] == 100
+
+	def test_disaggregate(self):
+		q = pdr.resample(self.s, "Q", how="sum")
+		result = pd.concat(list(chunked.resample([q[:5], q[5:]], "M",
+			how="sum")))
+		assert len(result) == 102
+		assert result[0] == 2
+
+	def test_disaggregate_overlap(self):
+		# June 2013 ends on a Sunday, so the last B day and W-FRI week that
+		# overlap it belong to July
+		ix = RPeriodIndex(start=datetime(2013,5,1), periods=2, freq="M")
+		s = pd.Series([31.0, 60.0], ix)
+		for freq in ("B", "W-FRI"):
+			expected = pdr.resample(s, freq, how="mean")
+			result = pd.concat(list(chunked.resample([s[:1], s[1:]], freq,
+				how="mean")))
+			assert len(result) == len(expected) - 1
+			npt.assert_array_equal(result.index.values,
+				expected.index.values[:-1])
+			npt.assert_array_equal(result.values, expected.values[:-1])
+
+			result = pd.concat(list(chunked.resample(s.values, freq,
+				how="sum", source_freq="M", start=datetime(2013,5,1),
+				chunksize=1)))
+			assert_almost_equal(result.sum(), 91)
+
+	def test_transform(self):
+		expected = pdr.pcy(self.s)
+		gen = (self.s[i:i+5] for i in range(0, 100, 5))
+		result = pd.concat(list(chunked.transform(pdr.pcy, gen)))
+		npt.assert_array_almost_equal(result.values, expected.values)
+
+		result = pd.concat(list(chunked.transform(pdr.pcy, self.s.values,
+			freq="M", start=datetime(2000,1,1), chunksize=7)))
+		npt.assert_array_almost_equal(result.values, expected.values)
+
+		assert_raises(ValueError, lambda: list(chunked.transform(
+			lambda x, n: x, self.s.values, freq="M", start=0)))
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
@@ -0,0 +1,61 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.collection import RSeriesCollection
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix1 = RPeriodIndex(start=datetime(2000,1,1), periods=24, freq="M")
+		ix2 = RPeriodIndex(start=datetime(2000,7,1), periods=12, freq="M")
+		self.s1 = pd.Series(np.arange(1, 25, dtype=np.float64), ix1, name="a")
+		self.s2 = pd.Series(np.arange(1, 13, dtype=np.float64), ix2, name="b")
+		self.s2[-1] = np.nan
+		self.c = RSeriesCollection.from_series([self.s1, self.s2])
+
+	def tearDown(self):
+		pass
+
+	def test_layout(self):
+		c = self.c
+		assert len(c) == 2
+		assert len(c.values) == 36
+		npt.assert_array_equal(c["b"].values[:-1], self.s2.values[:-1])
+		assert c["b"].index[0] == self.s2.index[0]
+
+		df = c.to_frame()
+		assert len(df) == 24
+		assert np.isnan(df["b"][0])
+
+		c2 = RSeriesCollection.from_frame(df)
+		npt.assert_array_equal(c2.lengths, [24, 11])
+
+	def test_trim(self):
+		c = self.c.trim()
+		npt.assert_array_equal(c.lengths, [24, 11])
+		npt.assert_array_equal(c.starts, self.c.starts)
+
+	def test_stats(self):
+		c = pdr.pc(self.c)
+		npt.assert_array_equal(c["a"].values[1:], pdr.pc(self.s1).values[1:])
+		assert np.isnan(c["b"].values[0])
+
+		c = pdr.logdy(self.c)
+		npt.assert_array_almost_equal(c["a"].values[12:], pdr.logdy(self.s1).values[12:])
+
+	def test_resample(self):
+		c = self.c.resample("Q", "sum")
+		npt.assert_array_equal(c["a"].values, pdr.resample(self.s1, "Q", "sum").values)
+		npt.assert_array_equal(c["b"].values, [6, 15, 24, 21])
+
+		c = self.c.resample("Q", "mean").resample("M", "mean")
+		assert c["a"].index[0] == self.s1.index[0]
+		assert c["a"][0] == 2
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
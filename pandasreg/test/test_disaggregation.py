@@ -0,0 +1,94 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=12, freq="Q")
+		self.q = pd.Series(np.random.rand(12)*10 + 100, ix)
+		self.q[0] = np.nan
+		mix = RPeriodIndex(start=datetime(1999,1,1), periods=60, freq="M")
+		self.m = pd.Series(np.cumsum(np.random.rand(60)) + 50, mix)
+
+	def tearDown(self):
+		pass
+
+	def _check(self, result, how):
+		assert result.index.freq == RFrequency.init("M")
+		assert result.index[0] == RPeriod("2000-04", freq="M")
+		assert len(result) == 33
+		npt.assert_array_almost_equal(
+			pdr.resample(result, "Q", how=how).values, self.q.values[1:])
+
+	def test_denton(self):
+		for how in ("sum", "mean", "first", "last"):
+			self._check(pdr.denton(self.q, "M", how=how), how)
+			self._check(pdr.denton(self.q, "M", how=how, indicator=self.m,
+				proportional=True), how)
+			self._check(pdr.denton(self.q, "M", how=how, order=2), how)
+
+		# a constant indicator is followed exactly when it aggregates to
+		# the series
+		s = pd.Series(np.ones(12)*3, self.q.index)
+		result = pdr.denton(s, "M", how="sum")
+		npt.assert_array_almost_equal(result.values, np.ones(36))
+
+	def test_denton_dense(self):
+		result = pdr.denton(self.q, "M", how="sum", indicator=self.m)
+		p = self.m.values[15:48]
+		n = len(p)
+		C = np.kron(np.eye(11), np.ones(3))
+		D = np.diff(np.eye(n), axis=0)
+		K = np.vstack([np.hstack([2*np.dot(D.T, D), C.T]),
+			np.hstack([C, np.zeros((11, 11))])])
+		rhs = np.append(np.zeros(n), self.q.values[1:] - np.dot(C, p))
+		expected = np.linalg.solve(K, rhs)[:n] + p
+		npt.assert_array_almost_equal(result.values, expected)
+
+	def test_chow_lin(self):
+		for how in ("sum", "mean", "first", "last"):
+			self._check(pdr.chow_lin(self.q, "M", how=how), how)
+			self._check(pdr.chow_lin(self.q, "M", self.m, how=how, rho=0.5),
+				how)
+
+	def test_dataframe(self):
+		df = pd.DataFrame({'a': self.q, 'b': self.q*2})
+		result = pdr.denton(df, "M")
+		npt.assert_array_almost_equal(result['b'].values,
+			result['a'].values*2)
+
+	def test_overlap(self):
+		# August 2013 ends on a Saturday and 2013Q4 on a Tuesday, so the last
+		# B day and W-FRI week that overlap them belong to the next period
+		ix = RPeriodIndex(start=datetime(2013,1,1), periods=8, freq="M")
+		m = pd.Series(np.random.rand(8)*10 + 100, ix)
+		ix = RPeriodIndex(start=datetime(2013,1,1), periods=4, freq="Q")
+		q = pd.Series(np.random.rand(4)*10 + 100, ix)
+		for s, freq in ((m, "B"), (q, "W-FRI")):
+			for method in (pdr.denton, pdr.chow_lin):
+				for how in ("sum", "mean", "first", "last"):
+					result = method(s, freq, how=how)
+					block = result.index.freq.np_asfreq(result.index.values,
+						s.index.freq) - s.index.values[0]
+					assert block[-1] == len(s) - 1
+					if how == "sum":
+						npt.assert_array_almost_equal(
+							np.bincount(block, weights=result.values), s.values)
+					elif how == "last":
+						last = np.append(np.nonzero(np.diff(block))[0],
+							len(block) - 1)
+						npt.assert_array_almost_equal(result.values[last],
+							s.values)
+
+	@raises(ValueError)
+	def test_lower_frequency(self):
+		pdr.denton(self.q, "A")
+
+if __name__ == '__main__':
+	import nose
+	nose.run(argv=["-w", __file__])
@@ -0,0 +1,40 @@
+import sys
+import subprocess
+from nose.tools import *
+
+import pandasreg as pdr
+
+def _loaded_after(code):
+	"""Names of pandasreg modules loaded after running code in a new interpreter"""
+
+	script = code + "; import sys; print(\" \".join(sorted(name for name in sys.modules if name.startswith(\"pandasreg.\") and sys.modules[name] is not None)))"
+	output = subprocess.Popen([sys.executable, "-c", script],
+		stdout=subprocess.PIPE).communicate()[0]
+	return output.decode("ascii").split()
+
+class TestClass:
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_lazy(self):
+		loaded = _loaded_after("import pandasreg")
+		assert "pandasreg.rperiod" in loaded
+		for module in ["extensions", "stats", "rolling", "collection", "alignment"]:
+			assert "pandasreg." + module not in loaded
+
+		loaded = _loaded_after("import pandasreg; pandasreg.resample")
+		assert "pandasreg.extensions" in loaded
+		assert "pandasreg.stats" not in loaded
+
+	def test_names(self):
+		assert pdr.resample is pdr.extensions.resample
+		assert pdr.pcy.__name__ == "pcy"
+		assert "rolling_sum" in dir(pdr)
+		assert_raises(AttributeError, getattr, pdr, "missing")
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
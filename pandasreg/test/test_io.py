@@ -0,0 +1,56 @@
+import os
+import tempfile
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg import io
+
+class TestClass:
+	def setUp(self):
+		fd, self.path = tempfile.mkstemp()
+		os.close(fd)
+
+	def tearDown(self):
+		os.remove(self.path)
+
+	def test_series(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=36, freq="M", name="date")
+		s = pd.Series(np.arange(36, dtype=np.float64), ix, name="x")
+		io.write(s, self.path)
+
+		header = io.read_header(self.path)
+		assert not header['gapped']
+		assert header['length'] == 36
+
+		s2 = io.read(self.path)
+		assert s2.index.freq == s.index.freq
+		assert s2.name == "x"
+		npt.assert_array_equal(s2.index.values, s.index.values)
+		npt.assert_array_equal(s2.values, s.values)
+
+		s2 = io.read(self.path, start="2001Q1", end="2001-02")
+		assert len(s2) == 2
+		assert s2.index[0] == RPeriod(datetime(2001,1,1), freq="M")
+		assert s2[0] == 12
+
+	def test_gapped_frame(self):
+		freq = RFrequency.init("M", stride=3, anchor=1)
+		ix = RPeriodIndex(ordinal=[100,101,105,110], freq=freq)
+		df = pd.DataFrame(np.arange(8, dtype=np.int32).reshape(4,2), ix,
+			columns=["a","b"])
+		io.write(df, self.path)
+		assert io.read_header(self.path)['gapped']
+
+		df2 = io.read(self.path)
+		assert df2.index.freq == freq
+		assert list(df2.columns) == ["a","b"]
+		npt.assert_array_equal(df2.index.values, [100,101,105,110])
+		npt.assert_array_equal(df2.values, df.values)
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
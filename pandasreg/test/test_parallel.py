@@ -0,0 +1,52 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.collection import RSeriesCollection
+from pandasreg.parallel import map_series
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=36, freq="M")
+		self.df = pd.DataFrame(np.random.rand(36, 8) + 1, index=ix,
+			columns=list("abcdefgh"))
+		self.df['b'][:5] = np.nan
+
+	def tearDown(self):
+		pass
+
+	def test_frame(self):
+		for workers in (1, 3):
+			result = map_series(lambda s: s*2, self.df, workers=workers)
+			assert isinstance(result, pd.DataFrame)
+			npt.assert_array_equal(result.index.values, self.df.index.values)
+			npt.assert_array_almost_equal(result.values, self.df.values*2)
+
+	def test_collection(self):
+		c = RSeriesCollection.from_frame(self.df)
+		result = map_series(pdr.pcy, c, workers=2)
+		assert isinstance(result, RSeriesCollection)
+		npt.assert_array_equal(result.lengths, c.lengths)
+		npt.assert_array_almost_equal(result["c"].values,
+			pdr.pcy(self.df["c"]).values)
+		assert np.isnan(result["b"].values[:12]).all()
+
+	def test_freq(self):
+		result = map_series(lambda s: pdr.resample(s, "Q", how="sum"),
+			self.df, workers=2, freq="Q")
+		expected = pdr.resample(self.df, "Q", how="sum")
+		assert len(result) == 12
+		npt.assert_array_almost_equal(result["a"].values,
+			expected["a"].values)
+
+	@raises(ValueError)
+	def test_bad_result(self):
+		map_series(lambda s: s.sum(), self.df, workers=1)
+
+if __name__ == '__main__':
+	import nose
+	nose.run(argv=["-w", __file__])
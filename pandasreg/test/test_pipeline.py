@@ -0,0 +1,89 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=120, freq="M")
+		self.df = pd.DataFrame({'a': np.arange(1, 121, dtype=np.float64),
+			'b': np.arange(1, 121, dtype=np.float64) ** 1.5}, index=ix)
+		self.df['a'][:5] = np.nan
+
+	def test_chain(self):
+		expected = pdr.trim(pdr.pcy(pdr.resample(self.df, "Q", how="mean")))
+		result = pdr.lazy(self.df).resample("Q", "mean").pcy().trim().compute()
+		npt.assert_array_equal(result.index.values, expected.index.values)
+		assert result.index.freq == expected.index.freq
+		npt.assert_array_almost_equal(result.values, expected.values)
+
+	def test_series(self):
+		s = self.df['b']
+		expected = pdr.logd(s) * 2 + 1
+		result = (pdr.lazy(s).logd() * 2 + 1).compute()
+		assert isinstance(result, pd.Series)
+		npt.assert_array_almost_equal(result.values, expected.values)
+
+	def test_slice(self):
+		expected = pdr.pcy(pdr.resample(self.df, "Q", how="sum"))
+		result = pdr.lazy(self.df).resample("Q", "sum").pcy() \
+			.slice("2005Q1", "2006Q4").compute()
+		assert len(result) == 8
+		assert result.index[0] == RPeriod("2005Q1", freq="Q")
+		npt.assert_array_almost_equal(result.values,
+			expected.ix[RPeriod("2005Q1", freq="Q"):RPeriod("2006Q4", freq="Q")].values)
+
+	def test_plan(self):
+		lazy = pdr.lazy(self.df).resample("Q", "sum").pcy().slice("2005Q1")
+		lo, hi = lazy._plan()
+		assert lo == RPeriod("2004-01", freq="M").ordinal
+		assert hi is None
+		assert lazy.trim()._plan() == (lo, None)
+		assert lazy.trim().slice(None, "2006Q1")._plan() == (None, None)
+
+	def test_immutable(self):
+		base = pdr.lazy(self.df)
+		resampled = base.resample("A", "sum")
+		assert len(base._ops) == 0
+		assert len(resampled._ops) == 1
+		assert len(base.compute()) == 120
+		assert len(resampled.compute()) == 10
+
+	def test_lag(self):
+		from pandasreg.pipeline import _lag
+		assert _lag('pcy', 1, 12.0) == 12
+		assert isinstance(_lag('dya', 2, 4.0), int)
+
+	def test_input_untouched(self):
+		s = self.df['b'].copy()
+		expected = s.values.copy()
+		result = pdr.lazy(s).resample(s.index.freq, "mean").log().compute()
+		npt.assert_array_equal(s.values, expected)
+		npt.assert_array_almost_equal(result.values, np.log(expected))
+
+	def test_disaggregate(self):
+		# June 2013 ends on a Sunday, so the last B day and W-FRI week that
+		# overlap it belong to July
+		ix = RPeriodIndex(start=datetime(2013,5,1), periods=2, freq="M")
+		s = pd.Series([31.0, 60.0], ix)
+		for freq in ("B", "W-FRI"):
+			expected = pdr.resample(s, freq, how="mean")
+			result = pdr.lazy(s).resample(freq, "mean").compute()
+			assert len(result) == len(expected) - 1
+			npt.assert_array_equal(result.index.values,
+				expected.index.values[:-1])
+			npt.assert_array_equal(result.values, expected.values[:-1])
+
+	def test_irregular(self):
+		s = self.df['b'].drop(self.df.index[[20, 21, 50]])
+		result = pdr.lazy(s).compute()
+		assert len(result) == 120
+		assert np.isnan(result[20]) and np.isnan(result[50])
+
+if __name__ == '__main__':
+	import nose
+	nose.run(argv=["-w", __file__])
@@ -0,0 +1,52 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg import profiling
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=24, freq="M")
+		self.s = pd.Series(np.arange(24, dtype=np.float64), ix)
+		profiling.reset()
+
+	def tearDown(self):
+		profiling.disable()
+		profiling.reset()
+
+	def test_disabled(self):
+		pdr.resample(self.s, "A")
+		assert profiling.stats() == {}
+
+	def test_profile(self):
+		with profiling.profile() as p:
+			pdr.resample(self.s, "A")
+			self.s["2000-03"]
+			RPeriodIndex([datetime(2000,1,1), datetime(2000,2,1)], freq="M")
+		assert not profiling.is_enabled()
+
+		stats = p.stats()
+		assert stats["resample"]["calls"] == 1
+		assert stats["resample"]["elements"] == 24
+		assert stats["resample"]["fallbacks"] == 0
+		assert stats["resample"]["time"] > 0
+		assert stats["RPeriodIndex.__new__"]["fallbacks"] == 2
+
+		df = p.to_frame()
+		assert df["calls"]["resample"] == 1
+		assert list(df.columns) == ["calls", "elements", "time", "fallbacks"]
+
+	def test_enable(self):
+		profiling.enable()
+		self.s.index.get_loc(self.s.index[3])
+		profiling.disable()
+		self.s.index.get_loc(self.s.index[3])
+		assert profiling.stats()["RPeriodIndex.get_loc"]["calls"] == 1
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
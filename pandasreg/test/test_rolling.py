@@ -0,0 +1,59 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=36, freq="M")
+		self.s = pd.Series(np.arange(1, 37, dtype=np.float64), ix)
+
+	def tearDown(self):
+		pass
+
+	def test_periods(self):
+		s = self.s
+		assert pdr.rolling_sum(s, 3)[2] == 6
+		assert pdr.rolling_mean(s, 3)[0] == 1
+		assert np.isnan(pdr.rolling_std(s, 3)[0])
+		assert pdr.rolling_std(s, 3)[2] == 1
+		assert pdr.rolling_count(s, 12)[-1] == 12
+
+		# a gap shortens the window instead of reaching further back
+		gapped = s.drop(s.index[[10, 11]])
+		assert pdr.rolling_count(gapped, 3)[10] == 1
+		assert pdr.rolling_sum(gapped, 3)[10] == 13
+
+	def test_calendar_window(self):
+		assert_array_equal = npt.assert_array_equal
+		assert_array_equal(pdr.rolling_sum(self.s, "A").values,
+			pdr.rolling_sum(self.s, 12).values)
+		assert_array_equal(pdr.rolling_sum(self.s, "Q").values,
+			pdr.rolling_sum(self.s, 3).values)
+
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=800, freq="D")
+		s = pd.Series(np.ones(800), ix)
+		assert pdr.rolling_sum(s, "A")[RPeriod("2000-12-31", freq="D")] == 366
+		assert pdr.rolling_sum(s, "A")[RPeriod("2001-12-31", freq="D")] == 365
+		assert pdr.rolling_sum(s, "W")[-1] == 7
+
+		assert_raises(ValueError, pdr.rolling_sum, s, "B")
+
+	def test_min_max(self):
+		s = self.s.copy()
+		s[5] = np.nan
+		s[6] = -10
+		df = pd.DataFrame({"a": s, "b": -s})
+		result = pdr.rolling_min(df, 4)
+		assert result["a"][8] == -10
+		assert result["a"][10] == 8
+		assert pdr.rolling_max(df, 4)["b"][8] == 10
+		assert pdr.rolling_max(s, 1, min_periods=1).isnull()[5]
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
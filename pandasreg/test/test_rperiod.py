@@ -1,3 +1,4 @@
+import pickle
 import numpy as np
 import numpy.testing as npt
 from nose.tools import *
@@ -5,6 +6,7 @@ from datetime import datetime
 import pandas as pd
 
 from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.rfreq import register_calendar
 
 class TestClass:
 	def setUp(self):
@@ -54,6 +56,84 @@ class TestClass:
 		assert RPeriod(dt, freq="A").asfreq("W-MON", how='E').to_timestamp() == pd.Timestamp(datetime(2014,1,6))
 		assert RPeriod(dt, freq="A").asfreq("W-MON", how='S').to_timestamp() == pd.Timestamp(datetime(2013,1,7))
 
+	def test_np_asfreq(self):
+		ordinals = np.arange(-500, 500, 7, dtype=np.int64)
+		min5 = RFrequency.init("Min", stride=5)
+		pairs = [("D", "Hour"), ("Hour", "D"), (min5, "Hour"), ("Min", min5),
+			(min5, "Min"), ("Hour", "B"), ("B", "Hour"), ("D", "M"), ("M", "D"),
+			("M", "W-MON"), ("Q", "B"), ("Sec", "Min")]
+		for f1, f2 in pairs:
+			if isinstance(f1, basestring):
+				f1 = RFrequency.init(f1)
+			for how in ("S", "E"):
+				for overlap in (True, False):
+					expected = [f1.asfreq(o, f2, how, overlap) for o in ordinals]
+					npt.assert_array_equal(f1.np_asfreq(ordinals, f2, how, overlap),
+						expected)
+
+		values = np.array(["2013-01-01T09:31", "2013-01-01T09:36"], dtype="M8[ns]")
+		npt.assert_array_equal(min5.np_to_ordinal(values) - min5.np_to_ordinal(values[:1]), [0, 1])
+		assert min5.np_to_datetime64(min5.np_to_ordinal(values))[0] == \
+			np.datetime64("2013-01-01T09:31", "ns")
+
+	def test_cache(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=1000, freq="D")
+		m = ix.asfreq("M")
+		assert np.may_share_memory(ix.asfreq("M").ordinals, m.ordinals)
+		assert np.may_share_memory(ix.asfreq("M", how="E").ordinals, m.ordinals)
+		assert not np.may_share_memory(ix.asfreq("M", how="S").ordinals,
+			m.ordinals)
+		m.name = "changed"
+		assert ix.asfreq("M").name is None
+		assert ix.asfreq("M") is not m
+		assert ix.year is ix.year
+		assert ix[:10].year is not ix.year
+		npt.assert_array_equal(ix[:10].year, ix.year[:10])
+		assert_raises(ValueError, ix.month.__setitem__, 0, 5)
+
+		small = RPeriodIndex(start=datetime(2000,1,1), periods=1000, freq="D")
+		small.cache_bytes = 8000
+		# pandas keeps the engine in its own _cache attribute
+		assert small.get_loc(small[5].ordinal) == 5
+		small.year
+		year = small.year
+		small.month
+		assert small.year is not year
+		assert small._conversions.nbytes <= 8000
+
+	def test_tables(self):
+		from pandasreg import rfreq
+		rfreq.clear_tables()
+		b = RFrequency.init("B")
+		ordinals = np.arange(-100, 20000, dtype=np.int64)
+		expected = [b.asfreq(o, "W-FRI") for o in ordinals[:50]]
+		result = b.np_asfreq(ordinals, "W-FRI")
+		npt.assert_array_equal(result[:50], expected)
+		npt.assert_array_equal(result[-50:], [b.asfreq(o, "W-FRI") for o in ordinals[-50:]])
+		assert len(rfreq._tables) == 1
+
+		# ordinals outside the table range are computed directly
+		rfreq.set_table_range(datetime(1990,1,1), datetime(2000,1,1))
+		npt.assert_array_equal(b.np_asfreq(ordinals, "W-FRI"), result)
+
+		rfreq.warm_tables([("D", "TM"), ("W-MON", "M", "S")])
+		assert len(rfreq._tables) == 3
+		rfreq.set_table_memory(1000)
+		assert len(rfreq._tables) == 0
+
+		rfreq.set_table_memory(1 << 27)
+		rfreq.set_table_range(datetime(1900,1,1), datetime(2100,12,31))
+
+		# tables only cover the ordinals converted so far
+		hour = RFrequency.init("Hour")
+		ordinals = np.arange(20, dtype=np.int64)
+		npt.assert_array_equal(hour.np_asfreq(ordinals[:10], "M"),
+			[hour.asfreq(o, "M") for o in ordinals[:10]])
+		assert rfreq._tables.nbytes == 10*8
+		npt.assert_array_equal(hour.np_asfreq(ordinals[15:], "M"),
+			[hour.asfreq(o, "M") for o in ordinals[15:]])
+		assert rfreq._tables.nbytes == 20*8
+
 	def test_indexing(self):
 		index = RPeriodIndex(start=datetime(2013,1,1), periods=50, freq="M")
 		s = pd.Series(np.arange(len(index)), index)
@@ -76,6 +156,131 @@ class TestClass:
 		ix = RPeriodIndex(start="1/1/2000", periods=50, freq="M")
 		ix = RPeriodIndex(start="2000-01-01", periods=50, freq="M")
 
+	def test_pandas_interop(self):
+		pix = pd.period_range(start="2000-01", periods=24, freq="M")
+		ix = RPeriodIndex.from_pandas(pix)
+		assert ix.freqstr == "M"
+		assert ix[0] == RPeriod(datetime(2000,1,1), freq="M")
+		npt.assert_array_equal(ix.to_period().asi8, pix.asi8)
+
+		dix = pd.date_range(start=datetime(2013,1,1), periods=10, freq="D")
+		ix = RPeriodIndex.from_pandas(dix, freq="B")
+		assert ix[0] == RPeriod(datetime(2013,1,1), freq="B")
+		assert ix[-1] == RPeriod(datetime(2013,1,10), freq="B")
+		assert ix.to_timestamp()[0] == pd.Timestamp(datetime(2013,1,1))
+
+		ix = RPeriodIndex(start=datetime(2013,1,1), periods=5, freq="W-FRI")
+		assert ix.to_timestamp()[0] == pd.Timestamp(datetime(2013,1,4))
+		npt.assert_array_equal(RPeriodIndex.from_pandas(ix.to_period()).values,
+			ix.values)
+
+	def test_fields(self):
+		ix = RPeriodIndex(start=datetime(2011,11,1), periods=4, freq="M")
+		npt.assert_array_equal(ix.year, [2011,2011,2012,2012])
+		npt.assert_array_equal(ix.month, [11,12,1,2])
+		npt.assert_array_equal(ix.quarter, [4,4,1,1])
+		npt.assert_array_equal(ix.day, [30,31,31,29])
+
+		ix = RPeriodIndex(start=datetime(2013,1,1), periods=4, freq="B")
+		npt.assert_array_equal(ix.weekday, [1,2,3,4])
+		npt.assert_array_equal(ix.dayofyear, [1,2,3,4])
+
+		ix = RPeriodIndex(start=datetime(2013,1,1), periods=3, freq="Q-NOV")
+		npt.assert_array_equal(ix.quarter, [1,2,3])
+		npt.assert_array_equal(ix.year, [2013,2013,2013])
+
+	def test_comparisons(self):
+		ix = RPeriodIndex(start=datetime(2006,12,1), periods=6, freq="M")
+		npt.assert_array_equal(ix < "2007Q1", [True,False,False,False,False,False])
+		npt.assert_array_equal(ix <= "2007Q1", [True,True,True,True,False,False])
+		npt.assert_array_equal(ix == "2007Q1", [False,True,True,True,False,False])
+		npt.assert_array_equal(ix > "2007Q1", [False,False,False,False,True,True])
+		npt.assert_array_equal(ix >= RPeriod(datetime(2007,2,1), freq="M"),
+			[False,False,True,True,True,True])
+		npt.assert_array_equal(ix != datetime(2007,1,1),
+			[True,False,True,True,True,True])
+		npt.assert_array_equal(ix.between("2007-02", "2007Q2"),
+			[False,False,True,True,True,True])
+
+	def test_calendar(self):
+		alias = register_calendar("TEST", [datetime(2013,1,1), "2013-01-21"])
+		assert alias == "C-TEST"
+
+		assert RPeriod(datetime(2013,1,1), freq="C-TEST").to_timestamp() == pd.Timestamp(datetime(2013,1,2))
+		assert RPeriod(datetime(2012,12,29), freq="C-TEST").to_timestamp() == pd.Timestamp(datetime(2012,12,31))
+		assert RPeriod(datetime(2013,1,21), freq="C-TEST").to_timestamp() == pd.Timestamp(datetime(2013,1,22))
+
+		ix = RPeriodIndex(start=datetime(2013,1,1), end=datetime(2013,1,31), freq="C-TEST")
+		assert len(ix) == 21
+		assert ix.is_full
+		assert ix[0].asfreq("B").to_timestamp() == pd.Timestamp(datetime(2013,1,2))
+		assert ix[0].asfreq("M").to_timestamp() == pd.Timestamp(datetime(2013,1,31))
+
+	def test_compact(self):
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=24, freq="M",
+			compact=True)
+		assert ix.is_compact
+		assert ix.ordinals.dtype == np.int32
+		assert ix.values.dtype == np.int64
+		assert ix.nbytes == 24*4
+		assert ix[0] == RPeriod("2000-01", freq="M")
+		assert ix[2:5].is_compact
+		assert ix.shift(3).is_compact
+		assert ix.asfreq("Q").is_compact
+		assert not RPeriodIndex(ordinal=ix.values, freq="M").is_compact
+
+		ix2 = RPeriodIndex(start=datetime(2001,1,1), periods=24, freq="M").compact()
+		assert ix2.is_compact
+		assert ix.union(ix2).is_compact
+		assert len(ix.union(ix2)) == 36
+		assert ix.intersection(ix2).is_compact
+		assert not ix.union(RPeriodIndex(ordinal=ix2.values, freq="M")).is_compact
+
+		s1 = pd.Series(np.arange(24), ix)
+		s2 = pd.Series(np.arange(24), ix2)
+		assert s1["2000-03"] == 2
+		assert len(s1["2000"]) == 12
+		assert len(s1[datetime(2000,2,1):datetime(2000,5,1)]) == 4
+		assert ix.between("2000Q2", "2000Q3").sum() == 6
+		assert (ix < RPeriod("2000-03", freq="M")).sum() == 2
+		assert ix.is_full
+		assert ix.is_monotonic
+		p = RPeriod("2000-04", freq="M")
+		assert ix.get_loc(p.ordinal) == 3
+		assert s1[p] == 3
+		assert s1[2] == 2
+		assert p in ix
+		assert RPeriod("2003-04", freq="M") not in ix
+		assert_raises(KeyError, lambda: ix.get_loc(RPeriod("2003-04",
+			freq="M").ordinal + 2**40))
+		assert len((s1 + s2).dropna()) == 12
+		assert pickle.loads(pickle.dumps(ix)).is_compact
+
+		# ordinals that do not fit stay int64
+		ix = RPeriodIndex(start=datetime(2100,1,1), periods=5, freq="Sec",
+			compact=True)
+		assert not ix.is_compact
+
+	def test_pickle(self):
+		freq = RFrequency.init("M", stride=3, anchor=1)
+		assert pickle.loads(pickle.dumps(freq)) is freq
+		assert RFrequency.init("M") is RFrequency.init("M")
+
+		ix = RPeriodIndex(start=datetime(2000,1,1), periods=50, freq="M", name="x")
+		ix2 = pickle.loads(pickle.dumps(ix))
+		assert ix2.freq == ix.freq
+		assert ix2.name == "x"
+		npt.assert_array_equal(ix2.values, ix.values)
+
+		ix = RPeriodIndex(ordinal=[1,5,6], freq=freq, observed="sum")
+		ix2 = pickle.loads(pickle.dumps(ix))
+		assert ix2.freq is freq
+		assert ix2.observed == "sum"
+		npt.assert_array_equal(ix2.values, [1,5,6])
+
+		s = pd.Series(np.arange(3), ix)
+		assert pickle.loads(pickle.dumps(s)).index.freq is freq
+
 if __name__ == "__main__":
 	import nose
 	nose.run(argv=["-w", __file__,"--with-coverage"])
\ No newline at end of file
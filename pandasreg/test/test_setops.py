@@ -0,0 +1,92 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RPeriodIndex
+from pandasreg import setops
+
+class TestClass:
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_contiguous(self):
+		assert setops.is_contiguous(np.arange(5, dtype=np.int64))
+		assert not setops.is_contiguous(np.array([0,2,1], dtype=np.int64))
+		assert not setops.is_contiguous(np.array([0,1,3], dtype=np.int64))
+
+	def test_join_ranges(self):
+		a = np.arange(0, 6, dtype=np.int64)
+		b = np.arange(3, 10, dtype=np.int64)
+
+		result, lidx, ridx = setops.join(a, b, how='outer')
+		npt.assert_array_equal(result, np.arange(0, 10))
+		npt.assert_array_equal(lidx, [0,1,2,3,4,5,-1,-1,-1,-1])
+		npt.assert_array_equal(ridx, [-1,-1,-1,0,1,2,3,4,5,6])
+
+		result, lidx, ridx = setops.join(a, b, how='inner')
+		npt.assert_array_equal(result, [3,4,5])
+		npt.assert_array_equal(lidx, [3,4,5])
+		npt.assert_array_equal(ridx, [0,1,2])
+
+		result, lidx, ridx = setops.join(a, b, how='left')
+		assert lidx is None
+		npt.assert_array_equal(ridx, [-1,-1,-1,0,1,2])
+
+	def test_join_gapped(self):
+		a = np.array([0,2,4,6], dtype=np.int64)
+		b = np.array([1,2,3,6], dtype=np.int64)
+
+		result, lidx, ridx = setops.join(a, b, how='outer')
+		npt.assert_array_equal(result, [0,1,2,3,4,6])
+		result, lidx, ridx = setops.join(a, b, how='inner')
+		npt.assert_array_equal(result, [2,6])
+
+		assert setops.join(np.array([2,1], dtype=np.int64), b) is None
+
+	def test_union_many(self):
+		arrays = [np.arange(0, 5, dtype=np.int64), np.arange(3, 8, dtype=np.int64),
+			np.arange(10, 12, dtype=np.int64)]
+		npt.assert_array_equal(setops.union_many(arrays), [0,1,2,3,4,5,6,7,10,11])
+
+	def test_int32(self):
+		a = np.arange(0, 6, dtype=np.int32)
+		b = np.arange(3, 10, dtype=np.int32)
+		result, lidx, ridx = setops.join(a, b, how='outer')
+		assert result.dtype == np.int32
+		assert lidx.dtype == np.int64
+		npt.assert_array_equal(ridx, [-1,-1,-1,0,1,2,3,4,5,6])
+
+		result = setops.union(a, b.astype(np.int64))
+		assert result.dtype == np.int64
+		npt.assert_array_equal(result, np.arange(0, 10))
+
+		c = np.array([1,2,3,6], dtype=np.int32)
+		result, lidx, ridx = setops.join(c, b, how='inner')
+		npt.assert_array_equal(result, [3,6])
+		npt.assert_array_equal(lidx, [2,3])
+
+		assert setops.union_many([a, b]).dtype == np.int32
+
+	def test_index_setops(self):
+		ix1 = RPeriodIndex(start=datetime(2000,1,1), periods=6, freq="M")
+		ix2 = RPeriodIndex(start=datetime(2000,4,1), periods=6, freq="M")
+
+		result = ix1.union(ix2)
+		assert isinstance(result, RPeriodIndex)
+		assert len(result) == 9
+		assert len(ix1.intersection(ix2)) == 3
+
+		s1 = pd.Series(np.arange(6), ix1)
+		s2 = pd.Series(np.arange(6), ix2)
+		df = pd.DataFrame({'a': s1, 'b': s2})
+		assert len(df) == 9
+		assert isinstance(df.index, RPeriodIndex)
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
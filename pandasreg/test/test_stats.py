@@ -42,6 +42,38 @@ class TestClass:
 		s = pdr.pcya(s1,2)
 		assert s[24] == ((s1[24]/s1[0])**.5-1)*100
 
+	def test_hpfilter(self):
+		index = RPeriodIndex(start=datetime(1970,1,1), periods=40, freq="Q")
+		s1 = pd.Series(np.cumsum(np.random.randn(len(index))), index)
+		s1[:2] = np.nan
+		s1[10] = np.nan
+
+		n = len(s1) - 2
+		D = np.diff(np.eye(n), 2, axis=0)
+		W = np.diag(np.isfinite(s1.values[2:]).astype(float))
+		expected = np.linalg.solve(W + 1600*np.dot(D.T, D),
+			s1.fillna(0).values[2:])
+
+		cycle, trend = pdr.hpfilter(s1)
+		assert np.isnan(trend[0]) and np.isnan(trend[1])
+		assert np.allclose(trend.values[2:], expected)
+		assert np.allclose(cycle.values[3:10], (s1-trend).values[3:10])
+		assert np.allclose(pdr.hptrend(s1, 1600).values[2:], expected)
+
+		df = pd.DataFrame({'a': s1, 'b': s1.fillna(0), 'c': s1*2})
+		trend = pdr.hptrend(df)
+		assert np.allclose(trend['a'].values[2:], expected)
+		assert np.allclose(trend['c'].values[2:], expected*2)
+		assert np.isfinite(trend['b']).all()
+
+	def test_whittaker(self):
+		index = RPeriodIndex(start=datetime(1970,1,1), periods=30, freq="M")
+		s1 = pd.Series(np.arange(len(index), dtype=np.float64)**2, index)
+		# quadratics are in the null space of third differences
+		assert np.allclose(pdr.whittaker(s1, 100, order=3).values, s1.values)
+		level = pdr.whittaker(s1, 1e9, order=1)
+		assert np.allclose(level.values, s1.mean(), rtol=1e-3)
+
 if __name__ == "__main__":
 	import nose
 	nose.run(argv=["-w", __file__,"--nocapture"])
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.store import RStore
+
+class TestClass:
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.path)
+
+	def test_read(self):
+		store = RStore(self.path)
+		s1 = pd.Series(np.arange(12, dtype=np.float64),
+			RPeriodIndex(start=datetime(2000,1,1), periods=12, freq="M"))
+		s2 = pd.Series(np.arange(6, dtype=np.float64),
+			RPeriodIndex(start=datetime(2000,7,1), periods=6, freq="M"))
+		s3 = pd.Series(np.arange(4, dtype=np.float64),
+			RPeriodIndex(start=datetime(2000,1,1), periods=4, freq="Q"))
+		store.write("a", s1)
+		store.write("b", s2)
+		store.write("c", s3)
+
+		store = RStore(self.path)
+		assert store.names() == ["a","b","c"]
+		df = store.read(["a","b"])
+		assert len(df) == 18
+		assert df.index.freqstr == "M"
+		assert df["a"][11] == 11
+		assert np.isnan(df["b"][0])
+		assert df["b"][6] == 0
+
+		df = store.read(["a","b"], start="2000Q3", end="2000Q3")
+		npt.assert_array_equal(df["a"].values, [6,7,8])
+		npt.assert_array_equal(df["b"].values, [0,1,2])
+
+		assert_raises(ValueError, store.read, ["a","c"])
+
+	def test_append(self):
+		store = RStore(self.path)
+		index = RPeriodIndex(start=datetime(2000,1,1), periods=12, freq="M")
+		s = pd.Series(np.arange(12, dtype=np.float64), index)
+		store.write("a", s[:3])
+		store.write("b", s)
+		for i in range(3, 12):
+			store.append("a", s[i:i+1])
+		store.append("a", pd.Series([100.0], index[-1:] + 2))
+
+		values = store.read("a")["a"].values
+		npt.assert_array_equal(values[:12], np.arange(12))
+		assert np.isnan(values[12])
+		assert values[13] == 100
+		npt.assert_array_equal(store.read("b")["b"].values, np.arange(12))
+
+	def test_journal(self):
+		store = RStore(self.path)
+		index = RPeriodIndex(start=datetime(2000,1,1), periods=200, freq="M")
+		s = pd.Series(np.arange(200, dtype=np.float64), index)
+		store.write("a", s[:1])
+		store.write("b", s)
+		for i in range(1, 10):
+			store.append("a", s[i:i+1])
+		# changes so far are only in the journal
+		assert not os.path.exists(os.path.join(self.path, "catalog.json"))
+		for i in range(10, 200):
+			store.append("a", s[i:i+1])
+		store.delete("b")
+
+		store = RStore(self.path)
+		assert store.names() == ["a"]
+		npt.assert_array_equal(store.read("a")["a"].values, np.arange(200))
+
+		with open(os.path.join(self.path, "journal.json"), "a") as f:
+			f.write('{"generation"')
+		store = RStore(self.path)
+		store.write("c", s[:5])
+		store = RStore(self.path)
+		assert store.names() == ["a", "c"]
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
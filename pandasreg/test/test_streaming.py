@@ -0,0 +1,66 @@
+import numpy as np
+import numpy.testing as npt
+from nose.tools import *
+from datetime import datetime
+import pandas as pd
+
+from pandasreg.rperiod import RFrequency, RPeriod, RPeriodIndex
+from pandasreg.streaming import StreamingResampler
+import pandasreg as pdr
+
+class TestClass:
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def test_batches(self):
+		index = RPeriodIndex(start=datetime(2013,1,1), periods=90, freq="D")
+		s = pd.Series(np.arange(90, dtype=np.float64), index)
+		expected = pdr.resample(s, "M", "sum")
+
+		r = StreamingResampler("M", how="sum")
+		r.push(s[:20])
+		final, provisional = r.emit()
+		assert len(final) == 0
+		assert provisional[0] == s[:20].sum()
+
+		r.push(s[20:45])
+		r.push(s[45:])
+		final, provisional = r.emit()
+		npt.assert_array_equal(final.values, expected.values[:2])
+		npt.assert_array_equal(provisional.values, expected.values[2:])
+		assert_raises(ValueError, r.push, s[:1])
+
+	def test_emit_nothing_finalized(self):
+		index = RPeriodIndex(start=datetime(2013,1,1), periods=60, freq="D")
+		s = pd.Series(np.ones(60), index)
+
+		r = StreamingResampler("M", how="sum")
+		r.push(s[40:45])
+		final, provisional = r.emit()
+		assert len(final) == 0
+
+		# nothing was finalized, so earlier periods can still arrive
+		r.push(s[:40])
+		final, provisional = r.emit()
+		npt.assert_array_equal(final.values, [31])
+		npt.assert_array_equal(provisional.values, [14])
+		assert_raises(ValueError, r.push, s[:1])
+
+	def test_statistics(self):
+		r = StreamingResampler("A", how=["first", "last", "min", "max", "count"])
+		r.push([datetime(2012,5,1), datetime(2012,2,1)], [2.0, 1.0])
+		r.push([datetime(2012,12,1), datetime(2013,1,1)], [0.5, 9.0])
+		final, provisional = r.emit(final=True)
+		assert len(provisional) == 0
+		assert final["first"][0] == 1.0
+		assert final["last"][0] == 0.5
+		assert final["min"][0] == 0.5
+		assert final["max"][0] == 2.0
+		assert final["count"][1] == 1
+
+if __name__ == "__main__":
+	import nose
+	nose.run(argv=["-w", __file__])
@@ -10,7 +10,8 @@ from Cython.Build import cythonize
 
 # ext_modules = cythonize("pandasreg/src/*.pyx")
 ext_modules = cythonize([
-	Extension("pandasreg.rfreq", ["pandasreg/src/rfreq.pyx"])
+	Extension("pandasreg.rfreq", ["pandasreg/src/rfreq.pyx"]),
+	Extension("pandasreg._banded", ["pandasreg/src/_banded.pyx"])
 ])
 
 setup(